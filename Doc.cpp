@@ -61,36 +61,42 @@
 #include <common/ProcessUnitFramework/AnalysisContent.h>
 #include <linguisticProcessing/common/linguisticData/LimaStringText.h>
 #include <linguisticProcessing/core/LinguisticAnalysisStructure/AnalysisGraph.h>
+#include "linguisticProcessing/core/LinguisticAnalysisStructure/MorphoSyntacticData.h"
+#include "linguisticProcessing/core/LinguisticAnalysisStructure/Token.h"
 
+#include <algorithm>
 #include <iostream>
+#include <stdexcept>
+#include <unordered_map>
 #include <vector>
 
 using namespace Lima::LinguisticProcessing;
 using MedData = Lima::Common::MediaticData::MediaticData ;
 
 
-Doc::Doc(bool error, const std::string& errorMessage)
+Doc::Doc(bool error, const std::string& errorMessage) :
+    m_d(std::make_shared<DocPrivate>())
 {
-  m_d = new DocPrivate();
   m_d->error = error;
   m_d->errorMessage = errorMessage;
 }
 
-Doc::~Doc()
-{
-  delete m_d;
-}
+Doc::~Doc() = default;
 
-Doc::Doc(const Doc& a) : m_d(new DocPrivate(*a.m_d))
-{
-  // std::cerr << "Doc::Doc copy constructor" << std::endl;
-}
+Doc::Doc(const Doc& a) = default;
+
+Doc& Doc::operator=(const Doc& a) = default;
 
-Doc& Doc::operator=(const Doc& a)
+Doc::Doc(Doc&& a) noexcept = default;
+
+Doc& Doc::operator=(Doc&& a) noexcept = default;
+
+void Doc::detach()
 {
-  // std::cerr << "Doc::operator=" << std::endl;
-  *m_d = *a.m_d;
-  return *this;
+  if (m_d.use_count() > 1)
+  {
+    m_d = std::make_shared<DocPrivate>(*m_d);
+  }
 }
 
 bool Doc::error() const
@@ -105,11 +111,13 @@ std::string Doc::errorMessage() const
 
 Token& Doc::operator[](int i)
 {
+  m_d->materialize(i);
   return m_d->tokens[i];
 }
 
 Token& Doc::at(int i)
 {
+  m_d->materialize(i);
   return m_d->tokens[i];
 }
 
@@ -118,8 +126,86 @@ int Doc::len()
   return m_d->tokens.size();
 }
 
+bool Doc::retainsAnalysis() const
+{
+  return m_d->analysis != nullptr;
+}
+
+bool Doc::lazyTokens() const
+{
+  return m_d->materializer != nullptr;
+}
+
+/** Estimate of the memory used by the text and the graphs of analysis */
+static std::size_t analysisBytes(const Lima::AnalysisContent& analysis)
+{
+  std::size_t bytes = 0;
+  auto originalText = std::dynamic_pointer_cast<LimaStringText>(analysis.getData("Text"));
+  if (originalText != nullptr)
+  {
+    bytes += originalText->capacity() * sizeof(QChar);
+  }
+  for (const auto& graphName: {"AnalysisGraph", "PosGraph"})
+  {
+    auto graphData = std::dynamic_pointer_cast<LinguisticAnalysisStructure::AnalysisGraph>(
+      analysis.getData(graphName));
+    if (graphData == nullptr)
+    {
+      continue;
+    }
+    const auto* graph = graphData->getGraph();
+    auto morphoDatas = get(vertex_data, *graph);
+    auto [it, itEnd] = boost::vertices(*graph);
+    for (; it != itEnd; it++)
+    {
+      bytes += sizeof(LinguisticAnalysisStructure::Token)
+          + sizeof(LinguisticAnalysisStructure::MorphoSyntacticData);
+      auto morphoData = morphoDatas[*it];
+      if (morphoData != nullptr)
+      {
+        bytes += morphoData->capacity() * sizeof(LinguisticAnalysisStructure::LinguisticElement);
+      }
+    }
+    bytes += boost::num_edges(*graph) * 2 * sizeof(LinguisticGraphEdge);
+  }
+  return bytes;
+}
+
+std::size_t Doc::retainedBytes() const
+{
+  std::size_t bytes = sizeof(Doc) + sizeof(DocPrivate)
+      + m_d->tokens.capacity() * sizeof(Token)
+      + m_d->materialized.capacity() / 8
+      + m_d->sentences.capacity() * sizeof(Span)
+      + m_d->text.capacity()
+      + m_d->language.capacity()
+      + m_d->errorMessage.capacity();
+  for (const auto& token: m_d->tokens)
+  {
+    bytes += token.text.capacity();
+  }
+  bytes += m_d->array.capacity() * sizeof(std::int32_t);
+  for (const auto& column: m_d->columns)
+  {
+    bytes += column.second.capacity() * sizeof(std::int32_t);
+  }
+  for (const auto& column: m_d->retiredColumns)
+  {
+    bytes += column.capacity() * sizeof(std::int32_t);
+  }
+  if (m_d->analysis != nullptr)
+  {
+    bytes += analysisBytes(*m_d->analysis);
+  }
+  return bytes;
+}
+
 std::string Doc::text()
 {
+  if (m_d->analysis == nullptr)
+  {
+    return m_d->text;
+  }
   auto originalText = std::dynamic_pointer_cast<LimaStringText>(m_d->analysis->getData("Text"));
   if (originalText == nullptr)
   {
@@ -136,7 +222,388 @@ const std::vector<Span>& Doc::sentences() const
   return m_d->sentences;
 }
 
+const std::vector<int>& Doc::tokenSentences()
+{
+  auto& index = m_d->tokenSentences;
+  if (index.size() != m_d->tokens.size())
+  {
+    index.assign(m_d->tokens.size(), -1);
+    for (size_t s = 0; s < m_d->sentences.size(); s++)
+    {
+      // The start of sentences other than the first one is the last token of the
+      // previous sentence
+      auto start = m_d->sentences[s].start + (s > 0 ? 1 : 0);
+      auto end = std::min(m_d->sentences[s].end, int(index.size()) - 1);
+      for (auto i = std::max(0, start); i <= end; i++)
+      {
+        index[i] = s;
+      }
+    }
+  }
+  return index;
+}
+
+const std::vector<Span>& Doc::entities()
+{
+  auto& entities = m_d->entities;
+  if (!m_d->entitiesValid)
+  {
+    entities.clear();
+    // Tokens of entities on the analysis graph are tagged B-/I-, the others B/I
+    auto& strings = m_d->strings;
+    const int begins[] = {strings.add("B"), strings.add("B-")};
+    const int insides[] = {strings.add("I"), strings.add("I-")};
+    // The IOB tags and types are set even on lazy documents tokens, which thus do
+    // not need to be materialized
+    const auto& tokens = m_d->tokens;
+    for (size_t i = 0; i < tokens.size(); i++)
+    {
+      auto iob = tokens[i].neIOB;
+      if (iob == begins[0] || iob == begins[1])
+      {
+        entities.emplace_back(int(i), int(i) + 1, tokens[i].neType);
+      }
+      else if ((iob == insides[0] || iob == insides[1]) && !entities.empty()
+               && entities.back().end == int(i)
+               && entities.back().label == tokens[i].neType)
+      {
+        entities.back().end = i + 1;
+      }
+    }
+    m_d->entitiesValid = true;
+  }
+  return entities;
+}
+
+namespace
+{
+
+/** Write the CoNLL-U lines of tokens, each string of the strings store being read
+ * once */
+class ConlluWriter
+{
+public:
+  explicit ConlluWriter(const StringStore& strings) : m_strings(strings) {}
+
+  void write(std::string& out, const Token& token, int firstToken, int id)
+  {
+    out += std::to_string(id);
+    out += '\t';
+    out += token.text;
+    out += '\t';
+    out += string(token.lemma);
+    out += '\t';
+    out += string(token.tag);
+    out += "\t_\t";
+    out += features(token.features);
+    out += '\t';
+    if (token.dep == StringStore::rootId)
+    {
+      out += '0';
+    }
+    else if (token.head >= 0)
+    {
+      out += std::to_string(token.head - firstToken + 1);
+    }
+    else
+    {
+      out += '_';
+    }
+    out += '\t';
+    const auto& dep = string(token.dep);
+    out += dep.empty() ? "_" : dep;
+    out += "\t_\tPos=";
+    out += std::to_string(token.pos - 1);
+    out += "|Len=";
+    out += std::to_string(token.len);
+    if (token.neIOB != StringStore::outsideId)
+    {
+      out += "|NE=";
+      out += string(token.neIOB);
+      out += '-';
+      out += string(token.neType);
+    }
+  }
+
+private:
+  const std::string& string(int id)
+  {
+    auto it = m_cache.find(id);
+    if (it == m_cache.end())
+    {
+      it = m_cache.emplace(id, m_strings.get(id)).first;
+    }
+    return it->second;
+  }
+
+  /** The features formatted as KEY:VALUE pairs joined by "|", or "_" */
+  const std::string& features(int id)
+  {
+    auto it = m_features.find(id);
+    if (it == m_features.end())
+    {
+      std::string result;
+      auto ids = m_strings.featureIds(id);
+      for (size_t i = 0; i + 1 < ids.size(); i += 2)
+      {
+        if (!result.empty())
+        {
+          result += '|';
+        }
+        result += string(ids[i]);
+        result += ':';
+        result += string(ids[i + 1]);
+      }
+      it = m_features.emplace(id, result.empty() ? "_" : result).first;
+    }
+    return it->second;
+  }
+
+  StringStore m_strings;
+  std::unordered_map<int, std::string> m_cache;
+  std::unordered_map<int, std::string> m_features;
+};
+
+/** Append to out the CoNLL-U lines of the tokens of doc from start to end
+ * (excluded) */
+void writeConllu(Doc& doc, ConlluWriter& writer, std::string& out, int start, int end)
+{
+  start = std::max(0, start);
+  end = std::min(end, doc.len());
+  for (auto i = start; i < end; i++)
+  {
+    if (i > start)
+    {
+      out += '\n';
+    }
+    writer.write(out, doc.at(i), start, i - start + 1);
+  }
+}
+
+}
+
+std::string Doc::conllu(int start, int end)
+{
+  std::string result;
+  ConlluWriter writer(m_d->strings);
+  writeConllu(*this, writer, result, start, end);
+  return result;
+}
+
+std::string Doc::sentencesConllu(int first, int last)
+{
+  std::string result;
+  ConlluWriter writer(m_d->strings);
+  first = std::max(0, first);
+  last = std::min(last, int(m_d->sentences.size()));
+  for (auto s = first; s < last; s++)
+  {
+    if (s > first)
+    {
+      result += "\n\n";
+    }
+    // The start of sentences other than the first one is the last token of the
+    // previous sentence
+    writeConllu(*this, writer, result, m_d->sentences[s].start + (s > 0 ? 1 : 0),
+                m_d->sentences[s].end + 1);
+  }
+  return result;
+}
+
 const std::string& Doc::language() const
 {
   return m_d->language;
 }
+
+const StringStore& Doc::strings() const
+{
+  return m_d->strings;
+}
+
+/** Replace the ids of token from the store from by ids of the same strings in the
+ * store to */
+static void reintern(Token& token, const StringStore& from, StringStore& to)
+{
+  for (auto id: {&token.lemma, &token.tag, &token.dep, &token.features,
+                 &token.neIOB, &token.neType, &token.tStatus})
+  {
+    *id = to.add(from.get(*id));
+  }
+}
+
+/** Return the value of the attribute of a token */
+using AttributeGetter = std::int32_t (*)(const Token&);
+
+static const std::vector<std::pair<std::string, AttributeGetter> >& attributeGetters()
+{
+  static const std::vector<std::pair<std::string, AttributeGetter> > getters = {
+    {"I", [](const Token& t) { return std::int32_t(t.i); }},
+    {"IDX", [](const Token& t) { return std::int32_t(t.pos - 1); }},
+    {"LEN", [](const Token& t) { return std::int32_t(t.len); }},
+    {"LEMMA", [](const Token& t) { return std::int32_t(t.lemma); }},
+    {"POS", [](const Token& t) { return std::int32_t(t.tag); }},
+    {"HEAD", [](const Token& t) { return std::int32_t(t.head); }},
+    {"DEP", [](const Token& t) { return std::int32_t(t.dep); }},
+    {"FEATS", [](const Token& t) { return std::int32_t(t.features); }},
+    {"ENT_IOB", [](const Token& t) { return std::int32_t(t.neIOB); }},
+    {"ENT_TYPE", [](const Token& t) { return std::int32_t(t.neType); }},
+    {"T_STATUS", [](const Token& t) { return std::int32_t(t.tStatus); }},
+  };
+  return getters;
+}
+
+static AttributeGetter attributeGetter(const std::string& attribute)
+{
+  for (const auto& [name, getter]: attributeGetters())
+  {
+    if (name == attribute)
+    {
+      return getter;
+    }
+  }
+  throw std::invalid_argument("Unknown token attribute '" + attribute + "'");
+}
+
+std::vector<std::string> Doc::attributeNames()
+{
+  std::vector<std::string> names;
+  for (const auto& getter: attributeGetters())
+  {
+    names.push_back(getter.first);
+  }
+  return names;
+}
+
+std::size_t Doc::toArray(const std::vector<std::string>& attributes)
+{
+  std::vector<AttributeGetter> getters;
+  for (const auto& attribute: attributes)
+  {
+    getters.push_back(attributeGetter(attribute));
+  }
+  // The array of a copy sharing this document must stay valid
+  detach();
+  auto& array = m_d->array;
+  array.resize(m_d->tokens.size() * getters.size());
+  auto value = array.begin();
+  for (size_t i = 0; i < m_d->tokens.size(); i++)
+  {
+    m_d->materialize(i);
+    for (auto getter: getters)
+    {
+      *value++ = getter(m_d->tokens[i]);
+    }
+  }
+  return reinterpret_cast<std::size_t>(array.data());
+}
+
+std::size_t Doc::column(const std::string& attribute)
+{
+  auto it = m_d->columns.find(attribute);
+  if (it == m_d->columns.end())
+  {
+    auto getter = attributeGetter(attribute);
+    std::vector<std::int32_t> values;
+    values.reserve(m_d->tokens.size());
+    for (size_t i = 0; i < m_d->tokens.size(); i++)
+    {
+      m_d->materialize(i);
+      values.push_back(getter(m_d->tokens[i]));
+    }
+    it = m_d->columns.emplace(attribute, std::move(values)).first;
+  }
+  return reinterpret_cast<std::size_t>(it->second.data());
+}
+
+void Doc::setText(const std::string& text)
+{
+  detach();
+  m_d->text = text;
+}
+
+void Doc::setLanguage(const std::string& language)
+{
+  detach();
+  m_d->language = language;
+  StringStore strings(language);
+  if (strings != m_d->strings)
+  {
+    m_d->clearArrays();
+    m_d->entitiesValid = false;
+    for (size_t i = 0; i < m_d->tokens.size(); i++)
+    {
+      m_d->materialize(i);
+      reintern(m_d->tokens[i], m_d->strings, strings);
+    }
+    m_d->strings = strings;
+  }
+}
+
+void Doc::addToken(const Token& token)
+{
+  detach();
+  m_d->clearArrays();
+  m_d->tokenSentences.clear();
+  m_d->entitiesValid = false;
+  m_d->tokens.push_back(token);
+  if (m_d->materializer != nullptr)
+  {
+    m_d->materialized.push_back(true);
+  }
+}
+
+void Doc::addSentence(const Span& sentence)
+{
+  detach();
+  m_d->tokenSentences.clear();
+  m_d->sentences.push_back(sentence);
+}
+
+void Doc::append(const Doc& other, int posOffset)
+{
+  detach();
+  if (m_d->language.empty())
+  {
+    setLanguage(other.m_d->language);
+  }
+  m_d->clearArrays();
+  m_d->tokenSentences.clear();
+  m_d->entitiesValid = false;
+  bool sameStrings = m_d->strings == other.m_d->strings;
+  int tokenOffset = m_d->tokens.size();
+  m_d->tokens.reserve(m_d->tokens.size() + other.m_d->tokens.size());
+  for (size_t i = 0; i < other.m_d->tokens.size(); i++)
+  {
+    other.m_d->materialize(i);
+  }
+  for (auto token: other.m_d->tokens)
+  {
+    token.i += tokenOffset;
+    token.pos += posOffset;
+    // Roots and tokens without governor have no head to remap
+    if (token.dep != StringStore::rootId && token.dep != StringStore::noneId)
+    {
+      token.head += tokenOffset;
+    }
+    if (!sameStrings)
+    {
+      reintern(token, other.m_d->strings, m_d->strings);
+    }
+    m_d->tokens.push_back(token);
+    if (m_d->materializer != nullptr)
+    {
+      m_d->materialized.push_back(true);
+    }
+  }
+  for (const auto& sentence: other.m_d->sentences)
+  {
+    // The start of sentences other than the first one is the last token of the
+    // previous sentence
+    auto start = sentence.start + tokenOffset;
+    if (&sentence == &other.m_d->sentences.front() && !m_d->sentences.empty())
+    {
+      start -= 1;
+    }
+    m_d->sentences.push_back(Span(start, sentence.end + tokenOffset));
+  }
+}
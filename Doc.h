@@ -57,11 +57,15 @@
 #define DOC_H
 
 #include "Span.h"
+#include "StringStore.h"
 #include "Token.h"
 
 #include "macros.h"
 
+#include <cstddef>
+#include <memory>
 #include <string>
+#include <vector>
 
 class LimaAnalyzer;
 class DocPrivate;
@@ -70,18 +74,78 @@ class BINDINGS_API Doc
 public:
   Doc(bool error=false, const std::string& errorMessage="");
   ~Doc();
+  /** Copies share the data of the document, which is only duplicated when one of
+   * them is modified by a builder method or by toArray. Returning documents by
+   * value, in a vector or to Python, thus never copies their tokens */
   Doc(const Doc& a);
   Doc& operator=(const Doc& a);
+  /** A moved-from document can only be destroyed or assigned */
+  Doc(Doc&& a) noexcept;
+  Doc& operator=(Doc&& a) noexcept;
   bool error() const;
   std::string errorMessage() const;
   std::string text();
   Token& operator[](int i);
   Token& at(int i);
   const std::vector<Span>& sentences() const;
+  /** Return the index in sentences() of the sentence of each token, or -1 for
+   * tokens outside of any sentence. It is computed once */
+  const std::vector<int>& tokenSentences();
+  /** Return the named entities of the document, in order. Their start is the
+   * index of their first token, their end the index after their last token and
+   * their label the id of their type in strings(). They are computed once from the
+   * IOB tags of the tokens */
+  const std::vector<Span>& entities();
+  /** Return the CoNLL-U lines of the tokens from start to end (excluded). Their
+   * ids and heads are numbered from 1 at start; roots have head 0 */
+  std::string conllu(int start, int end);
+  /** Return the CoNLL-U lines of the sentences from first to last (excluded), each
+   * numbered from 1, and separated by an empty line */
+  std::string sentencesConllu(int first, int last);
   const std::string& language() const;
+  /** The store of the strings of the tokens of this document, which is the one of
+   * its language */
+  const StringStore& strings() const;
   int len();
+  /** Return true if the document retains the content of its analysis */
+  bool retainsAnalysis() const;
+  /** Return true if the fields of the tokens are computed when first read */
+  bool lazyTokens() const;
+  /** Return an estimate of the memory retained by the document, in bytes. It
+   * includes the main analysis structures when the analysis is retained. The
+   * strings stores shared by all documents are not counted. */
+  std::size_t retainedBytes() const;
+
+  /** The token attributes that can be exported by toArray and column. String
+   * attributes are exported as their ids in strings() */
+  static std::vector<std::string> attributeNames();
+  /** Fill in one pass an array with the values of attributes for each token,
+   * row by row, and return its address. It holds len() * attributes.size() int32
+   * values and is valid until the next call of toArray or until the document is
+   * modified or destroyed. Throws std::invalid_argument on unknown attributes */
+  std::size_t toArray(const std::vector<std::string>& attributes);
+  /** Return the address of the len() int32 values of attribute for each token. It
+   * is computed once and valid until the document is modified or destroyed */
+  std::size_t column(const std::string& attribute);
+
+  /** Builder methods used to rebuild a document outside of an analysis, e.g. when
+   * it is transferred between processes */
+  void setText(const std::string& text);
+  /** Set the language of the document and thus its strings store. The strings of
+   * the tokens already added are moved to the new store */
+  void setLanguage(const std::string& language);
+  /** Add a token whose string fields are ids in strings() */
+  void addToken(const Token& token);
+  void addSentence(const Span& sentence);
+  /** Append the tokens and sentences of other, which was analyzed from a part of
+   * this document text starting at posOffset, remapping their indexes */
+  void append(const Doc& other, int posOffset);
   friend class LimaAnalyzer;
-  DocPrivate* m_d;
+  std::shared_ptr<DocPrivate> m_d;
+
+private:
+  /** Give this document its own copy of its data before modifying it */
+  void detach();
 };
 
 
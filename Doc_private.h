@@ -53,8 +53,13 @@
 **
 ****************************************************************************/
 
+#include "StringStore.h"
+
+#include <cstdint>
 #include <iostream>
+#include <map>
 #include <memory>
+#include <string>
 #include <vector>
 
 namespace Lima {
@@ -63,6 +68,17 @@ namespace Lima {
 
 class Doc;
 class Span;
+
+/** Computes the fields of the tokens of a document from the analysis it retains,
+ * such that they are only computed for the tokens that are read */
+class TokenMaterializer
+{
+public:
+  virtual ~TokenMaterializer() = default;
+  /** Fill the fields of token that were left empty when the document was built */
+  virtual void materialize(Token& token) const = 0;
+};
+
 class DocPrivate
 {
   friend class Doc;
@@ -72,10 +88,48 @@ public:
   DocPrivate(const DocPrivate& a) = default;
   DocPrivate& operator=(const DocPrivate& a) = default;
 
+  /** Ensure that the fields of the token i are computed */
+  void materialize(int i)
+  {
+    if (materializer != nullptr && !materialized[i])
+    {
+      materializer->materialize(tokens[i]);
+      materialized[i] = true;
+    }
+  }
+
+  /** Invalidate the exported columns once the tokens change. Their memory is
+   * kept until the document is destroyed because Python arrays may still view
+   * it */
+  void clearArrays()
+  {
+    for (auto& column: columns)
+    {
+      retiredColumns.push_back(std::move(column.second));
+    }
+    columns.clear();
+  }
+
   std::vector<Token> tokens;
+  /** The last array filled by Doc::toArray and the columns filled by Doc::column */
+  std::vector<std::int32_t> array;
+  std::map<std::string, std::vector<std::int32_t> > columns;
+  std::vector<std::vector<std::int32_t> > retiredColumns;
+  /** Set for lazy documents only, with the materialized state of each token */
+  std::shared_ptr<const TokenMaterializer> materializer;
+  std::vector<bool> materialized;
   std::shared_ptr<Lima::AnalysisContent> analysis;
+  /** The original text when there is no analysis to get it from */
+  std::string text;
   std::vector<Span> sentences;
+  /** The result of Doc::tokenSentences, valid if its size is the number of
+   * tokens */
+  std::vector<int> tokenSentences;
+  /** The result of Doc::entities, valid if entitiesValid is true */
+  std::vector<Span> entities;
+  bool entitiesValid = false;
   std::string language;
+  StringStore strings;
   bool error = false;
   std::string errorMessage = "";
 };
@@ -57,14 +57,15 @@
 
 #include <iostream>
 
-Span::Span()
+Span::Span() : start(0), end(0), label(0)
 {
 }
 
-Span::Span(int start, int end)
+Span::Span(int start, int end, int label)
 {
   this->start = start;
   this->end = end;
+  this->label = label;
 }
 
 Span::Span(const Span& a)
@@ -72,6 +73,7 @@ Span::Span(const Span& a)
   // std::cerr << "Span::Span copy constructor" << std::endl;
   start = a.start;
   end = a.end;
+  label = a.label;
 }
 
 Span& Span::operator=(const Span& a)
@@ -79,5 +81,6 @@ Span& Span::operator=(const Span& a)
   // std::cerr << "Span::operator=" << std::endl;
   start = a.start;
   end = a.end;
+  label = a.label;
   return *this;
 }
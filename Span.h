@@ -64,13 +64,16 @@
 struct BINDINGS_API Span
 {
   Span();
-  Span(int start, int end);
+  Span(int start, int end, int label = 0);
   ~Span() = default;
   Span(const Span& a);
   Span& operator=(const Span& a);
 
   int start;
   int end;
+  /** The id of the label of the span in the strings store of its document, e.g. the
+   * type of a named entity. Sentences have no label (StringStore::emptyId) */
+  int label;
 };
 
 
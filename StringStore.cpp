@@ -0,0 +1,173 @@
+// Copyright 2026 CEA LIST
+// SPDX-FileCopyrightText: 2026 CEA LIST <gael.de-chalendar@cea.fr>
+//
+// SPDX-License-Identifier: MIT
+
+#include "StringStore.h"
+
+#include <deque>
+#include <map>
+#include <mutex>
+#include <shared_mutex>
+#include <stdexcept>
+#include <string_view>
+#include <unordered_map>
+
+class StringStorePrivate
+{
+public:
+  explicit StringStorePrivate(const std::string& language) : language(language)
+  {
+    // Same order as the reserved ids of StringStore
+    for (const auto& s: {"", "_", "O", "root"})
+    {
+      add(s);
+    }
+  }
+
+  int add(const std::string& s)
+  {
+    {
+      std::shared_lock<std::shared_mutex> lock(mutex);
+      auto it = ids.find(s);
+      if (it != ids.end())
+      {
+        return it->second;
+      }
+    }
+    std::unique_lock<std::shared_mutex> lock(mutex);
+    auto it = ids.find(s);
+    if (it != ids.end())
+    {
+      return it->second;
+    }
+    int id = strings.size();
+    // References to deque elements are not invalidated by push_back, so the
+    // keys of ids can view them
+    strings.push_back(s);
+    ids.emplace(std::string_view(strings.back()), id);
+    return id;
+  }
+
+  const std::string language;
+  mutable std::shared_mutex mutex;
+  std::deque<std::string> strings;
+  std::unordered_map<std::string_view, int> ids;
+  /** The results of StringStore::featureIds */
+  std::unordered_map<int, std::vector<int> > features;
+};
+
+namespace
+{
+
+std::mutex storesMutex;
+std::map<std::string, std::shared_ptr<StringStorePrivate> > stores;
+
+}
+
+StringStore::StringStore(const std::string& language)
+{
+  std::lock_guard<std::mutex> lock(storesMutex);
+  auto& store = stores[language];
+  if (store == nullptr)
+  {
+    store = std::make_shared<StringStorePrivate>(language);
+  }
+  m_d = store;
+}
+
+StringStore::~StringStore() = default;
+
+StringStore::StringStore(const StringStore& a) = default;
+
+StringStore& StringStore::operator=(const StringStore& a) = default;
+
+bool StringStore::operator==(const StringStore& a) const
+{
+  return m_d == a.m_d;
+}
+
+bool StringStore::operator!=(const StringStore& a) const
+{
+  return m_d != a.m_d;
+}
+
+const std::string& StringStore::language() const
+{
+  return m_d->language;
+}
+
+int StringStore::add(const std::string& s)
+{
+  return m_d->add(s);
+}
+
+std::string StringStore::get(int id) const
+{
+  std::shared_lock<std::shared_mutex> lock(m_d->mutex);
+  if (id < 0 || static_cast<size_t>(id) >= m_d->strings.size())
+  {
+    throw std::out_of_range("No string with id " + std::to_string(id)
+                            + " in the store of language '" + m_d->language + "'");
+  }
+  return m_d->strings[id];
+}
+
+int StringStore::size() const
+{
+  std::shared_lock<std::shared_mutex> lock(m_d->mutex);
+  return m_d->strings.size();
+}
+
+std::vector<int> StringStore::featureIds(int id)
+{
+  {
+    std::shared_lock<std::shared_mutex> lock(m_d->mutex);
+    auto it = m_d->features.find(id);
+    if (it != m_d->features.end())
+    {
+      return it->second;
+    }
+  }
+  auto features = get(id);
+  std::vector<int> result;
+  if (features != "_")
+  {
+    size_t begin = 0;
+    while (begin <= features.size())
+    {
+      auto end = features.find('|', begin);
+      if (end == std::string::npos)
+      {
+        end = features.size();
+      }
+      auto feature = features.substr(begin, end - begin);
+      auto equal = feature.find('=');
+      if (equal != std::string::npos)
+      {
+        result.push_back(add(feature.substr(0, equal)));
+        result.push_back(add(feature.substr(equal + 1)));
+      }
+      begin = end + 1;
+    }
+  }
+  std::unique_lock<std::shared_mutex> lock(m_d->mutex);
+  m_d->features.emplace(id, result);
+  return result;
+}
+
+std::vector<std::string> StringStore::strings(int from) const
+{
+  std::shared_lock<std::shared_mutex> lock(m_d->mutex);
+  if (from < 0 || static_cast<size_t>(from) >= m_d->strings.size())
+  {
+    return {};
+  }
+  return std::vector<std::string>(m_d->strings.begin() + from, m_d->strings.end());
+}
+
+void StringStore::reset(const std::string& language)
+{
+  std::lock_guard<std::mutex> lock(storesMutex);
+  stores.erase(language);
+}
@@ -0,0 +1,68 @@
+// Copyright 2026 CEA LIST
+// SPDX-FileCopyrightText: 2026 CEA LIST <gael.de-chalendar@cea.fr>
+//
+// SPDX-License-Identifier: MIT
+
+#ifndef STRINGSTORE_H
+#define STRINGSTORE_H
+
+#include "macros.h"
+
+#include <memory>
+#include <string>
+#include <vector>
+
+class StringStorePrivate;
+
+/** The strings of the tokens of a language (lemmas, tags, dependency relations,
+ * named entity types and tokenization status), interned once and shared by all
+ * the documents of this language. Tokens hold ids in this store.
+ *
+ * A StringStore is a handle: all the instances built for the same language share
+ * the same strings. Ids are only valid in the process that created them.
+ *
+ * Strings are never removed from a store, so it grows with each new lemma or
+ * feature combination analyzed in its language. Long-running processes can bound
+ * it with reset. */
+class BINDINGS_API StringStore
+{
+public:
+  /** The store of language */
+  StringStore(const std::string& language = "");
+  ~StringStore();
+  StringStore(const StringStore& a);
+  StringStore& operator=(const StringStore& a);
+  bool operator==(const StringStore& a) const;
+  bool operator!=(const StringStore& a) const;
+
+  const std::string& language() const;
+  /** Return the id of s, interning it if necessary */
+  int add(const std::string& s);
+  /** Return the string with the given id. Throws std::out_of_range if it does
+   * not exist */
+  std::string get(int id) const;
+  int size() const;
+  /** Return the strings with ids starting at from */
+  std::vector<std::string> strings(int from = 0) const;
+  /** Return the ids of the keys and values of the morphological features string
+   * with the given id, formatted as KEY=VALUE pairs joined by "|" or "_" if there
+   * are none: [key0, value0, key1, value1, ...]. The result is computed once per
+   * id. Throws std::out_of_range if the id does not exist */
+  std::vector<int> featureIds(int id);
+  /** Drop the store of language: the stores built for it afterwards start again
+   * with the reserved strings only. The existing handles, and thus the documents,
+   * keep using the previous store, which is freed with the last of them. Ids of
+   * the previous store must not be used with the new one */
+  static void reset(const std::string& language);
+
+  /** Ids of strings present in all the stores */
+  static constexpr int emptyId = 0;    // ""
+  static constexpr int noneId = 1;     // "_"
+  static constexpr int outsideId = 2;  // "O"
+  static constexpr int rootId = 3;     // "root"
+
+private:
+  std::shared_ptr<StringStorePrivate> m_d;
+};
+
+#endif // STRINGSTORE_H
@@ -54,25 +54,33 @@
 ****************************************************************************/
 
 #include "Token.h"
+#include "StringStore.h"
 
 #include <iostream>
 
-Token::Token() : neIOB("O"), neType("_")
+Token::Token() :
+    lemma(StringStore::emptyId),
+    tag(StringStore::emptyId),
+    dep(StringStore::emptyId),
+    features(StringStore::noneId),
+    neIOB(StringStore::outsideId),
+    neType(StringStore::noneId),
+    tStatus(StringStore::emptyId)
 {
 }
 
 Token::Token(int len,
       const std::string& text,
-      const std::string& lemma,
+      int lemma,
       int i,
       int pos,
-      const std::string& tag,
+      int tag,
       const int head,
-      const std::string& dep,
-      const std::string& feats,
-      const std::string& neIOB,
-      const std::string& neType,
-      const std::string& tStatus)
+      int dep,
+      int feats,
+      int neIOB,
+      int neType,
+      int tStatus)
 {
   this->len = len;
   this->text = text;
@@ -63,21 +63,23 @@
 
 class Doc;
 
+/** A token of a document. Its lemma, tag, dep, features, neIOB, neType and
+ * tStatus are ids in the StringStore of the document */
 struct BINDINGS_API Token
 {
   Token();
   Token(int len,
         const std::string& text,
-        const std::string& lemma,
+        int lemma,
         int i,
         int pos,
-        const std::string& tag,
+        int tag,
         int head,
-        const std::string& dep,
-        const std::string& feats,
-        const std::string& neIOB,
-        const std::string& neType,
-        const std::string& tStatus);
+        int dep,
+        int feats,
+        int neIOB,
+        int neType,
+        int tStatus);
   ~Token() = default;
   Token(const Token& a) = default;
   Token& operator=(const Token& a) = default;
@@ -88,15 +90,15 @@ struct BINDINGS_API Token
 //   Doc& doc();
 //   Token head();
   int i;
-  std::string lemma;
+  int lemma;
   int pos;
-  std::string tag;
+  int tag;
   int head;
-  std::string dep;
-  std::string features;
-  std::string neIOB;
-  std::string neType;
-  std::string tStatus;
+  int dep;
+  int features;
+  int neIOB;
+  int neType;
+  int tStatus;
 };
 
 
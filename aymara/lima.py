@@ -16,9 +16,12 @@ Example::
 
 Classes:
 
+    CallProfile
     Doc
     Lima
+    LimaPool
     Span
+    StringStore
     Token
 
 """
@@ -31,17 +34,35 @@ Classes:
 # -*- coding: utf-8 -*-
 
 import argparse
+import asyncio
+import collections
+import concurrent.futures.process
+import contextlib
+import hashlib
+import io
+import itertools
+import json
+import multiprocessing
 import os
 import pathlib
+import queue
 import sys
+import threading
+import time
+import types
+import warnings
+import weakref
 
 from distutils.dir_util import copy_tree
 from pydantic import (parse_obj_as, ValidationError)
 from tqdm import tqdm
-from typing import (Dict, Tuple, Union)
+from typing import (Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List,
+                    Mapping, Tuple, Union)
 
 import aymaralima.cpplima
 
+from aymara.version import __version__
+
 
 def _get_data_dir(appname: str):
     """
@@ -67,28 +88,477 @@ def _get_data_dir(appname: str):
     return ans.joinpath(appname)
 
 
+def _resources_id(user_resources_path: str = "") -> List[Tuple[str, int, int]]:
+    """
+    This private function identifies the LIMA resources found by an analyzer: the
+    ones of user_resources_path, of the LIMA_RESOURCES environment variable, the
+    installed models and the ones shipped with aymara. It walks these directories.
+
+    :param user_resources_path: the user resources path of the analyzer.
+    :type user_resources_path: str
+    :return: the path, the number of files and the latest modification time of
+        the files, in nanoseconds, of each existing resources directory.
+    :rtype: List[Tuple[str, int, int]]
+    """
+    directories = [user_resources_path] if user_resources_path else []
+    directories += [d for d in os.getenv("LIMA_RESOURCES", "").split(os.pathsep) if d]
+    directories += [str(_get_data_dir("lima") / "resources"),
+                    str(pathlib.Path(list(aymaralima.__path__)[-1]) / "resources")]
+    result = []
+    for directory in directories:
+        files = 0
+        latest = 0
+        for root, _, names in os.walk(directory):
+            for name in names:
+                try:
+                    mtime = os.stat(os.path.join(root, name)).st_mtime_ns
+                except OSError:
+                    continue
+                files += 1
+                latest = max(latest, mtime)
+        if files:
+            result.append((directory, files, latest))
+    return result
+
+
+def _split_batches(texts: Iterable[Union[str, Tuple[str, Any]]],
+                   size: int,
+                   as_tuples: bool,
+                   with_lang: bool = False) -> Iterator[Tuple[List[str], List[str],
+                                                              List[Any]]]:
+    """
+    This private function splits the texts given to Lima.pipe into batches of at most
+    size texts and checks their type.
+
+    :param texts: the texts, or (text, context) tuples if as_tuples is True. If
+        with_lang is True, each text is itself a (text, lang) tuple.
+    :type texts: Iterable[Union[str, Tuple[str, Any]]]
+    :param size: the maximum number of texts in each batch.
+    :type size: int
+    :param as_tuples: True if texts are (text, context) tuples.
+    :type as_tuples: bool
+    :param with_lang: True if texts are (text, lang) tuples.
+    :type with_lang: bool
+    :return: an iterator on (texts, langs, contexts) triples. langs is None if
+        with_lang is False and contexts is None if as_tuples is False.
+    :rtype: Iterator[Tuple[List[str], List[str], List[Any]]]
+    """
+    for batch in _batches(texts, size):
+        contexts = None
+        langs = None
+        if as_tuples:
+            contexts = [context for _, context in batch]
+            batch = [text for text, _ in batch]
+        if with_lang:
+            langs = [lang for _, lang in batch]
+            batch = [text for text, _ in batch]
+        for text in batch:
+            if not isinstance(text, str):
+                raise TypeError(f"Lima.pipe texts must be str, not {type(text)}")
+        yield batch, langs, contexts
+
+
+# Chunk boundaries searched by _split_chunks, by order of preference: paragraph
+# breaks, which never split a sentence, then word boundaries as a last resort.
+# Punctuation is not a safe sentence boundary ("Mr. Best", "U.S. Army")
+_CHUNK_SEPARATORS = (("\n\n",),
+                     (" ", "\t", "\n"))
+
+
+def _split_chunks(text: str, size: int) -> Iterator[Tuple[int, str]]:
+    """
+    This private function splits text into consecutive chunks of at most size
+    characters. Chunks end at a paragraph break (an empty line). Only when there is
+    none in size characters, the chunk ends at a word boundary, which can split a
+    sentence, or in the middle of a word if there is no word boundary either.
+
+    :param text: the text to split.
+    :type text: str
+    :param size: the maximum number of characters in each chunk.
+    :type size: int
+    :return: an iterator on (offset, chunk) pairs where offset is the position of
+        chunk in text.
+    :rtype: Iterator[Tuple[int, str]]
+    """
+    start = 0
+    while len(text) - start > size:
+        end = start + size
+        for separators in _CHUNK_SEPARATORS:
+            cut = -1
+            for sep in separators:
+                found = text.rfind(sep, start, end)
+                if found >= 0:
+                    cut = max(cut, found + len(sep))
+            if cut > start:
+                end = cut
+                break
+        yield start, text[start:end]
+        start = end
+    if start < len(text):
+        yield start, text[start:]
+
+
+async def _aiter(iterable: Union[AsyncIterable, Iterable]) -> AsyncIterator:
+    """
+    This private function iterates asynchronously over an asynchronous or a
+    synchronous iterable.
+
+    :param iterable: the iterable to iterate over.
+    :type iterable: Union[AsyncIterable, Iterable]
+    :return: an asynchronous iterator on the elements of iterable.
+    :rtype: AsyncIterator
+    """
+    if hasattr(iterable, "__aiter__"):
+        async for item in iterable:
+            yield item
+    else:
+        for item in iterable:
+            yield item
+
+
+def _batches(iterable: Iterable, size: int) -> Iterator[List]:
+    """
+    This private function splits an iterable into lists of at most size elements.
+
+    :param iterable: the iterable to split.
+    :type iterable: Iterable
+    :param size: the maximum number of elements in each list.
+    :type size: int
+    :return: an iterator on the successive lists.
+    :rtype: Iterator[List]
+    """
+    iterator = iter(iterable)
+    batch = list(itertools.islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(iterator, size))
+
+
+def _numpy():
+    """
+    This private function imports numpy, which is only needed to export documents
+    as arrays.
+
+    :return: the numpy module
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("Exporting documents as arrays requires numpy. Install it "
+                          "with: pip install aymara[arrays]") from e
+    return numpy
+
+
+def _pyarrow():
+    """
+    This private function imports pyarrow, which is only needed to export documents
+    as Arrow tables.
+
+    :return: the pyarrow module
+    """
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Exporting documents to Arrow requires pyarrow. Install it "
+                          "with: pip install aymara[arrow]") from e
+    return pyarrow
+
+
+# The number of sentences converted to CoNLL-U at once by Doc.to_conllu when writing
+# to a file, bounding the memory used for large documents
+_CONLLU_SENTENCES = 1000
+
+
+# The token columns of Arrow tables: their name, the exported attribute and whether
+# it is a string attribute, dictionary-encoded with the strings store
+_ARROW_COLUMNS = (("idx", "IDX", False),
+                  ("len", "LEN", False),
+                  ("head", "HEAD", False),
+                  ("lemma", "LEMMA", True),
+                  ("pos", "POS", True),
+                  ("dep", "DEP", True),
+                  ("features", "FEATS", True),
+                  ("ent_iob", "ENT_IOB", True),
+                  ("ent_type", "ENT_TYPE", True),
+                  ("t_status", "T_STATUS", True))
+
+
+def _arrow_arrays(doc) -> List:
+    """
+    This private function returns the Arrow arrays of the token columns of a
+    document. Their values are not copied: they view the columns of the C++
+    document, which they keep alive.
+
+    :param doc: the document to export
+    :type doc: Doc
+    :return: the arrays of the columns of _ARROW_COLUMNS
+    :rtype: List[pyarrow.Array]
+    """
+    pyarrow = _pyarrow()
+    arrays = []
+    for _, attribute, is_string in _ARROW_COLUMNS:
+        if len(doc) == 0:
+            values = pyarrow.array([], type=pyarrow.int32())
+        else:
+            buffer = pyarrow.foreign_buffer(doc.limadoc.column(attribute),
+                                            4 * len(doc), base=doc.limadoc)
+            values = pyarrow.Array.from_buffers(pyarrow.int32(), len(doc),
+                                                [None, buffer])
+        if is_string:
+            values = pyarrow.DictionaryArray.from_arrays(
+                values, doc.strings._arrow_dictionary())
+        arrays.append(values)
+    return arrays
+
+
+def docs_to_arrow(docs: Iterable):
+    """
+    Export the tokens of documents to an Arrow table, with one row per token and a
+    doc column giving the position of its document in docs. Each column is made of
+    one chunk per document, viewing its data without copying it. See Doc.to_arrow
+    for the other columns.
+
+    Example::
+
+        import aymara.lima
+        nlp = aymara.lima.Lima()
+        docs = list(nlp.pipe(["Give it back!", "He pleaded."]))
+        table = aymara.lima.docs_to_arrow(docs)
+        assert table.num_rows == sum(len(doc) for doc in docs)
+
+    :param docs: the documents to export.
+    :type docs: Iterable[Doc]
+    :return: the table of the tokens of docs.
+    :rtype: pyarrow.Table
+    """
+    pyarrow = _pyarrow()
+    numpy = _numpy()
+    chunks = [[] for _ in range(len(_ARROW_COLUMNS) + 1)]
+    for i, doc in enumerate(docs):
+        chunks[0].append(pyarrow.array(numpy.full(len(doc), i, dtype=numpy.int32)))
+        for column, array in zip(chunks[1:], _arrow_arrays(doc)):
+            column.append(array)
+    names = ["doc"] + [name for name, _, _ in _ARROW_COLUMNS]
+    types = ([pyarrow.int32()]
+             + [pyarrow.dictionary(pyarrow.int32(), pyarrow.string()) if is_string
+                else pyarrow.int32() for _, _, is_string in _ARROW_COLUMNS])
+    return pyarrow.table([pyarrow.chunked_array(column, type=t)
+                          for column, t in zip(chunks, types)],
+                         names=names)
+
+
+class _Int32ArrayView:
+    """Exposes an int32 array owned by a C++ document through the numpy array
+    interface. It keeps the document alive as long as the arrays viewing it."""
+
+    def __init__(self, owner, address: int, shape: Tuple[int, ...]):
+        self._owner = owner
+        self.__array_interface__ = {
+            "shape": shape,
+            "typestr": ("<" if sys.byteorder == "little" else ">") + "i4",
+            "data": (address, True),
+            "version": 3,
+        }
+
+
+def _int32_array(owner, address: int, shape: Tuple[int, ...]):
+    """
+    This private function returns a read-only numpy array viewing the int32 values
+    at address, owned by owner.
+
+    :param owner: the object owning the values
+    :param address: the address of the values
+    :type address: int
+    :param shape: the shape of the array
+    :type shape: Tuple[int, ...]
+    :return: the read-only numpy array viewing the values
+    :rtype: numpy.ndarray
+    """
+    numpy = _numpy()
+    if 0 in shape:
+        return numpy.empty(shape, dtype=numpy.int32)
+    return numpy.asarray(_Int32ArrayView(owner, address, shape))
+
+
+class StringStore:
+    """The strings of the tokens of a language: lemmas, tags, dependency relations,
+    named entity types and tokenization status. Tokens only hold ids in this store
+    and each string is converted to Python once, when it is first read. There is
+    one store per language, shared by all its documents.
+
+    Strings are never removed from a store, so it grows with each new lemma or
+    features combination analyzed in its language (see Lima.string_stats). Long
+    running processes can bound it with StringStore.reset.
+
+    Example::
+
+        import aymara.lima
+        nlp = aymara.lima.Lima()
+        doc = nlp("Give it back! He pleaded.")
+        assert doc.strings[doc.strings.add("root")] == "root"
+    """
+    def __init__(self, store: aymaralima.cpplima.StringStore):
+        """StringStore's constructor
+
+        :param store: the C++ binding StringStore class
+        :type store: aymaralima.cpplima.StringStore
+        """
+        self.store = store
+        self._strings = []
+        self._lock = threading.Lock()
+        # The Arrow array of the strings, built by _arrow_dictionary
+        self._dictionary = None
+        # The read-only mappings returned by features, by features string id
+        self._features = {}
+
+    def __getitem__(self, i: int) -> str:
+        """Return the string with id i
+
+        :param i: the id of the string
+        :type i: int
+        :return: the string with id i
+        :rtype: str
+        """
+        try:
+            return self._strings[i]
+        except IndexError:
+            with self._lock:
+                if i >= len(self._strings):
+                    self._strings.extend(
+                        sys.intern(s) for s in self.store.strings(len(self._strings)))
+            return self._strings[i]
+
+    def __len__(self) -> int:
+        """Return the number of strings in the store
+
+        :return: the number of strings in the store
+        :rtype: int
+        """
+        return self.store.size()
+
+    def _arrow_dictionary(self):
+        """Return an Arrow array of all the strings of the store, used as the
+        dictionary of the string columns of Arrow exports. It is rebuilt only when
+        strings were added since the previous call."""
+        with self._lock:
+            self._strings.extend(
+                sys.intern(s) for s in self.store.strings(len(self._strings)))
+            if (self._dictionary is None
+                    or len(self._dictionary) != len(self._strings)):
+                self._dictionary = _pyarrow().array(self._strings,
+                                                    type=_pyarrow().string())
+            return self._dictionary
+
+    def features(self, i: int) -> Mapping[str, str]:
+        """Return the morphological features of the features string with id i as a
+        read-only mapping. It is built once per id and shared by all the tokens with
+        these features.
+
+        :param i: the id of a features string
+        :type i: int
+        :return: the mapping from features names to their values
+        :rtype: Mapping[str, str]
+        """
+        try:
+            return self._features[i]
+        except KeyError:
+            ids = self.store.featureIds(i)
+            features = types.MappingProxyType(
+                {self[k]: self[v] for k, v in zip(ids[::2], ids[1::2])})
+            return self._features.setdefault(i, features)
+
+    def add(self, s: str) -> int:
+        """Intern a string
+
+        :param s: the string to intern
+        :type s: str
+        :return: the id of s
+        :rtype: int
+        """
+        return self.store.add(s)
+
+    @staticmethod
+    def reset(lang: str):
+        """Drop the store of a language: the documents analyzed afterwards use a new
+        store, which starts again with the reserved strings only. Existing documents
+        keep the previous store, which is freed with the last of them. Ids read
+        from them must not be used with the new store.
+
+        :param lang: the language of the store
+        :type lang: str
+        """
+        aymaralima.cpplima.StringStore.reset(lang)
+
+    lang = property(
+            fget=lambda self: self.store.language(),
+            doc="Language of the store.")
+
+
+# The Python stores of the languages, sharing their strings caches between documents
+_string_stores = {}
+_string_stores_lock = threading.Lock()
+
+
+def _string_store(store: aymaralima.cpplima.StringStore) -> StringStore:
+    """
+    This private function returns the Python store wrapping the C++ store of a
+    language.
+
+    :param store: the C++ store of a language
+    :type store: aymaralima.cpplima.StringStore
+    :return: the Python store of this language
+    :rtype: StringStore
+    """
+    lang = store.language()
+    strings = _string_stores.get(lang)
+    if strings is None or strings.store != store:
+        with _string_stores_lock:
+            strings = _string_stores.get(lang)
+            # The store of the language was reset (see StringStore.reset)
+            if strings is None or strings.store != store:
+                strings = _string_stores[lang] = StringStore(store)
+    return strings
+
+
 class Token:
     """A token
 
     TODO
     Some parts of the API are still not implemented
 
-        sent     The sentence span that this token is a part of.
-        Span
-
         lang    Language of the parent document’s vocabulary.
         str
 
 
     """
-    def __init__(self, token: aymaralima.cpplima.Token):
+    __slots__ = ("token", "_limadoc", "_docref", "_strings")
+
+    def __init__(self, token: aymaralima.cpplima.Token, doc):
         """Token's constructor
 
         :param token: the C++ binding Token class
         :type token: aymaralima.cpplima.Token
+        :param doc: the document of the token
+        :type doc: Doc
         """
         assert type(token) == aymaralima.cpplima.Token
         self.token = token
+        # The document caches its tokens: a weak reference avoids a reference cycle
+        # which would keep the document and its analysis alive until the garbage
+        # collector runs. The C++ document, which owns the token data, is kept.
+        self._limadoc = doc.limadoc
+        self._docref = weakref.ref(doc)
+        self._strings = doc.strings
+
+    @property
+    def _doc(self):
+        """The document of the token, rebuilt around its C++ document if the
+        original one has been freed"""
+        doc = self._docref()
+        if doc is None:
+            doc = Doc(self._limadoc)
+            self._docref = weakref.ref(doc)
+        return doc
 
     def __repr__(self) -> str:
         """
@@ -127,8 +597,8 @@ class Token:
                 + f"{head}\t"
                 + f"{self.dep if self.dep else '_'}\t_\t"
                 + f"Pos={self.idx}|Len={len(self)}"
-                + (f"" if self.token.neIOB == 'O'
-                   else f"|NE={self.token.neIOB}-{self.token.neType}"))
+                + (f"" if self.ent_iob == 'O'
+                   else f"|NE={self.ent_iob}-{self.ent_type}"))
 
     def __len__(self) -> int:
         """Return the length of the token in UTF-8 code points
@@ -150,16 +620,20 @@ class Token:
             fget=lambda self: self.token.text,
             doc="The original text of the token.")
 
+    doc = property(
+            fget=lambda self: self._doc,
+            doc="The parent document.")
+
     i = property(
             fget=lambda self: self.token.i+1,
             doc="The index of this token in its parent document.")
 
     lemma = property(
-            fget=lambda self: self.token.lemma,
+            fget=lambda self: self._strings[self.token.lemma],
             doc="The token lemma.")
 
     pos = property(
-            fget=lambda self: self.token.tag,
+            fget=lambda self: self._strings[self.token.tag],
             doc="Coarse-grained part-of-speech from the Universal POS tag set.")
 
     head = property(
@@ -167,7 +641,7 @@ class Token:
             doc="The syntactic parent, or “governor”, of this token.")
 
     dep = property(
-            fget=lambda self: self.token.dep,
+            fget=lambda self: self._strings[self.token.dep],
             doc="Syntactic dependency relation.")
 
     idx = property(
@@ -175,24 +649,21 @@ class Token:
             doc="Position of this token in its document text.")
 
     features = property(
-            fget=lambda self:  (
-                {} if self.token.features == "_"
-                else dict(x.split("=")
-                          for x in self.token.features.split("|"))),
-            doc="Morphlogical features of this token .")
+            fget=lambda self: self._strings.features(self.token.features),
+            doc="Morphlogical features of this token, as a read-only mapping.")
 
     ent_type = property(
-            fget=lambda self: self.token.neType,
+            fget=lambda self: self._strings[self.token.neType],
             doc="Named entity type.")
 
     ent_iob = property(
-            fget=lambda self: self.token.neIOB,
+            fget=lambda self: self._strings[self.token.neIOB],
             doc=("IOB code of named entity tag. “B” means the token begins an entity, "
                  "“I” means it is inside an entity, “O” means it is outside an entity, "
                  "and \"\" means no entity tag is set."))
 
     t_status = property(
-            fget=lambda self: self.token.tStatus,
+            fget=lambda self: self._strings[self.token.tStatus],
             doc=("The tokenization status of this token. Can also be explored with the "
                  "is_* properties. The possible values are::\n"
                  "\n"
@@ -216,14 +687,14 @@ class Token:
                  ))
 
     is_alpha = property(
-        fget=lambda self: self.token.tStatus in ["t_alphanumeric", "t_capital",
+        fget=lambda self: self.t_status in ["t_alphanumeric", "t_capital",
                                                  "t_capital_1st", "t_capital_small",
                                                  "t_small"],
         doc=("Does the token consist of alphabetic characters? "
              "Equivalent to token.text.isalpha()."))
 
     is_digit = property(
-        fget=lambda self: self.token.tStatus == "t_integer",
+        fget=lambda self: self.t_status == "t_integer",
         doc=("Does the token consist of digits? "
             "Equivalent to token.text.isdigit()."))
 
@@ -236,20 +707,34 @@ class Token:
         doc=("Is the token in lowercase? Equivalent to token.text.isupper()."))
 
     is_punct = property(
-        fget=lambda self: self.token.tStatus in ["t_sentence_brk", "t_word_brk"],
+        fget=lambda self: self.t_status in ["t_sentence_brk", "t_word_brk"],
         doc=("Is the token punctuation?"))
 
+    def _sentence_bounds(self) -> Union[Tuple[int, int], None]:
+        """Return the start and end of the sentence of the token or None"""
+        sentence = self._doc._token_sentences()[self.token.i]
+        return None if sentence < 0 else self._doc._sentence_bounds()[sentence]
+
+    sent = property(
+        fget=lambda self: (
+            None if self._doc._token_sentences()[self.token.i] < 0
+            else self._doc._sentence(self._doc._token_sentences()[self.token.i])),
+        doc=("The sentence span that this token is a part of, or None if the "
+             "document has no sentence boundaries."))
+
     is_sent_start = property(
-        fget=lambda self: self.token.i == 0,
-        # TODO give access to the document to be able to implemnt that:
-        # or self.token.i in [s[0].i for s in self.doc.sents],
-        doc=("Does the token start a sentence? bool or None if unknown. "
-             "Default value = True for the first token in the Doc."
-             "\nTODO: implement for sentences other than the first one."))
+        fget=lambda self: (self.token.i == 0 if self._sentence_bounds() is None
+                           else self._sentence_bounds()[0] == self.token.i),
+        doc=("Does the token start a sentence? "
+             "Default value = True for the first token in the Doc if the document "
+             "has no sentence boundaries."))
 
     is_sent_end = property(
-        fget=lambda self: self.token.tStatus == "t_sentence_brk",
-        doc=("Does the token end a sentence? bool or None if unknown."))
+        fget=lambda self: (self.t_status == "t_sentence_brk"
+                           if self._sentence_bounds() is None
+                           else self._sentence_bounds()[1] == self.token.i + 1),
+        doc=("Does the token end a sentence? If the document has no sentence "
+             "boundaries, True for sentence breaks."))
 
     is_space = property(
         fget=lambda self: self.token.text.isspace(),
@@ -269,6 +754,8 @@ class Token:
 class _SentencesIterator:
     """Doc Sentences Iterator class"""
 
+    __slots__ = ("_doc", "_index")
+
     def __init__(self, doc):
         # Doc object reference
         self._doc = doc
@@ -281,11 +768,8 @@ class _SentencesIterator:
 
     def __next__(self):
         """'Returns the next value from doc object's lists"""
-        if self._index < len(self._doc.limadoc.sentences()):
-            result = Span(self._doc,
-                          self._doc.limadoc.sentences()[self._index].start+(
-                              1 if self._index > 0 else 0),
-                          self._doc.limadoc.sentences()[self._index].end+1)
+        if self._index < len(self._doc._sentence_bounds()):
+            result = self._doc._sentence(self._index)
             self._index += 1
             return result
         # Iteration ends
@@ -295,6 +779,8 @@ class _SentencesIterator:
 class _SpanIterator:
     """Span Iterator class"""
 
+    __slots__ = ("_span", "_index")
+
     def __init__(self, span):
         # Span object reference
         self._span = span
@@ -374,6 +860,8 @@ class Span:
 
 
     """
+    __slots__ = ("_doc", "_start", "_end", "_label")
+
     def __init__(self, doc, start: int, end: int, label: str = ""):
         """
         Constructor of a Span
@@ -471,21 +959,7 @@ class Span:
         The representation of a span is one line for each token represented in the
         CoNLL-U format.
         """
-        if len(self) == 0:
-            return ""
-        first_tid = self[0].i - 1
-        id = 1
-        tokens_repr = [token.__repr__() for token in self]
-        tokens_repr_reindexed = []
-        for token_repr in tokens_repr:
-            cols = token_repr.split("\t")
-            cols[0] = str(id)
-            if cols[6] != "_":
-                cols[6] = str(int(cols[6]) - first_tid)
-            id += 1
-            token_repr = "\t".join(cols)
-            tokens_repr_reindexed.append(token_repr)
-        return "\n".join(tokens_repr_reindexed)
+        return self._doc.limadoc.conllu(self._start, self._end)
 
     text = property(
             fget=lambda self: (self._doc.text[
@@ -521,6 +995,8 @@ class Span:
 class _DocEntitiesIterator:
     """Doc Entities Iterator class"""
 
+    __slots__ = ("_doc", "_index")
+
     def __init__(self, doc):
         # Doc object reference
         self._doc = doc
@@ -533,21 +1009,11 @@ class _DocEntitiesIterator:
 
     def __next__(self) -> Span:
         """'Returns the next Span defining an entity in the document"""
-        while self._index < len(self._doc):
-            # print(f"doc entities loop {self._index}, {len(self._doc)}", file=sys.stderr)
-            if self._doc[self._index].ent_iob == "B":
-                start = self._doc[self._index].i
-                end = start
-                label = self._doc[self._index].ent_type
-                while self._index < len(self._doc):
-                    # print(f"doc entities inner loop {self._index}, {len(self._doc)}", file=sys.stderr)
-                    self._index += 1
-                    if self._index < len(self._doc):
-                        if self._doc[self._index].ent_iob == "I":
-                            end = self._index
-                        else:
-                            return Span(self._doc, start, end, label=label)
+        entities = self._doc._entities()
+        if self._index < len(entities):
+            start, end, label = entities[self._index]
             self._index += 1
+            return Span(self._doc, start, end, label=self._doc._strings[label])
         # Iteration ends
         raise StopIteration
 
@@ -555,6 +1021,8 @@ class _DocEntitiesIterator:
 class _DocIterator:
     """Doc Iterator class"""
 
+    __slots__ = ("_doc", "_index")
+
     def __init__(self, doc):
         # Doc object reference
         self._doc = doc
@@ -591,8 +1059,46 @@ class Doc:
 
 
     """
+    __slots__ = ("limadoc", "_strings", "_tokens", "_sents", "_token_sents", "_ents",
+                 "__weakref__")
+
     def __init__(self, doc: aymaralima.cpplima.Doc):
         self.limadoc = doc
+        self._strings = _string_store(doc.strings())
+        # The Token wrappers already built, by index, created on first access
+        self._tokens = None
+        # The (start, end) of the sentences, the sentence of each token and the
+        # (start, end, label) of the entities, read once from the C++ document on
+        # first access
+        self._sents = None
+        self._token_sents = None
+        self._ents = None
+
+    def _sentence_bounds(self) -> List[Tuple[int, int]]:
+        """Return the start and end of each sentence"""
+        if self._sents is None:
+            # The start of sentences other than the first one is the last token of
+            # the previous sentence
+            self._sents = [(s.start + (1 if i > 0 else 0), s.end + 1)
+                           for i, s in enumerate(self.limadoc.sentences())]
+        return self._sents
+
+    def _token_sentences(self) -> List[int]:
+        """Return the index of the sentence of each token or -1"""
+        if self._token_sents is None:
+            self._token_sents = list(self.limadoc.tokenSentences())
+        return self._token_sents
+
+    def _entities(self) -> List[Tuple[int, int, int]]:
+        """Return the (start, end exclusive, label id) of the entities, read once"""
+        if self._ents is None:
+            self._ents = [(e.start, e.end, e.label) for e in self.limadoc.entities()]
+        return self._ents
+
+    def _sentence(self, i: int) -> Span:
+        """Return the sentence i"""
+        start, end = self._sentence_bounds()[i]
+        return Span(self, start, end)
 
     def __iter__(self) -> _DocIterator:
         """Returns Iterator object"""
@@ -607,7 +1113,8 @@ class Doc:
         return self.limadoc.len()
 
     def __getitem__(self, i: Union[int, slice]) -> Union[Token, Span]:
-        """Returns the token at position i or a contiguous slice of tokens.
+        """Returns the token at position i or a contiguous slice of tokens. Tokens are
+        built on first access and the same Token is returned by later accesses.
 
         Example::
 
@@ -624,17 +1131,24 @@ class Doc:
         """
         if isinstance(i, slice):
             return Span(self, i.start, i.stop)
+        tokens = self._tokens
+        if tokens is None:
+            tokens = self._tokens = [None] * len(self)
         if i < 0:
-            i = len(self) + i
-        return Token(self.limadoc.at(i))
+            i = len(tokens) + i
+            if i < 0:
+                raise IndexError("Doc index out of range")
+        token = tokens[i]
+        if token is None:
+            token = tokens[i] = Token(self.limadoc.at(i), self)
+        return token
 
     def __repr__(self) -> str:
         """
         The representation of a document is one line for each token represented in the
         CoNLL-U format.
         """
-        return "\n\n".join([repr(sent) for sent in self.sents])
-        # return "\n".join([token.__repr__() for token in self])
+        return self.limadoc.sentencesConllu(0, len(self._sentence_bounds()))
 
     def __str__(self) -> str:
         """
@@ -642,11 +1156,163 @@ class Doc:
         """
         return self.text
 
+    def to_conllu(self, file=None) -> Union[str, None]:
+        """
+        Export the document in the CoNLL-U format, one sentence after the other. The
+        lines are formatted in one pass by the C++ document, with token ids and
+        heads numbered from 1 in each sentence.
+
+        Without file, return the same text as repr(doc). Otherwise, write it to
+        file, a text file or a binary file (encoded in UTF-8), followed by the empty
+        line that ends the last sentence, such that several documents can be
+        written to the same file. Sentences are converted and written by groups,
+        without building the whole text.
+
+        Example::
+
+            import aymara.lima
+            nlp = aymara.lima.Lima()
+            with open("corpus.conllu", "w", encoding="utf-8") as f:
+                for doc in nlp.pipe(texts):
+                    doc.to_conllu(f)
+
+        :param file: the file object to write to.
+        :type file: Union[typing.TextIO, typing.BinaryIO, None]
+        :return: the CoNLL-U text if file is None, None otherwise.
+        :rtype: Union[str, None]
+        """
+        sentences = len(self._sentence_bounds())
+        if file is None:
+            return self.limadoc.sentencesConllu(0, sentences)
+        if isinstance(file, io.TextIOBase):
+            binary = False
+        elif isinstance(file, (io.RawIOBase, io.BufferedIOBase)):
+            binary = True
+        else:
+            # Other file-like objects, e.g. codecs writers, text spooled files or
+            # wrappers, are told apart by their first write
+            binary = None
+        for first in range(0, sentences, _CONLLU_SENTENCES):
+            text = self.limadoc.sentencesConllu(first, first + _CONLLU_SENTENCES)
+            text += "\n\n"
+            if binary is None:
+                try:
+                    file.write(text)
+                    binary = False
+                    continue
+                except TypeError:
+                    binary = True
+            file.write(text.encode("utf-8") if binary else text)
+        return None
+
+    def __reduce__(self):
+        """
+        Support for pickling. The document is reduced to its text, language, tokens
+        and sentences. This allows to transfer documents between processes. Tokens
+        strings are pickled instead of their ids, which are only valid in this
+        process.
+        """
+        return (_doc_from_state, self._state())
+
+    def _state(self) -> Tuple[str, str, List[Tuple], List[Tuple[int, int]]]:
+        """Return the text, language, tokens and sentences rebuilt by
+        _doc_from_state, made of plain strings and ints only"""
+        strings = self._strings
+        tokens = [(t.len, t.text, strings[t.lemma], t.i, t.pos, strings[t.tag], t.head,
+                   strings[t.dep], strings[t.features], strings[t.neIOB],
+                   strings[t.neType],
+                   strings[t.tStatus])
+                  for t in (self.limadoc.at(i) for i in range(len(self)))]
+        sentences = [(s.start, s.end) for s in self.limadoc.sentences()]
+        return (self.text, self.lang, tokens, sentences)
+
+    def _check_attributes(self, attrs: List[str]) -> List[str]:
+        """Return the upper case names of attrs, checking that they can be exported"""
+        names = [attr.upper() for attr in attrs]
+        known = aymaralima.cpplima.Doc.attributeNames()
+        unknown = [name for name in names if name not in known]
+        if unknown:
+            raise ValueError(f"Unknown token attributes {unknown}. Known attributes "
+                             f"are {known}")
+        return names
+
+    def to_array(self, attrs: Union[str, List[str]]):
+        """
+        Export the given token attributes to a numpy array, filled in one pass over
+        the tokens. The available attributes are I (the token index), IDX (its
+        character offset), LEN, LEMMA, POS, HEAD (the index of the governor), DEP,
+        FEATS (the features string), ENT_IOB, ENT_TYPE and T_STATUS. String
+        attributes are exported as their ids in Doc.strings.
+
+        Example::
+
+            import aymara.lima
+            nlp = aymara.lima.Lima()
+            doc = nlp("Give it back! He pleaded.")
+            array = doc.to_array(["LEMMA", "HEAD", "DEP"])
+            assert array.shape == (len(doc), 3)
+            assert doc.strings[array[0, 0]] == doc[0].lemma
+
+        :param attrs: an attribute or a list of attributes to export.
+        :type attrs: Union[str, List[str]]
+        :return: a 2D int32 array with one row per token and one column per
+            attribute, or a 1D array if attrs is a single attribute.
+        :rtype: numpy.ndarray
+        """
+        single = isinstance(attrs, str)
+        names = self._check_attributes([attrs] if single else attrs)
+        shape = (len(self),) if single else (len(self), len(names))
+        address = self.limadoc.toArray(names)
+        return _int32_array(self.limadoc, address, shape).copy()
+
+    def to_arrow(self):
+        """
+        Export the tokens of the document to an Arrow table with one row per token.
+        The idx, len and head columns are int32 arrays viewing the document data
+        without copying it. The lemma, pos, dep, features, ent_iob, ent_type and
+        t_status columns are dictionary-encoded arrays whose indices view the
+        document data and whose dictionary is shared by all the documents of the
+        language. See docs_to_arrow to export several documents at once.
+
+        Example::
+
+            import aymara.lima
+            nlp = aymara.lima.Lima()
+            doc = nlp("Give it back! He pleaded.")
+            table = doc.to_arrow()
+            assert table.column("lemma")[0].as_py() == doc[0].lemma
+
+        :return: the table of the tokens of the document.
+        :rtype: pyarrow.Table
+        """
+        return _pyarrow().table(_arrow_arrays(self),
+                                names=[name for name, _, _ in _ARROW_COLUMNS])
+
+    def _column(self, attr: str):
+        """Return a read-only numpy view of the values of attr for each token"""
+        name = self._check_attributes([attr])[0]
+        return _int32_array(self.limadoc, self.limadoc.column(name), (len(self),))
+
     text = property(
             fget=lambda self: self.limadoc.text(),
             doc=("The original text.\n"
                  ":type: str\n"))
 
+    heads = property(
+            fget=lambda self: self._column("HEAD"),
+            doc=("The index of the governor of each token, as a read-only numpy "
+                 "array viewing the document data."))
+
+    offsets = property(
+            fget=lambda self: self._column("IDX"),
+            doc=("The character offset of each token, as a read-only numpy array "
+                 "viewing the document data."))
+
+    lengths = property(
+            fget=lambda self: self._column("LEN"),
+            doc=("The length of each token, as a read-only numpy array viewing the "
+                 "document data."))
+
     sents = property(
             fget=lambda self: _SentencesIterator(self),
             doc=("    Iterate over the sentences in the document.\n"
@@ -669,6 +1335,19 @@ class Doc:
             fget=lambda self: self.limadoc.language(),
             doc="Language of the document.")
 
+    strings = property(
+            fget=lambda self: self._strings,
+            doc="The store of the strings of the tokens of the document.")
+
+    retains_analysis = property(
+            fget=lambda self: self.limadoc.retainsAnalysis(),
+            doc="True if the document retains the LIMA analysis data.")
+
+    retained_bytes = property(
+            fget=lambda self: self.limadoc.retainedBytes(),
+            doc=("An estimate of the memory retained by the document, in bytes, "
+                 "including the LIMA analysis data if it is retained."))
+
     ents = property(
             fget=lambda self: _DocEntitiesIterator(self),
             doc=("Iterate over the entites in the document. Returns an iterator yielding"
@@ -686,8 +1365,269 @@ class Doc:
                  "        :type: Span\n"))
 
 
+def _doc_from_state(text: str,
+                    lang: str,
+                    tokens: List[Tuple],
+                    sentences: List[Tuple[int, int]]) -> Doc:
+    """
+    This private function rebuilds a Doc from the state produced by Doc.__reduce__.
+
+    :param text: the original text of the document.
+    :type text: str
+    :param lang: the language of the document.
+    :type lang: str
+    :param tokens: the tokens fields in the order of the C++ Token constructor, with
+        strings instead of strings ids.
+    :type tokens: List[Tuple]
+    :param sentences: the (start, end) pairs of the sentences.
+    :type sentences: List[Tuple[int, int]]
+    :return: the rebuilt document.
+    :rtype: Doc
+    """
+    lima_doc = aymaralima.cpplima.Doc()
+    lima_doc.setText(text)
+    lima_doc.setLanguage(lang)
+    store = lima_doc.strings()
+    for (length, token_text, lemma, i, pos, tag, head, dep, features, ne_iob, ne_type,
+         t_status) in tokens:
+        lima_doc.addToken(aymaralima.cpplima.Token(
+            length, token_text, store.add(lemma), i, pos, store.add(tag), head,
+            store.add(dep), store.add(features), store.add(ne_iob), store.add(ne_type),
+            store.add(t_status)))
+    for start, end in sentences:
+        lima_doc.addSentence(aymaralima.cpplima.Span(start, end))
+    return Doc(lima_doc)
+
+
 class LimaInternalError(Exception):
-    pass
+    """An error of Lima during an analysis or while building an analyzer.
+
+    Its analyzer_invalid attribute is True if the analyzer itself is unusable, e.g.
+    because of a broken configuration, and False if only the analysis of a document
+    failed, e.g. because of an unknown pipeline or language.
+    """
+    def __init__(self, message: str = "", analyzer_invalid: bool = False):
+        super().__init__(message)
+        self.analyzer_invalid = analyzer_invalid
+
+    def __reduce__(self):
+        """Support for pickling, e.g. from Lima.pipe worker processes"""
+        return (LimaInternalError, (str(self), self.analyzer_invalid))
+
+
+# The analyzer of a Lima.pipe worker process, built once by _pipe_worker_init
+_worker_lima = None
+
+
+def _pipe_worker_init(args: Tuple, options: Dict[str, Any]):
+    """
+    This private function builds the analyzer of a Lima.pipe worker process.
+
+    :param args: the positional parameters of the Lima constructor of the parent
+        process.
+    :type args: Tuple
+    :param options: the lazy_tokens and keep_analysis parameters of the Lima
+        constructor of the parent process.
+    :type options: Dict[str, Any]
+    """
+    global _worker_lima
+    _worker_lima = Lima(*args, **options)
+
+
+def _pipe_worker_analyze(texts: List[str],
+                         params: List[Tuple[str, str]],
+                         meta: Dict[str, str]) -> Tuple[List[Doc],
+                                                        Dict[str, List[float]]]:
+    """
+    This private function analyzes a chunk of texts in a Lima.pipe worker process.
+
+    :return: the analyzed documents, in the order of texts, and the analysis
+        statistics of each language (see Lima._analyze_grouped).
+    :rtype: Tuple[List[Doc], Dict[str, List[float]]]
+    """
+    return _worker_lima._analyze_grouped(texts, params, meta)
+
+
+def _digest(parts: Iterable[str], meta: Dict[str, str]) -> str:
+    """
+    This private function computes the SHA-256 digest of strings and metadata.
+
+    :return: the hexadecimal digest.
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    for part in itertools.chain(parts, itertools.chain.from_iterable(
+            sorted(meta.items()))):
+        data = part.encode("utf-8")
+        # Length prefixes make the digest unambiguous whatever the parts contain
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class _DocCache:
+    """A cache of analysis results
+
+    Documents are stored serialized, in an in-memory LRU tier bounded by a number of
+    entries and/or a number of bytes and, optionally, in a directory which survives
+    restarts and is not bounded. A document found on disk only is promoted to the
+    memory tier. The cache can be shared between threads.
+
+    Documents are serialized as JSON of the state rebuilt by _doc_from_state, so
+    that reading a cache directory never runs code. Keys include the parameters of
+    the analyzer, so that analyzers with different languages, pipelines,
+    configurations or metadata can share a directory. They also include the aymara
+    version and the installed LIMA resources (see _resources_id), so that the
+    analyses of an upgraded installation are not served from an older cache.
+
+    Documents with lazy tokens are not stored: serializing them would compute all
+    their tokens and cancel the benefit of laziness. They can still be read from a
+    directory filled by an analyzer without lazy tokens.
+    """
+    def __init__(self,
+                 max_entries: int = 0,
+                 max_bytes: int = None,
+                 directory: str = None,
+                 analyzer_args: Tuple = ()):
+        """
+        Initialize the cache
+
+        :param max_entries: the maximum number of documents in memory. 0 means no
+            limit if max_bytes is set and no memory tier otherwise.
+        :type max_entries: int
+        :param max_bytes: the maximum size in bytes of the serialized documents in
+            memory (Default value = no limit).
+        :type max_bytes: int
+        :param directory: the directory of the on-disk tier (Default value = no disk
+            tier).
+        :type directory: str
+        :param analyzer_args: the parameters of the Lima constructor of the analyzer
+            of the cached documents: langs, pipes, user_config_path,
+            user_resources_path and meta (Default value = no parameters).
+        :type analyzer_args: Tuple
+        """
+        langs, pipes, user_config_path, user_resources_path, meta = (
+            analyzer_args or ("", "", "", "", {}))
+        resources = json.dumps(_resources_id(user_resources_path))
+        self._namespace = _digest((__version__, resources, langs, pipes,
+                                   user_config_path, user_resources_path),
+                                  meta)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._directory = pathlib.Path(directory) if directory else None
+        if self._directory is not None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def key(self, text: str, lang: str, pipeline: str, meta: Dict[str, str]) -> str:
+        """
+        Compute the cache key of an analysis.
+
+        :return: the hexadecimal SHA-256 digest of the analysis parameters and of the
+            analyzer parameters.
+        :rtype: str
+        """
+        return _digest((self._namespace, text, lang, pipeline), meta)
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self._directory / key[:2] / f"{key}.json"
+
+    def _store(self, key: str, data: bytes):
+        """
+        Store data in the memory tier and evict the least recently used entries
+        beyond the limits. Must be called with the lock held.
+        """
+        if not self._max_entries and self._max_bytes is None:
+            return
+        if self._max_bytes is not None and len(data) > self._max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = data
+        self._bytes += len(data)
+        while ((self._max_entries and len(self._entries) > self._max_entries)
+               or (self._max_bytes is not None and self._bytes > self._max_bytes)):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._evictions += 1
+
+    def get(self, key: str) -> Union[Doc, None]:
+        """
+        Return the cached document of key.
+
+        :return: the document or None if key is not in the cache.
+        :rtype: Union[Doc, None]
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+        if data is None and self._directory is not None:
+            try:
+                data = self._path(key).read_bytes()
+            except OSError:
+                data = None
+            if data is not None:
+                with self._lock:
+                    self._disk_hits += 1
+                    self._store(key, data)
+        if data is None:
+            with self._lock:
+                self._misses += 1
+            return None
+        return _doc_from_state(*json.loads(data))
+
+    def put(self, key: str, doc: Doc):
+        """
+        Add doc to the cache, unless its tokens are lazy.
+        """
+        if doc.limadoc.lazyTokens():
+            return
+        data = json.dumps(doc._state(), ensure_ascii=False,
+                          separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            self._store(key, data)
+        if self._directory is not None:
+            path = self._path(key)
+            path.parent.mkdir(exist_ok=True)
+            # Write then rename so that readers never see a partial file
+            tmp_path = path.with_name(
+                f"{path.name}.{os.getpid()}.{threading.get_ident()}")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+    def clear(self):
+        """
+        Remove all the documents of the memory tier. The disk tier is kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Usage statistics of the cache.
+
+        :type: Dict[str, int]
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
 
 
 class Lima:
@@ -697,6 +1637,9 @@ class Lima:
     application. The Lima class is a wrapper around the LimaAnalyzer class which is
     itself a binding around the C++ classes necessary to analyze text.
 
+    A Lima instance can be shared between threads: the Python global interpreter lock
+    is released during analyses, which thus run in parallel.
+
     Example::
 
                 import aymara.lima
@@ -710,7 +1653,13 @@ class Lima:
                  pipes: str = "main,deepud",
                  user_config_path: str = "",
                  user_resources_path: str = "",
-                 meta: Dict[str, str] = {}):
+                 meta: Dict[str, str] = {},
+                 async_workers: int = None,
+                 cache_size: int = 0,
+                 cache_bytes: int = None,
+                 cache_dir: str = None,
+                 lazy_tokens: bool = False,
+                 keep_analysis: bool = True):
         """
         Initialize the Lima analyzer
 
@@ -732,6 +1681,34 @@ class Lima:
             analysis.They can be completed or overriden at analysis time (Default value = an
             empty dictionary)
         :type meta:  Dict[str, str]
+        :param async_workers: the maximum number of concurrent analyses run by the
+            asynchronous methods acall and apipe (Default value = the number of CPUs)
+        :type async_workers: int
+        :param cache_size: the maximum number of analysis results kept in memory and
+            returned again when the same text is analyzed with the same parameters. 0
+            means no limit if cache_bytes is set and no in-memory cache otherwise
+            (Default value = 0).
+        :type cache_size: int
+        :param cache_bytes: the maximum size in bytes of the serialized analysis
+            results kept in memory (Default value = no limit).
+        :type cache_bytes: int
+        :param cache_dir: a directory where analysis results are also stored. It is
+            not bounded and survives restarts. Results are keyed by the parameters
+            of this constructor, the aymara version and the installed LIMA resources
+            too, so that different analyzers can share it and upgrades do not reuse
+            older results (Default value = no disk cache).
+        :type cache_dir: str
+        :param lazy_tokens: if True, the attributes of the tokens of the analyzed
+            documents are computed only when each token is first accessed. This is
+            faster when only some tokens are read or when only their number is used,
+            but documents then retain the LIMA analysis data. Such documents are not
+            added to the cache, which is then only read (Default value = False).
+        :type lazy_tokens: bool
+        :param keep_analysis: if False, the documents returned by single analyses
+            release the LIMA analysis data as soon as they are built and only keep
+            their tokens and text. Documents built by pipe never retain it, unless
+            they have lazy tokens (Default value = True).
+        :type keep_analysis: bool
         """
         # print(f"Lima __init__: calling LimaAnalyzer constructor {langs}, {pipes}",
         #       file=sys.stderr)
@@ -745,15 +1722,267 @@ class Lima:
             )
         if self.analyzer.error():
             raise LimaInternalError(self.analyzer.errorMessage())
+        self.analyzer.setLazyTokens(lazy_tokens)
+        self.analyzer.setKeepAnalysis(keep_analysis)
 
         self.langs = langs.split(",")
         self.pipes = pipes.split(",")
+        # Kept to build identical analyzers in Lima.pipe worker processes
+        self._init_args = (langs, pipes, user_config_path, user_resources_path,
+                           dict(meta))
+        self._worker_options = {"lazy_tokens": lazy_tokens,
+                                "keep_analysis": keep_analysis}
+        # The executor of asynchronous analyses, built on first use
+        self._async_workers = async_workers or os.cpu_count() or 1
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # Per language statistics of Lima.pipe: [texts, characters, seconds]
+        self._pipe_stats = {}
+        self._pipe_stats_lock = threading.Lock()
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise ValueError(f"Lima cache_size parameter must be a positive int, "
+                             f"not {cache_size}")
+        if cache_bytes is not None and (not isinstance(cache_bytes, int)
+                                        or cache_bytes < 1):
+            raise ValueError(f"Lima cache_bytes parameter must be a positive int, "
+                             f"not {cache_bytes}")
+        self._cache = (_DocCache(cache_size, cache_bytes, cache_dir,
+                                 self._init_args)
+                       if cache_size or cache_bytes is not None or cache_dir
+                       else None)
+
+    def _check_args(self,
+                    lang: str = None,
+                    pipeline: str = None,
+                    meta: Dict[str, str] = {}) -> Tuple[str, str, Dict[str, str]]:
+        """
+        Validate and normalize the analysis parameters shared by all analysis methods.
+
+        :param lang: the language of the text (see `__call__`).
+        :type lang: str
+        :param pipeline: the Lima pipeline to use for analysis (see `__call__`).
+        :type pipeline: str
+        :param meta: a dict of named metadata values.
+        :type meta: Dict[str, str]
+        :return: the normalized language, the pipeline and the validated metadata.
+        :rtype: Tuple[str, str, Dict[str, str]]
+        """
+        if lang is None:
+            lang = self.langs[0] if self.langs else "eng"
+        if not isinstance(lang, str):
+            raise TypeError(f"Lima.analyzeText lang parameter must be str, "
+                            f"not {type(lang)}")
+        if (lang not in ["eng", "fre", "por"] and not lang.startswith("ud-")
+                and lang != "ud"):
+            lang = "ud-" + lang
+        if pipeline is None:
+            if self.pipes:
+                pipeline = self.pipes[0]
+            elif lang.startswith("ud-"):
+                pipeline = "deepud"
+            else:
+                pipeline = "main"
+        if not isinstance(pipeline, str):
+            raise TypeError(f"Lima.analyzeText pipeline parameter must be str, "
+                            f"not {type(pipeline)}")
+        # Fast path: pydantic is only needed to coerce or reject unusual values
+        if not (type(meta) is dict
+                and all(type(k) is str and type(v) is str for k, v in meta.items())):
+            try:
+                meta = parse_obj_as(Dict[str, str], meta)
+            except ValidationError as e:
+                raise TypeError(f"Lima.analyzeText meta parameter must be "
+                                f"Dict[str, str], not {type(meta)}")
+        return lang, pipeline, meta
+
+    def profile(self,
+                lang: str = None,
+                pipeline: str = None,
+                meta: Dict[str, str] = {}) -> "CallProfile":
+        """
+        Resolve and validate the analysis parameters once and return a reusable
+        handle analyzing texts with them. This avoids checking the parameters again
+        on each call, which matters when analyzing many short texts.
+
+        Example::
+
+                    import aymara.lima
+                    nlp = aymara.lima.Lima()
+                    eng = nlp.profile(lang="eng", pipeline="main")
+                    docs = [eng(text) for text in ["Give it back!", "He pleaded."]]
+
+        :param lang: the language of the texts (see `__call__`).
+        :type lang: str
+        :param pipeline: the Lima pipeline to use for analysis (see `__call__`).
+        :type pipeline: str
+        :param meta: a dict of named metadata values (Default value = an empty
+            dictionary).
+        :type meta: Dict[str, str]
+
+        :return: the call profile.
+        :rtype: CallProfile
+        """
+        lang, pipeline, meta = self._check_args(lang, pipeline, meta)
+        return CallProfile(self, lang, pipeline, meta)
+
+    def _analyze(self,
+                 text: str,
+                 lang: str,
+                 pipeline: str,
+                 meta: Dict[str, str]) -> Doc:
+        """
+        Analyze text with already checked and normalized parameters.
+
+        :return: a Doc object representing the result of the analysis.
+        :rtype: Doc
+        """
+        if self._cache is not None:
+            key = self._cache.key(text, lang, pipeline, meta)
+            doc = self._cache.get(key)
+            if doc is not None:
+                return doc
+        lima_doc = self.analyzer(text, lang=lang, pipeline=pipeline, meta=meta)
+        # The error state of the analyzer is shared by all the threads using it:
+        # only the error of this document concerns this analysis
+        if lima_doc.error():
+            raise LimaInternalError(lima_doc.errorMessage(),
+                                    analyzer_invalid=self.analyzer.error())
+        doc = Doc(lima_doc)
+        if self._cache is not None:
+            self._cache.put(key, doc)
+        return doc
+
+    def _analyze_batch(self,
+                       texts: List[str],
+                       lang: str,
+                       pipeline: str,
+                       meta: Dict[str, str]) -> List[Doc]:
+        """
+        Analyze texts in a single call to the C++ analyzer with already checked and
+        normalized parameters.
+
+        :return: the Doc objects representing the results of the analyses, in the
+            order of texts. The analysis errors of single texts are returned in place
+            of their Doc instead of being raised.
+        :rtype: List[Union[Doc, LimaInternalError]]
+        """
+        docs = [None] * len(texts)
+        if self._cache is not None:
+            keys = [self._cache.key(text, lang, pipeline, meta) for text in texts]
+            docs = [self._cache.get(key) for key in keys]
+        missing = [i for i, doc in enumerate(docs) if doc is None]
+        if missing:
+            lima_docs = self.analyzer.analyzeBatch([texts[i] for i in missing],
+                                                   lang=lang, pipeline=pipeline,
+                                                   meta=meta)
+            for i, lima_doc in zip(missing, lima_docs):
+                if lima_doc.error():
+                    docs[i] = LimaInternalError(lima_doc.errorMessage(),
+                                                analyzer_invalid=self.analyzer.error())
+                    continue
+                docs[i] = Doc(lima_doc)
+                if self._cache is not None:
+                    self._cache.put(keys[i], docs[i])
+        return docs
+
+    def _analyze_grouped(self,
+                         texts: List[str],
+                         params: List[Tuple[str, str]],
+                         meta: Dict[str, str]) -> Tuple[List[Doc],
+                                                        Dict[str, List[float]]]:
+        """
+        Analyze texts whose (lang, pipeline) parameters can differ. Texts sharing
+        the same parameters are analyzed together in a single call to the C++
+        analyzer, so that it does not switch between language resources.
+
+        :param texts: the texts to analyze.
+        :type texts: List[str]
+        :param params: the normalized (lang, pipeline) pair of each text.
+        :type params: List[Tuple[str, str]]
+        :param meta: the validated metadata.
+        :type meta: Dict[str, str]
+        :return: the Doc objects or the analysis errors (see _analyze_batch), in the
+            order of texts, and for each language, the number of texts, of
+            characters and the analysis time in seconds.
+        :rtype: Tuple[List[Union[Doc, LimaInternalError]], Dict[str, List[float]]]
+        """
+        groups = collections.defaultdict(list)
+        for i, key in enumerate(params):
+            groups[key].append(i)
+        docs = [None] * len(texts)
+        stats = {}
+        for (lang, pipeline), indices in groups.items():
+            group_texts = [texts[i] for i in indices]
+            start = time.perf_counter()
+            group_docs = self._analyze_batch(group_texts, lang, pipeline, meta)
+            elapsed = time.perf_counter() - start
+            for i, doc in zip(indices, group_docs):
+                docs[i] = doc
+            lang_stats = stats.setdefault(lang, [0, 0, 0.0])
+            lang_stats[0] += len(group_texts)
+            lang_stats[1] += sum(len(text) for text in group_texts)
+            lang_stats[2] += elapsed
+        return docs, stats
+
+    def _add_pipe_stats(self, stats: Dict[str, List[float]]):
+        """
+        Add the statistics returned by _analyze_grouped to pipe_stats.
+        """
+        with self._pipe_stats_lock:
+            for lang, (texts, chars, seconds) in stats.items():
+                lang_stats = self._pipe_stats.setdefault(lang, [0, 0, 0.0])
+                lang_stats[0] += texts
+                lang_stats[1] += chars
+                lang_stats[2] += seconds
+
+    @property
+    def pipe_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Throughput of Lima.pipe for each language since this instance was built: the
+        number of texts and characters analyzed, the analysis time in seconds and the
+        resulting texts and characters per second. With several processes, the times
+        of all the workers are added.
+
+        :type: Dict[str, Dict[str, float]]
+        """
+        with self._pipe_stats_lock:
+            return {
+                lang: {
+                    "texts": texts,
+                    "chars": chars,
+                    "seconds": seconds,
+                    "texts_per_second": texts / seconds if seconds else 0.0,
+                    "chars_per_second": chars / seconds if seconds else 0.0,
+                }
+                for lang, (texts, chars, seconds) in self._pipe_stats.items()
+            }
+
+    def _analyze_chunked(self,
+                         text: str,
+                         lang: str,
+                         pipeline: str,
+                         meta: Dict[str, str],
+                         chunk_size: int) -> Doc:
+        """
+        Analyze text chunk by chunk with already checked and normalized parameters
+        and stitch the results into a single document. Only one chunk is analyzed at
+        a time, so the memory used by the analysis does not depend on the text size.
+
+        :return: a Doc object representing the result of the analysis.
+        :rtype: Doc
+        """
+        lima_doc = aymaralima.cpplima.Doc()
+        lima_doc.setText(text)
+        for offset, chunk in _split_chunks(text, chunk_size):
+            lima_doc.append(self._analyze(chunk, lang, pipeline, meta).limadoc, offset)
+        return Doc(lima_doc)
 
     def __call__(self,
                  text: str,
                  lang: str = None,
                  pipeline: str = None,
-                 meta: Dict[str, str] = {}) -> Doc:
+                 meta: Dict[str, str] = {},
+                 chunk_size: int = None) -> Doc:
         """
         Just 'call' your Lima instance to analyze the given text in the given language.
         The lang language must have been initialized when instantiating this object.
@@ -780,43 +2009,369 @@ class Lima:
         :type pipeline: str
         :param meta: a dict of named metadata values (Default value = an empty dictionary).
         :type meta: Dict[str, str]
+        :param chunk_size: if set, texts longer than chunk_size characters are split
+            at paragraph breaks into chunks of at most chunk_size characters which are
+            analyzed one after the other. This bounds the memory used to analyze very
+            large texts. A part of the text without paragraph break over chunk_size
+            characters is split at a word boundary, which can change the analysis of
+            the sentence it splits (Default value = `None`).
+        :type chunk_size: int
 
         :return: a Doc object representing the result of the analysis.
         :rtype: Doc
         """
-        if lang is None:
-            lang = self.langs[0] if self.langs else "eng"
-        if not isinstance(lang, str):
-            raise TypeError(f"Lima.analyzeText lang parameter must be str, "
-                            f"not {type(lang)}")
-        if (lang not in ["eng", "fre", "por"] and not lang.startswith("ud-")
-                and lang != "ud"):
-            lang = "ud-" + lang
-        if pipeline is None:
-            if self.pipes:
-                pipeline = self.pipes[0]
-            elif lang.startswith("ud-"):
-                pipeline = "deepud"
-            else:
-                pipeline = "main"
-        if not isinstance(pipeline, str):
-            raise TypeError(f"Lima.analyzeText pipeline parameter must be str, "
-                            f"not {type(pipeline)}")
+        lang, pipeline, meta = self._check_args(lang, pipeline, meta)
         if not isinstance(text, str):
             raise TypeError(f"Lima.analyzeText text parameter must be str, "
                             f"not {type(text)}")
+        if chunk_size is not None:
+            if not isinstance(chunk_size, int) or chunk_size < 1:
+                raise ValueError(f"Lima chunk_size parameter must be a positive int, "
+                                 f"not {chunk_size}")
+            if len(text) > chunk_size:
+                return self._analyze_chunked(text, lang, pipeline, meta, chunk_size)
+        return self._analyze(text, lang, pipeline, meta)
+
+    def pipe(self,
+             texts: Iterable[Union[str, Tuple[str, Any]]],
+             lang: str = None,
+             pipeline: str = None,
+             meta: Dict[str, str] = {},
+             batch_size: int = 64,
+             as_tuples: bool = False,
+             n_process: int = 1,
+             with_lang: bool = False,
+             errors: str = "raise") -> Iterator[Union[Doc, Tuple[Doc, Any]]]:
+        """
+        Process texts as a stream, and yield Doc objects in order. The lang,
+        pipeline and meta parameters are checked only once for the whole stream and
+        texts are consumed by batches of batch_size elements.
+
+        With with_lang, each text comes with its own language. Inside a batch, texts
+        of the same language are analyzed together, and the documents are yielded in
+        the order of texts. The throughput of each language is available in
+        pipe_stats.
+
+        Example::
+
+                    import aymara.lima
+                    nlp = aymara.lima.Lima()
+                    texts = ["Give it back! He pleaded.", "This is a text."]
+                    for doc in nlp.pipe(texts):
+                        print(doc)
+                    records = [("Give it back!", 1), ("This is a text.", 2)]
+                    for doc, record_id in nlp.pipe(records, as_tuples=True):
+                        print(record_id, doc)
+                    mixed = [("Give it back!", "eng"), ("Rends-le !", "fre")]
+                    for doc in nlp.pipe(mixed, with_lang=True):
+                        print(doc.lang, doc)
+
+        :param texts: the texts to analyze, or (text, context) tuples if as_tuples is
+            True. If with_lang is True, each text is a (text, lang) tuple.
+        :type texts: Iterable[Union[str, Tuple[str, Any]]]
+        :param lang: the language of the texts (see `__call__`). With with_lang, the
+            language of the texts whose language is None.
+        :type lang: str
+        :param pipeline: the Lima pipeline to use for analysis (see `__call__`).
+        :type pipeline: str
+        :param meta: a dict of named metadata values (Default value = an empty
+            dictionary).
+        :type meta: Dict[str, str]
+        :param batch_size: the number of texts to buffer and to analyze in a single
+            call to the C++ analyzer. With several processes, it is also the number of
+            texts sent at once to a worker (Default value = 64).
+        :type batch_size: int
+        :param as_tuples: if True, texts are (text, context) tuples and (doc, context)
+            tuples are yielded (Default value = False).
+        :type as_tuples: bool
+        :param n_process: the number of worker processes to use. Each worker builds its
+            own analyzer with the parameters of this one, including lazy_tokens and
+            keep_analysis. The documents are sent back as their tokens, so they are
+            never lazy and never retain the LIMA analysis in this process. -1 means
+            one worker per CPU and 1 means analyzing in the current process (Default
+            value = 1).
+        :type n_process: int
+        :param with_lang: if True, texts are (text, lang) tuples, (text, lang) and
+            context tuples if as_tuples is True (Default value = False).
+        :type with_lang: bool
+        :param errors: what to do when the analysis of a text fails. "raise" raises a
+            LimaInternalError giving the index of the text in the stream and its
+            context, after the documents preceding it have been yielded. "skip"
+            yields nothing for this text and goes on with the next ones: use
+            as_tuples to know which texts were analyzed (Default value = "raise").
+        :type errors: str
+
+        :return: the Doc objects, or (Doc, context) tuples if as_tuples is True, in
+            the order of texts.
+        :rtype: Iterator[Union[Doc, Tuple[Doc, Any]]]
+        """
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError(f"Lima.pipe batch_size parameter must be a positive "
+                             f"int, not {batch_size}")
+        if not isinstance(n_process, int) or n_process == 0 or n_process < -1:
+            raise ValueError(f"Lima.pipe n_process parameter must be a positive "
+                             f"int or -1, not {n_process}")
+        if errors not in ("raise", "skip"):
+            raise ValueError(f"Lima.pipe errors parameter must be \"raise\" or "
+                             f"\"skip\", not {errors!r}")
+        if n_process == -1:
+            n_process = os.cpu_count() or 1
+        default_lang, default_pipeline, meta = self._check_args(lang, pipeline, meta)
+        # The normalized (lang, pipeline) of each language found in texts
+        resolved = {None: (default_lang, default_pipeline)}
+
+        def batch_params(batch_texts, batch_langs):
+            if batch_langs is None:
+                return [resolved[None]] * len(batch_texts)
+            for item_lang in batch_langs:
+                if item_lang not in resolved:
+                    resolved[item_lang] = self._check_args(item_lang, pipeline,
+                                                           meta)[:2]
+            return [resolved[item_lang] for item_lang in batch_langs]
+
+        batches = ((batch_texts, batch_params(batch_texts, batch_langs), contexts)
+                   for batch_texts, batch_langs, contexts in _split_batches(
+                       texts, batch_size, as_tuples, with_lang))
+        if n_process == 1:
+            results = ((self._analyze_grouped(batch_texts, params, meta), contexts)
+                       for batch_texts, params, contexts in batches)
+        else:
+            results = self._pipe_multiprocess(batches, meta, n_process)
+        index = 0
+        for (docs, stats), contexts in results:
+            self._add_pipe_stats(stats)
+            for doc, context in zip(docs, contexts if as_tuples
+                                    else itertools.repeat(None)):
+                if isinstance(doc, LimaInternalError):
+                    if errors == "raise":
+                        where = f"text {index}" + (f" (context {context!r})"
+                                                   if as_tuples else "")
+                        raise LimaInternalError(
+                            f"Lima.pipe failed to analyze {where}: {doc}",
+                            analyzer_invalid=doc.analyzer_invalid) from doc
+                elif as_tuples:
+                    yield doc, context
+                else:
+                    yield doc
+                index += 1
+
+    def _pipe_multiprocess(self,
+                           batches: Iterator[Tuple[List[str], List[Tuple[str, str]],
+                                                   List[Any]]],
+                           meta: Dict[str, str],
+                           n_process: int) -> Iterator[
+                               Tuple[Tuple[List[Doc], Dict[str, List[float]]],
+                                     List[Any]]]:
+        """
+        Analyze batches of texts in n_process worker processes. At most two batches
+        per worker are in flight and results are yielded in input order. The cache,
+        if any, is used by this process: only the texts missing from it are sent to
+        the workers, and their documents are added to it.
+
+        :param batches: the (texts, params, contexts) triples of the batches, where
+            params are the (lang, pipeline) pairs of the texts.
+        :type batches: Iterator[Tuple[List[str], List[Tuple[str, str]], List[Any]]]
+        :return: an iterator on ((docs, stats), contexts) pairs, one for each batch
+            (see _analyze_grouped).
+        :rtype: Iterator[Tuple[Tuple[List[Doc], Dict[str, List[float]]], List[Any]]]
+        """
+        # LIMA and Qt are not fork-safe once initialized: always spawn workers
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=n_process,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_pipe_worker_init,
+                initargs=(self._init_args, self._worker_options)) as executor:
+            def submit(batch_texts, params, contexts):
+                docs = [None] * len(batch_texts)
+                keys = None
+                if self._cache is not None:
+                    keys = [self._cache.key(text, lang, pipeline, meta)
+                            for text, (lang, pipeline) in zip(batch_texts, params)]
+                    docs = [self._cache.get(key) for key in keys]
+                missing = [i for i, doc in enumerate(docs) if doc is None]
+                future = None
+                if missing:
+                    future = executor.submit(_pipe_worker_analyze,
+                                             [batch_texts[i] for i in missing],
+                                             [params[i] for i in missing], meta)
+                return future, docs, missing, keys, contexts
+
+            def result(future, docs, missing, keys, contexts):
+                stats = {}
+                if future is not None:
+                    analyzed, stats = future.result()
+                    for i, doc in zip(missing, analyzed):
+                        docs[i] = doc
+                        if keys is not None and not isinstance(doc, LimaInternalError):
+                            self._cache.put(keys[i], doc)
+                return (docs, stats), contexts
+
+            pending = collections.deque()
+            try:
+                for batch in batches:
+                    pending.append(submit(*batch))
+                    while len(pending) >= 2 * n_process:
+                        yield result(*pending.popleft())
+                while pending:
+                    yield result(*pending.popleft())
+            except concurrent.futures.process.BrokenProcessPool as e:
+                raise LimaInternalError(f"A Lima.pipe worker process died: {e}") from e
+            finally:
+                for future, *_ in pending:
+                    if future is not None:
+                        future.cancel()
+
+    cache_stats = property(
+            fget=lambda self: self._cache.stats if self._cache is not None else {},
+            doc=("Usage statistics of the analysis results cache: the number of entries"
+                 " and bytes in memory, the number of hits in memory and on disk, of"
+                 " misses and of evictions from memory. Empty if there is no cache.\n"
+                 ":type: Dict[str, int]\n"))
+
+    string_stats = property(
+            fget=lambda self: {lang: aymaralima.cpplima.StringStore(lang).size()
+                               for lang in self.langs},
+            doc=("Number of strings in the store of each language of the analyzer."
+                 " Stores are shared by all the analyzers of the process and only"
+                 " shrink when reset (see StringStore.reset).\n"
+                 ":type: Dict[str, int]\n"))
+
+    def clear_cache(self):
+        """
+        Remove all the analysis results kept in memory. Results stored in cache_dir
+        are kept.
+        """
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        Return the executor of asynchronous analyses, building it on first call.
+
+        :return: the executor of asynchronous analyses.
+        :rtype: concurrent.futures.ThreadPoolExecutor
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self._async_workers, thread_name_prefix="lima")
+            return self._executor
+
+    async def acall(self,
+                    text: str,
+                    lang: str = None,
+                    pipeline: str = None,
+                    meta: Dict[str, str] = {}) -> Doc:
+        """
+        Asynchronous version of `__call__`. The analysis runs in a thread of a pool of
+        async_workers threads, so it does not block the event loop. Cancelling the
+        returned coroutine before the analysis starts prevents it from running.
+
+        Example::
+
+                    import asyncio
+                    import aymara.lima
+                    nlp = aymara.lima.Lima()
+                    doc = asyncio.run(nlp.acall("Give it back! He pleaded."))
+                    print(doc)
+
+        :param text: the text to analyze
+        :type text: str
+        :param lang: the language of the text (see `__call__`).
+        :type lang: str
+        :param pipeline: the Lima pipeline to use for analysis (see `__call__`).
+        :type pipeline: str
+        :param meta: a dict of named metadata values (Default value = an empty
+            dictionary).
+        :type meta: Dict[str, str]
+
+        :return: a Doc object representing the result of the analysis.
+        :rtype: Doc
+        """
+        lang, pipeline, meta = self._check_args(lang, pipeline, meta)
+        if not isinstance(text, str):
+            raise TypeError(f"Lima.acall text parameter must be str, "
+                            f"not {type(text)}")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self._analyze, text,
+                                          lang, pipeline, meta)
+
+    async def apipe(self,
+                    texts: Union[AsyncIterable[Union[str, Tuple[str, Any]]],
+                                 Iterable[Union[str, Tuple[str, Any]]]],
+                    lang: str = None,
+                    pipeline: str = None,
+                    meta: Dict[str, str] = {},
+                    as_tuples: bool = False,
+                    max_pending: int = None) -> AsyncIterator[Union[Doc,
+                                                                    Tuple[Doc, Any]]]:
+        """
+        Asynchronous version of `pipe`. Texts are analyzed concurrently in the
+        threads of the asynchronous analyses pool while they are read from texts,
+        and Doc objects are yielded in input order.
+
+        Example::
+
+                    import asyncio
+                    import aymara.lima
+                    nlp = aymara.lima.Lima()
+
+                    async def main(texts):
+                        async for doc in nlp.apipe(texts):
+                            print(doc)
+
+                    asyncio.run(main(["Give it back!", "He pleaded."]))
+
+        :param texts: the texts to analyze, or (text, context) tuples if as_tuples is
+            True. Can be an asynchronous or a synchronous iterable.
+        :type texts: Union[AsyncIterable[Union[str, Tuple[str, Any]]],
+            Iterable[Union[str, Tuple[str, Any]]]]
+        :param lang: the language of the texts (see `__call__`).
+        :type lang: str
+        :param pipeline: the Lima pipeline to use for analysis (see `__call__`).
+        :type pipeline: str
+        :param meta: a dict of named metadata values (Default value = an empty
+            dictionary).
+        :type meta: Dict[str, str]
+        :param as_tuples: if True, texts are (text, context) tuples and (doc, context)
+            tuples are yielded (Default value = False).
+        :type as_tuples: bool
+        :param max_pending: the maximum number of texts read but not yet yielded
+            (Default value = twice the number of async workers).
+        :type max_pending: int
+
+        :return: the Doc objects, or (Doc, context) tuples if as_tuples is True, in
+            the order of texts.
+        :rtype: AsyncIterator[Union[Doc, Tuple[Doc, Any]]]
+        """
+        lang, pipeline, meta = self._check_args(lang, pipeline, meta)
+        if max_pending is None:
+            max_pending = 2 * self._async_workers
+        if not isinstance(max_pending, int) or max_pending < 1:
+            raise ValueError(f"Lima.apipe max_pending parameter must be a positive "
+                             f"int, not {max_pending}")
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        pending = collections.deque()
         try:
-            parse_obj_as(Dict[str, str], meta)
-        except ValidationError as e:
-            raise TypeError(f"Lima.analyzeText meta parameter must be Dict[str, str], "
-                            f"not {type(meta)}")
-        lima_doc = self.analyzer(
-            text, lang=lang, pipeline=pipeline,
-            meta=",".join([f"{k}:{v}" for k, v in meta.items()]))
-        if self.analyzer.error() or lima_doc.error():
-            raise LimaInternalError(self.analyzer.errorMessage()
-                                    + " / " + lima_doc.errorMessage())
-        return Doc(lima_doc)
+            async for item in _aiter(texts):
+                text, context = item if as_tuples else (item, None)
+                if not isinstance(text, str):
+                    raise TypeError(f"Lima.apipe texts must be str, not {type(text)}")
+                pending.append((loop.run_in_executor(executor, self._analyze, text,
+                                                     lang, pipeline, meta),
+                                context))
+                while len(pending) >= max_pending:
+                    future, context = pending.popleft()
+                    doc = await future
+                    yield (doc, context) if as_tuples else doc
+            while pending:
+                future, context = pending.popleft()
+                doc = await future
+                yield (doc, context) if as_tuples else doc
+        finally:
+            for future, _ in pending:
+                future.cancel()
 
     def analyzeText(self,
                     text: str,
@@ -853,36 +2408,13 @@ class Lima:
         if self.analyzer.error():
             # Not covering line below because it is not easy to make lima fail at will
             raise LimaInternalError(self.analyzer.errorMessage())  # pragma: no cover
-        if lang is None:
-            lang = self.langs[0] if self.langs else "eng"
-        if not isinstance(lang, str):
-            raise TypeError(f"Lima.analyzeText lang parameter must be str, "
-                            f"not {type(lang)}")
-        if (lang not in ["eng", "fre", "por"] and not lang.startswith("ud-")
-                and lang != "ud"):
-            lang = "ud-" + lang
-        if pipeline is None:
-            if self.pipes:
-                pipeline = self.pipes[0]
-            elif lang.startswith("ud-"):
-                pipeline = "deepud"
-            else:
-                pipeline = "main"
-        if not isinstance(pipeline, str):
-            raise TypeError(f"Lima.analyzeText pipeline parameter must be str, "
-                            f"not {type(pipeline)}")
+        lang, pipeline, meta = self._check_args(lang, pipeline, meta)
         if not isinstance(text, str):
             print(f"Lima.analyzeText text ({text}) is not a string. Raising.", file=sys.stderr)
             raise TypeError(f"Lima.analyzeText text parameter must be str, "
                             f"not {type(text)}")
-        try:
-            parse_obj_as(Dict[str, str], meta)
-        except ValidationError as e:
-            raise TypeError(f"Lima.analyzeText meta parameter must be Dict[str, str], "
-                            f"not {type(meta)}")
         result = self.analyzer.analyzeText(
-            text, lang=lang, pipeline=pipeline,
-            meta=",".join([f"{k}:{v}" for k, v in meta.items()]))
+            text, lang=lang, pipeline=pipeline, meta=meta)
         if self.analyzer.error():
             raise LimaInternalError(self.analyzer.errorMessage())
         return result
@@ -1014,6 +2546,345 @@ class Lima:
                 str(pathlib.Path(list(aymaralima.__path__)[-1]) / "resources"))
 
 
+class CallProfile:
+    """A precompiled set of analysis parameters
+
+    A call profile is built by `Lima.profile` which resolves and validates the
+    language, the pipeline and the metadata once. Calling the profile then only
+    requires the text to analyze.
+
+    Example::
+
+                import aymara.lima
+                nlp = aymara.lima.Lima()
+                eng = nlp.profile(lang="eng")
+                doc = eng("Give it back! He pleaded.")
+                print(doc)
+
+    """
+    def __init__(self,
+                 lima: Lima,
+                 lang: str,
+                 pipeline: str,
+                 meta: Dict[str, str]):
+        """
+        Initialize the call profile. Use `Lima.profile` instead of calling this
+        directly: parameters are not checked here.
+
+        :param lima: the Lima instance used to analyze texts.
+        :type lima: Lima
+        :param lang: the normalized language of the texts.
+        :type lang: str
+        :param pipeline: the Lima pipeline to use for analysis.
+        :type pipeline: str
+        :param meta: the validated metadata.
+        :type meta: Dict[str, str]
+        """
+        self._lima = lima
+        self._lang = lang
+        self._pipeline = pipeline
+        self._meta = dict(meta)
+
+    def __call__(self, text: str) -> Doc:
+        """
+        Analyze the given text with the parameters of this profile.
+
+        :param text: the text to analyze
+        :type text: str
+
+        :return: a Doc object representing the result of the analysis.
+        :rtype: Doc
+        """
+        if not isinstance(text, str):
+            raise TypeError(f"CallProfile text parameter must be str, "
+                            f"not {type(text)}")
+        return self._lima._analyze(text, self._lang, self._pipeline, self._meta)
+
+    def analyzeText(self, text: str) -> str:
+        """
+        Analyze the given text with the parameters of this profile and return the
+        output of the text dumper of Lima (see `Lima.analyzeText`).
+
+        :param text: the text to analyze
+        :type text: str
+
+        :return: the content of the text written by the text dumper of Lima if any. An
+            empty string otherwise
+        :rtype: str
+        """
+        if not isinstance(text, str):
+            raise TypeError(f"CallProfile text parameter must be str, "
+                            f"not {type(text)}")
+        analyzer = self._lima.analyzer
+        result = analyzer.analyzeText(text, lang=self._lang, pipeline=self._pipeline,
+                                      meta=self._meta)
+        if analyzer.error():
+            raise LimaInternalError(analyzer.errorMessage())
+        return result
+
+    lang = property(
+            fget=lambda self: self._lang,
+            doc="The normalized language of the profile.")
+
+    pipeline = property(
+            fget=lambda self: self._pipeline,
+            doc="The pipeline of the profile.")
+
+    meta = property(
+            fget=lambda self: dict(self._meta),
+            doc="A copy of the metadata of the profile.")
+
+
+class LimaPool:
+    """A pool of Lima analyzers shared between threads
+
+    Building a Lima analyzer is expensive, so the pool builds size analyzers once and
+    lends them to callers. When all analyzers are in use, callers wait in a queue
+    for one to be given back. An analyzer that becomes invalid (see
+    LimaInternalError.analyzer_invalid) is replaced by a new one when it is given
+    back. Building an analyzer changes process-wide LIMA data read by running
+    analyses, so the replacement first waits for the other analyzers of the pool
+    to be given back and new checkouts wait for the replacement to end. If the
+    pool cannot be drained (the thread giving back the invalid analyzer still
+    holds another one, or replace_timeout elapsed), the error state of the analyzer
+    is reset and it is given back to the pool instead.
+
+    Example::
+
+                import aymara.lima
+                pool = aymara.lima.LimaPool(size=4, langs="eng", pipes="main")
+                # In any thread
+                doc = pool.analyze("Give it back! He pleaded.")
+                with pool.checkout() as nlp:
+                    docs = list(nlp.pipe(["Give it back!", "He pleaded."]))
+                print(pool.stats)
+
+    """
+    def __init__(self,
+                 size: int = 2,
+                 langs: str = "fre,eng",
+                 pipes: str = "main,deepud",
+                 user_config_path: str = "",
+                 user_resources_path: str = "",
+                 meta: Dict[str, str] = {},
+                 replace_timeout: float = 60.0):
+        """
+        Initialize the pool and build its analyzers
+
+        :param size: the number of analyzers of the pool (Default value = 2)
+        :type size: int
+        :param langs: see `Lima.__init__` (Default value = "fre,eng")
+        :type langs: str
+        :param pipes: see `Lima.__init__` (Default value = "main,deepud")
+        :type pipes: str
+        :param user_config_path: see `Lima.__init__` (Default value = an empty string)
+        :type user_config_path: str
+        :param user_resources_path: see `Lima.__init__` (Default value = an empty
+            string)
+        :type user_resources_path: str
+        :param meta: see `Lima.__init__` (Default value = an empty dictionary)
+        :type meta:  Dict[str, str]
+        :param replace_timeout: the maximum time, in seconds, to wait for the other
+            analyzers to be given back before replacing an invalid analyzer
+            (Default value = 60.0)
+        :type replace_timeout: float
+        """
+        if not isinstance(size, int) or size < 1:
+            raise ValueError(f"LimaPool size parameter must be a positive int, "
+                             f"not {size}")
+        self._init_args = (langs, pipes, user_config_path, user_resources_path,
+                           dict(meta))
+        self._size = size
+        self._analyzers = queue.Queue()
+        for _ in range(size):
+            self._analyzers.put(Lima(*self._init_args))
+        self._replace_timeout = replace_timeout
+        self._lock = threading.Lock()
+        # Notified when an analyzer is given back and when a replacement ends
+        self._idle = threading.Condition(self._lock)
+        # Number of analyzers lent, in total and by thread identifier
+        self._busy = 0
+        self._holders = collections.Counter()
+        self._replacing = False
+        self._checkouts = 0
+        self._waiting = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._replaced = 0
+        self._reset = 0
+
+    @contextlib.contextmanager
+    def checkout(self, timeout: float = None) -> Iterator[Lima]:
+        """
+        Borrow an analyzer from the pool, waiting for one to be available if
+        necessary. The analyzer is given back to the pool when leaving the context.
+
+        :param timeout: the maximum time to wait for an analyzer, in seconds. None
+            means waiting forever (Default value = None)
+        :type timeout: float
+        :return: a context manager giving an analyzer
+        :rtype: Iterator[Lima]
+        """
+        start = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+        try:
+            nlp = self._analyzers.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No Lima analyzer available after {timeout}s") from None
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        with self._idle:
+            # No analysis starts while an analyzer is being replaced
+            while self._replacing:
+                self._idle.wait()
+            self._busy += 1
+            self._holders[threading.get_ident()] += 1
+            wait = time.perf_counter() - start
+            self._checkouts += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        failed = False
+        try:
+            yield nlp
+        except LimaInternalError as e:
+            failed = e.analyzer_invalid
+            raise
+        finally:
+            self._checkin(nlp, failed)
+
+    def _checkin(self, nlp: Lima, failed: bool):
+        """
+        Give back an analyzer to the pool, replacing it if it is invalid. Errors
+        limited to the analysis of a document do not invalidate it.
+
+        :param nlp: the analyzer to give back
+        :type nlp: Lima
+        :param failed: True if an analysis reported this analyzer as invalid
+        :type failed: bool
+        """
+        me = threading.get_ident()
+        with self._idle:
+            self._busy -= 1
+            self._holders[me] -= 1
+            if not self._holders[me]:
+                del self._holders[me]
+            replace = False
+            if failed or nlp.analyzer.error():
+                # Only one replacement at a time, the others reset their analyzer
+                replace = not self._replacing
+                self._replacing = self._replacing or replace
+            self._idle.notify_all()
+        try:
+            if replace:
+                nlp = self._replace(nlp)
+            elif failed or nlp.analyzer.error():
+                nlp = self._reset_error(nlp)
+        finally:
+            if replace:
+                with self._idle:
+                    self._replacing = False
+                    self._idle.notify_all()
+            self._analyzers.put(nlp)
+
+    def _replace(self, nlp: Lima) -> Lima:
+        """
+        Build a new analyzer to replace the given invalid one once the other
+        analyzers of the pool have been given back. Falls back to resetting the
+        error state of the given analyzer if the pool cannot be drained or if the
+        new analyzer cannot be built.
+
+        :param nlp: the invalid analyzer
+        :type nlp: Lima
+        :return: the analyzer to give back to the pool
+        :rtype: Lima
+        """
+        with self._idle:
+            # A thread still holding another analyzer would wait for itself
+            drained = (threading.get_ident() not in self._holders
+                       and self._idle.wait_for(lambda: self._busy == 0,
+                                               timeout=self._replace_timeout))
+        if not drained:
+            warnings.warn("LimaPool could not replace an invalid analyzer while "
+                          "other analyses were running, resetting it",
+                          RuntimeWarning)
+            return self._reset_error(nlp)
+        try:
+            replacement = Lima(*self._init_args)
+        except Exception as e:
+            warnings.warn(f"LimaPool failed to replace an invalid analyzer, "
+                          f"resetting it: {e}", RuntimeWarning)
+            return self._reset_error(nlp)
+        with self._lock:
+            self._replaced += 1
+        return replacement
+
+    def _reset_error(self, nlp: Lima) -> Lima:
+        """
+        Reset the sticky error state of the given analyzer to keep it in the pool.
+
+        :param nlp: the analyzer to reset
+        :type nlp: Lima
+        :return: the given analyzer
+        :rtype: Lima
+        """
+        if nlp.analyzer.error():
+            nlp.analyzer.errorMessage()
+        with self._lock:
+            self._reset += 1
+        return nlp
+
+    def analyze(self, text: str, timeout: float = None, **kwargs) -> Doc:
+        """
+        Analyze the given text with an analyzer borrowed from the pool.
+
+        :param text: the text to analyze
+        :type text: str
+        :param timeout: the maximum time to wait for an analyzer, in seconds. None
+            means waiting forever (Default value = None)
+        :type timeout: float
+        :param kwargs: the other parameters of `Lima.__call__` (lang, pipeline, meta)
+        :return: a Doc object representing the result of the analysis.
+        :rtype: Doc
+        """
+        with self.checkout(timeout=timeout) as nlp:
+            return nlp(text, **kwargs)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of analyzers of the pool
+
+        :return: the number of analyzers of the pool
+        :rtype: int
+        """
+        return self._size
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """
+        Usage statistics of the pool: the number of checkouts, of callers currently
+        waiting, of replaced analyzers and of invalid analyzers kept after
+        resetting their error state, and the total, mean and maximum times (in
+        seconds) spent waiting for an analyzer.
+
+        :type: Dict[str, float]
+        """
+        with self._lock:
+            return {
+                "size": self._size,
+                "available": self._analyzers.qsize(),
+                "checkouts": self._checkouts,
+                "waiting": self._waiting,
+                "replaced": self._replaced,
+                "reset": self._reset,
+                "total_wait": self._total_wait,
+                "mean_wait": (self._total_wait / self._checkouts
+                              if self._checkouts else 0.0),
+                "max_wait": self._max_wait,
+            }
+
+
 def main():  # pragma: no cover
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -1023,6 +2894,15 @@ def main():  # pragma: no cover
         default="",
         help="set the user configuration path to use",
     )
+    parser.add_argument(
+        "-k",
+        "--chunk-size",
+        type=int,
+        default=0,
+        help=("set the maximum number of characters analyzed at once in large files, "
+              "which are split at paragraph breaks (default: 0, analyze files at "
+              "once)"),
+    )
     parser.add_argument(
         "-l",
         "--language",
@@ -1071,7 +2951,7 @@ def main():  # pragma: no cover
     for file_name in tqdm(args.file):
         with open(file_name) as text_file:
             text = text_file.read()
-            r = nlp(text)
+            r = nlp(text, chunk_size=args.chunk_size or None)
             print(repr(r))
     sys.exit(0)
 
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: 2026 CEA LIST <gael.de-chalendar@cea.fr>
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Benchmark of the iteration over the tokens of a document with the Python API.
+
+The document is built with the pickling support of aymara.lima.Doc, so that no
+LIMA model is needed: only the aymaralima bindings must be installed. It measures
+the first pass over the tokens, which builds the Token wrappers, later passes, which
+reuse them, and the iteration over sentences and spans. Run with:
+
+    python3 benchmarks/token_iteration_bench.py [tokens] [repetitions]
+"""
+
+import sys
+import timeit
+
+import aymara.lima
+
+SENTENCE = [("He", "he", "PRON", 1, "nsubj", "t_capital_1st"),
+            ("pleaded", "plead", "VERB", -1, "root", "t_small"),
+            ("with", "with", "ADP", 3, "case", "t_small"),
+            ("them", "they", "PRON", 1, "obl", "t_small"),
+            (".", ".", "PUNCT", 1, "punct", "t_sentence_brk")]
+
+
+def make_doc(tokens: int) -> aymara.lima.Doc:
+    """Return a document of tokens tokens made of copies of SENTENCE"""
+    sentence_text = " ".join(form for form, *_ in SENTENCE) + " "
+    sentences = tokens // len(SENTENCE)
+    text = sentence_text * sentences
+    state = []
+    spans = []
+    pos = 1
+    for s in range(sentences):
+        first = s * len(SENTENCE)
+        for j, (form, lemma, tag, head, dep, status) in enumerate(SENTENCE):
+            state.append((len(form), form, lemma, first + j, pos, tag,
+                          first + head if head >= 0 else 0, dep, "_", "O", "_",
+                          status))
+            pos += len(form) + 1
+        spans.append((first - 1 if s > 0 else 0, first + len(SENTENCE) - 1))
+    return aymara.lima._doc_from_state(text, "ud-eng", state, spans)
+
+
+def main():
+    tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    doc = make_doc(tokens)
+    print(f"{len(doc)} tokens, best of {repetitions} runs")
+
+    def first_pass():
+        fresh = aymara.lima.Doc(doc.limadoc)
+        for token in fresh:
+            token.lemma
+
+    def next_passes():
+        for token in doc:
+            token.lemma
+            token.pos
+            token.dep
+
+    def sentences():
+        for sentence in doc.sents:
+            for token in sentence:
+                token.head
+
+    for name, f in (("first pass, lemma", first_pass),
+                    ("next passes, lemma/pos/dep", next_passes),
+                    ("sentences, head", sentences)):
+        best = min(timeit.repeat(f, number=1, repeat=repetitions))
+        print(f"{name:28}{best * 1000:8.1f} ms {best * 1e9 / len(doc):8.0f} ns/token")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+// Copyright 2026 CEA LIST
+// SPDX-FileCopyrightText: 2026 CEA LIST <gael.de-chalendar@cea.fr>
+//
+// SPDX-License-Identifier: MIT
+
+/* Micro-benchmark of the string conversions of LimaAnalyzerPrivate::fillToken.
+ *
+ * LIMA strings (FSA strings pool entries, relation names, tokenization status)
+ * are UTF-16 QStrings. Before, each token transcoded its form, lemma, relation,
+ * status and named entity type to UTF-8 and then interned them in the strings
+ * store. Now pooled strings are converted once per language (PoolStrings),
+ * micro-category tags come with their ids (MicroTags) and the other strings are
+ * interned once per analysis (ConversionContext::id).
+ *
+ * It does not depend on LIMA nor Qt: UTF-16 strings are std::u16string and the
+ * transcoding is a plain UTF-16 to UTF-8 conversion, like QString::toStdString.
+ * Strings are interned in the StringStore of the bindings, with its locking. Build
+ * from the repository root and run with:
+ *
+ *   g++ -O2 -std=c++17 -I. benchmarks/token_strings_bench.cpp StringStore.cpp \
+ *       -o token_strings_bench
+ *   ./token_strings_bench [tokens] [repetitions]
+ */
+
+#include "StringStore.h"
+
+#include <chrono>
+#include <cstdlib>
+#include <iostream>
+#include <random>
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+/** Same as QString::toStdString, without surrogate pairs */
+std::string toUtf8(const std::u16string& s)
+{
+  std::string result;
+  result.reserve(s.size());
+  for (auto c: s)
+  {
+    if (c < 0x80)
+    {
+      result += static_cast<char>(c);
+    }
+    else if (c < 0x800)
+    {
+      result += static_cast<char>(0xC0 | (c >> 6));
+      result += static_cast<char>(0x80 | (c & 0x3F));
+    }
+    else
+    {
+      result += static_cast<char>(0xE0 | (c >> 12));
+      result += static_cast<char>(0x80 | ((c >> 6) & 0x3F));
+      result += static_cast<char>(0x80 | (c & 0x3F));
+    }
+  }
+  return result;
+}
+
+struct SourceToken
+{
+  size_t form;
+  size_t lemma;
+  size_t tag;
+  size_t relation;
+  size_t status;
+  size_t neType;
+};
+
+struct Token
+{
+  std::string text;
+  int lemma;
+  int tag;
+  int dep;
+  int tStatus;
+  int neType;
+};
+
+struct Data
+{
+  std::vector<std::u16string> pool;
+  std::vector<std::string> tags;
+  std::vector<std::u16string> relations;
+  std::vector<std::u16string> statuses;
+  std::vector<std::u16string> neTypes;
+  std::vector<SourceToken> tokens;
+};
+
+Data makeData(size_t tokens)
+{
+  Data data;
+  std::mt19937 random(42);
+  const std::u16string letters = u"abcdefghijklmnopqrstuvwxyzéèàçœ";
+  for (size_t i = 0; i < 20000; i++)
+  {
+    std::u16string word;
+    auto length = 2 + random() % 10;
+    for (size_t j = 0; j < length; j++)
+    {
+      word += letters[random() % letters.size()];
+    }
+    data.pool.push_back(word);
+  }
+  for (const auto& tag: {"NOUN", "VERB", "ADJ", "ADV", "DET", "PRON", "ADP", "PUNCT",
+                         "PROPN", "AUX", "CCONJ", "SCONJ", "NUM", "PART", "X"})
+  {
+    data.tags.push_back(tag);
+  }
+  for (const auto& relation: {u"nsubj", u"obj", u"det", u"amod", u"case", u"nmod",
+                              u"root", u"punct", u"advmod", u"conj", u"_"})
+  {
+    data.relations.push_back(relation);
+  }
+  for (const auto& status: {u"t_small", u"t_capital_1st", u"t_word_brk",
+                            u"t_sentence_brk", u"t_integer"})
+  {
+    data.statuses.push_back(status);
+  }
+  for (const auto& neType: {u"_", u"_", u"_", u"_", u"Person.PERSON",
+                            u"Location.LOCATION"})
+  {
+    data.neTypes.push_back(neType);
+  }
+  // Word frequencies follow roughly a Zipf law
+  std::vector<double> weights;
+  for (size_t i = 0; i < data.pool.size(); i++)
+  {
+    weights.push_back(1.0 / (i + 1));
+  }
+  std::discrete_distribution<size_t> words(weights.begin(), weights.end());
+  for (size_t i = 0; i < tokens; i++)
+  {
+    auto form = words(random);
+    data.tokens.push_back({form, form % 15000, random() % data.tags.size(),
+                           random() % data.relations.size(),
+                           random() % data.statuses.size(),
+                           random() % data.neTypes.size()});
+  }
+  return data;
+}
+
+/** Sum of the lengths of the tokens texts, to check and keep the conversions */
+long textBytes(const std::vector<Token>& tokens)
+{
+  long bytes = 0;
+  for (const auto& token: tokens)
+  {
+    bytes += token.text.size();
+  }
+  return bytes;
+}
+
+/** The conversion before: transcode each string of each token, then intern */
+long before(const Data& data, StringStore& store)
+{
+  std::vector<Token> tokens;
+  tokens.reserve(data.tokens.size());
+  for (const auto& source: data.tokens)
+  {
+    Token token;
+    token.text = toUtf8(data.pool[source.form]);
+    if (token.text.find_first_of("\r\n\t") != std::string::npos)
+    {
+      token.text.clear();
+    }
+    token.lemma = store.add(toUtf8(data.pool[source.lemma]));
+    token.tag = store.add(data.tags[source.tag]);
+    token.dep = store.add(toUtf8(data.relations[source.relation]));
+    token.tStatus = store.add(toUtf8(data.statuses[source.status]));
+    token.neType = store.add(toUtf8(data.neTypes[source.neType]));
+    tokens.push_back(std::move(token));
+  }
+  return textBytes(tokens);
+}
+
+/** Conversion caches living as long as the analyzer */
+struct Caches
+{
+  std::unordered_map<size_t, std::string> texts;
+  std::unordered_map<size_t, int> lemmas;
+  std::vector<int> tagIds;
+};
+
+/** The conversion after: pooled strings and tags are converted once per language,
+ * the other strings once per document */
+long after(const Data& data, StringStore& store, Caches& caches)
+{
+  if (caches.tagIds.empty())
+  {
+    for (const auto& tag: data.tags)
+    {
+      caches.tagIds.push_back(store.add(tag));
+    }
+  }
+  std::unordered_map<std::u16string, int> ids;
+  auto id = [&](const std::u16string& s) {
+    auto it = ids.find(s);
+    if (it != ids.end())
+    {
+      return it->second;
+    }
+    auto result = store.add(toUtf8(s));
+    ids.emplace(s, result);
+    return result;
+  };
+  std::vector<Token> tokens;
+  tokens.reserve(data.tokens.size());
+  for (const auto& source: data.tokens)
+  {
+    Token token;
+    auto text = caches.texts.find(source.form);
+    if (text == caches.texts.end())
+    {
+      auto utf8 = toUtf8(data.pool[source.form]);
+      if (utf8.find_first_of("\r\n\t") != std::string::npos)
+      {
+        utf8.clear();
+      }
+      text = caches.texts.emplace(source.form, utf8).first;
+    }
+    token.text = text->second;
+    auto lemma = caches.lemmas.find(source.lemma);
+    if (lemma == caches.lemmas.end())
+    {
+      lemma = caches.lemmas.emplace(source.lemma,
+                                    store.add(toUtf8(data.pool[source.lemma]))).first;
+    }
+    token.lemma = lemma->second;
+    token.tag = caches.tagIds[source.tag];
+    token.dep = id(data.relations[source.relation]);
+    token.tStatus = id(data.statuses[source.status]);
+    token.neType = id(data.neTypes[source.neType]);
+    tokens.push_back(std::move(token));
+  }
+  return textBytes(tokens);
+}
+
+template <typename F>
+double bestOf(int repetitions, F f, long& result)
+{
+  double best = 0;
+  for (int r = 0; r < repetitions; r++)
+  {
+    auto start = std::chrono::steady_clock::now();
+    result = f();
+    std::chrono::duration<double, std::nano> elapsed =
+      std::chrono::steady_clock::now() - start;
+    if (r == 0 || elapsed.count() < best)
+    {
+      best = elapsed.count();
+    }
+  }
+  return best;
+}
+
+int main(int argc, char** argv)
+{
+  size_t tokens = argc > 1 ? std::atol(argv[1]) : 100000;
+  int repetitions = argc > 2 ? std::atoi(argv[2]) : 20;
+
+  auto data = makeData(tokens);
+  // The strings store and the caches are warm after the first documents of a
+  // language, as in a long running analyzer
+  // Stores are shared per language: use one language per conversion
+  StringStore beforeStore("before");
+  StringStore afterStore("after");
+  Caches caches;
+  long beforeResult = 0;
+  long afterResult = 0;
+  auto beforeTime = bestOf(repetitions, [&]() { return before(data, beforeStore); },
+                           beforeResult);
+  auto afterTime = bestOf(repetitions,
+                          [&]() { return after(data, afterStore, caches); },
+                          afterResult);
+  if (beforeResult != afterResult)
+  {
+    std::cerr << "Results differ: " << beforeResult << " " << afterResult << std::endl;
+    return 1;
+  }
+  std::cout << tokens << " tokens, best of " << repetitions << " runs" << std::endl
+            << "transcoding each token: " << beforeTime / tokens << " ns/token"
+            << std::endl
+            << "cached conversions:     " << afterTime / tokens << " ns/token"
+            << std::endl
+            << "speedup:                " << beforeTime / afterTime << "x" << std::endl;
+  return 0;
+}
@@ -0,0 +1,163 @@
+// Copyright 2026 CEA LIST
+// SPDX-FileCopyrightText: 2026 CEA LIST <gael.de-chalendar@cea.fr>
+//
+// SPDX-License-Identifier: MIT
+
+/* Micro-benchmark of the vertex bookkeeping of LimaAnalyzerPrivate::docFrom_analysis.
+ *
+ * It reproduces, on a synthetic document, the accesses done to the vertex to token
+ * and vertex to dependency tables while converting an analysis: one insertion per
+ * vertex, then for each token the dependency lookup of getConllRelName and the
+ * token lookup of its governor. It compares std::map tables with the dense
+ * vertex-indexed vectors used by ConversionContext.
+ *
+ * It does not depend on LIMA. Build and run with:
+ *
+ *   g++ -O2 -std=c++17 benchmarks/vertex_tables_bench.cpp -o vertex_tables_bench
+ *   ./vertex_tables_bench [tokens] [repetitions]
+ */
+
+#include <algorithm>
+#include <chrono>
+#include <cstdlib>
+#include <iostream>
+#include <map>
+#include <random>
+#include <string>
+#include <utility>
+#include <vector>
+
+using Vertex = unsigned long;
+
+static const std::vector<std::string> relations = {
+  "SUJ_V", "COD_V", "DETSUB", "ADJPRENSUB", "PREPSUB", "COMPDUNOM", "ATB_S"};
+
+struct Dependency
+{
+  Vertex target = 0;
+  std::string relation;
+};
+
+/** Sum of the governor token indexes, to prevent the compiler from removing the
+ * lookups */
+long mapConversion(const std::vector<Vertex>& vertices,
+                   const std::vector<Vertex>& governors)
+{
+  std::map<Vertex, std::pair<Vertex, std::string>> vertexDependencyInformations;
+  std::map<Vertex, int> vertexToToken;
+  for (size_t i = 0; i < vertices.size(); i++)
+  {
+    vertexToToken[vertices[i]] = i;
+    vertexDependencyInformations.insert(std::make_pair(
+      vertices[i], std::make_pair(governors[i], relations[i % relations.size()])));
+  }
+  long sum = 0;
+  for (auto v: vertices)
+  {
+    if (vertexDependencyInformations.count(v) != 0)
+    {
+      auto target = vertexDependencyInformations.find(v)->second.first;
+      if (vertexToToken.find(target) != vertexToToken.end())
+      {
+        sum += vertexToToken.find(target)->second;
+      }
+      sum += vertexDependencyInformations.find(v)->second.second.size();
+    }
+  }
+  return sum;
+}
+
+long denseConversion(const std::vector<Vertex>& vertices,
+                     const std::vector<Vertex>& governors,
+                     size_t numVertices)
+{
+  std::vector<Dependency> vertexDependencyInformations(numVertices);
+  std::vector<int> vertexToToken(numVertices, -1);
+  for (size_t i = 0; i < vertices.size(); i++)
+  {
+    vertexToToken[vertices[i]] = i;
+    auto& information = vertexDependencyInformations[vertices[i]];
+    if (information.relation.empty())
+    {
+      information.target = governors[i];
+      information.relation = relations[i % relations.size()];
+    }
+  }
+  long sum = 0;
+  for (auto v: vertices)
+  {
+    const auto& information = vertexDependencyInformations[v];
+    if (!information.relation.empty())
+    {
+      auto token = vertexToToken[information.target];
+      if (token >= 0)
+      {
+        sum += token;
+      }
+      sum += information.relation.size();
+    }
+  }
+  return sum;
+}
+
+template <typename F>
+double bestOf(int repetitions, F f, long& result)
+{
+  double best = 0;
+  for (int r = 0; r < repetitions; r++)
+  {
+    auto start = std::chrono::steady_clock::now();
+    result = f();
+    std::chrono::duration<double, std::micro> elapsed =
+      std::chrono::steady_clock::now() - start;
+    if (r == 0 || elapsed.count() < best)
+    {
+      best = elapsed.count();
+    }
+  }
+  return best;
+}
+
+int main(int argc, char** argv)
+{
+  size_t tokens = argc > 1 ? std::atol(argv[1]) : 10000;
+  int repetitions = argc > 2 ? std::atoi(argv[2]) : 50;
+
+  // PosGraph vertices are allocated densely, but not all of them are tokens
+  // (first and last vertices, alternatives removed by disambiguation)
+  size_t numVertices = tokens + tokens / 10 + 2;
+  std::vector<Vertex> vertices(numVertices - 2);
+  for (size_t i = 0; i < vertices.size(); i++)
+  {
+    vertices[i] = i + 1;
+  }
+  std::mt19937 random(42);
+  std::shuffle(vertices.begin(), vertices.end(), random);
+  vertices.resize(tokens);
+  std::sort(vertices.begin(), vertices.end());
+  std::vector<Vertex> governors(tokens);
+  for (size_t i = 0; i < tokens; i++)
+  {
+    governors[i] = vertices[random() % tokens];
+  }
+
+  long mapResult = 0;
+  long denseResult = 0;
+  auto mapTime = bestOf(repetitions,
+                        [&]() { return mapConversion(vertices, governors); },
+                        mapResult);
+  auto denseTime = bestOf(repetitions,
+                          [&]() { return denseConversion(vertices, governors,
+                                                         numVertices); },
+                          denseResult);
+  if (mapResult != denseResult)
+  {
+    std::cerr << "Results differ: " << mapResult << " " << denseResult << std::endl;
+    return 1;
+  }
+  std::cout << tokens << " tokens, best of " << repetitions << " runs" << std::endl
+            << "std::map tables:     " << mapTime << " us" << std::endl
+            << "dense vector tables: " << denseTime << " us" << std::endl
+            << "speedup:             " << mapTime / denseTime << "x" << std::endl;
+  return 0;
+}
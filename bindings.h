@@ -59,6 +59,7 @@
 #include "lima.h"
 #include "Doc.h"
 #include "Span.h"
+#include "StringStore.h"
 #include "Token.h"
 
 #endif // BINDINGS_H
@@ -97,11 +97,17 @@
 #include <deque>
 #include <fstream>
 #include <iostream>
+#include <algorithm>
+#include <atomic>
 #include <iomanip>
 #include <map>
 #include <memory>
+#include <mutex>
 #include <set>
+#include <shared_mutex>
 #include <string>
+#include <tuple>
+#include <unordered_map>
 #include <vector>
 
 #include <boost/algorithm/string.hpp>
@@ -150,6 +156,359 @@ std::shared_ptr< std::ostringstream > openHandlerOutputString(
 
 int run(int aargc,char** aargv);
 
+/** Return the UTF-8 form of a token text, with its non printable characters
+ * escaped if it contains line breaks or tabulations */
+std::string escapedTokenText(const QString& text)
+{
+  auto result = text.toStdString();
+  if (result.find_first_of("\r\n\t") != std::string::npos)
+    boost::find_format_all(result,
+                            boost::token_finder(!boost::is_print()),
+                            character_escaper());
+  return result;
+}
+
+/** Cache of the conversions of the strings of the FSA strings pool of a language
+ * read by the analyses: the UTF-8 text of token forms and the ids of lemmas in the
+ * strings store of the language. This avoids transcoding the same pooled UTF-16
+ * strings for each of their occurrences. The cache is shared by all the analyses
+ * of an analyzer and is bounded. */
+class PoolStrings
+{
+public:
+  PoolStrings(const FsaStringsPool& pool, const StringStore& strings) :
+      m_pool(&pool), m_strings(strings)
+  {
+  }
+
+  /** Return the escaped UTF-8 text of the token form index (see
+   * escapedTokenText) */
+  std::string text(StringsPoolIndex index)
+  {
+    {
+      std::shared_lock<std::shared_mutex> lock(m_mutex);
+      auto it = m_texts.find(index);
+      if (it != m_texts.end())
+      {
+        return it->second;
+      }
+    }
+    auto text = escapedTokenText((*m_pool)[index]);
+    std::unique_lock<std::shared_mutex> lock(m_mutex);
+    if (m_texts.size() < maxSize)
+    {
+      m_texts.emplace(index, text);
+    }
+    return text;
+  }
+
+  /** Return the id in the strings store of the pool string index */
+  int id(StringsPoolIndex index)
+  {
+    {
+      std::shared_lock<std::shared_mutex> lock(m_mutex);
+      auto it = m_ids.find(index);
+      if (it != m_ids.end())
+      {
+        return it->second;
+      }
+    }
+    auto id = m_strings.add((*m_pool)[index].toStdString());
+    std::unique_lock<std::shared_mutex> lock(m_mutex);
+    if (m_ids.size() < maxSize)
+    {
+      m_ids.emplace(index, id);
+    }
+    return id;
+  }
+
+  const StringStore& strings() const
+  {
+    return m_strings;
+  }
+
+  static constexpr size_t maxSize = 1 << 20;
+
+private:
+  struct IndexHash
+  {
+    size_t operator()(StringsPoolIndex index) const
+    {
+      return std::hash<uint64_t>()(static_cast<uint64_t>(index));
+    }
+  };
+
+  const FsaStringsPool* m_pool;
+  StringStore m_strings;
+  mutable std::shared_mutex m_mutex;
+  std::unordered_map<StringsPoolIndex, std::string, IndexHash> m_texts;
+  std::unordered_map<StringsPoolIndex, int, IndexHash> m_ids;
+};
+
+/** Cache of the ids of the features strings of the tokens of a language in its
+ * strings store, keyed by the packed property code of their first
+ * morphosyntactic element. There are few distinct codes, so the cache is bounded
+ * and is shared by all the analyses of an analyzer. */
+class FeaturesCache
+{
+public:
+  explicit FeaturesCache(const StringStore& strings) : m_strings(strings)
+  {
+  }
+
+  /** Return true and set features to the id of the features of code if they are
+   * cached */
+  bool find(const LinguisticCode& code, int& features) const
+  {
+    std::shared_lock<std::shared_mutex> lock(m_mutex);
+    auto it = m_features.find(code);
+    if (it == m_features.end())
+    {
+      return false;
+    }
+    features = it->second;
+    return true;
+  }
+
+  /** Cache the features id of code unless the cache is full */
+  void insert(const LinguisticCode& code, int features)
+  {
+    std::unique_lock<std::shared_mutex> lock(m_mutex);
+    if (m_features.size() < maxSize)
+    {
+      m_features.emplace(code, features);
+    }
+  }
+
+  const StringStore& strings() const
+  {
+    return m_strings;
+  }
+
+  static constexpr size_t maxSize = 4096;
+
+private:
+  StringStore m_strings;
+  mutable std::shared_mutex m_mutex;
+  std::map<LinguisticCode, int> m_features;
+};
+
+/** The MICRO property manager and accessor of a language with the table of its
+ * micro-categories tags, resolved once when the analyzer is initialized. */
+class MicroTags
+{
+public:
+  MicroTags(const PropertyCodeManager& propertyCodeManager,
+            const StringStore& strings) :
+      manager(&propertyCodeManager.getPropertyManager("MICRO")),
+      accessor(&propertyCodeManager.getPropertyAccessor("MICRO")),
+      strings(strings)
+  {
+    for (const auto& [tag, code]: manager->getSymbolicValues())
+    {
+      m_tags.push_back({code, tag, this->strings.add(tag)});
+    }
+    std::sort(m_tags.begin(), m_tags.end(),
+              [](const auto& a, const auto& b) { return a.code < b.code; });
+  }
+
+  /** Return the tag of the micro-category code */
+  std::string tag(const LinguisticCode& code) const
+  {
+    auto entry = find(code);
+    if (entry != nullptr)
+    {
+      return entry->tag;
+    }
+    return manager->getPropertySymbolicValue(code);
+  }
+
+  /** Return the id in strings of the tag of the micro-category code or -1 if it
+   * is unknown */
+  int id(const LinguisticCode& code) const
+  {
+    auto entry = find(code);
+    return entry != nullptr ? entry->id : -1;
+  }
+
+  const PropertyManager* manager;
+  const Common::PropertyCode::PropertyAccessor* accessor;
+  /** The store of the ids of the tags */
+  StringStore strings;
+
+private:
+  struct Entry
+  {
+    LinguisticCode code;
+    std::string tag;
+    int id;
+  };
+
+  const Entry* find(const LinguisticCode& code) const
+  {
+    auto it = std::lower_bound(m_tags.begin(), m_tags.end(), code,
+                               [](const Entry& a, const LinguisticCode& c) {
+                                 return a.code < c; });
+    if (it != m_tags.end() && !(code < it->code))
+    {
+      return &*it;
+    }
+    return nullptr;
+  }
+
+  std::vector<Entry> m_tags;
+};
+
+/** Per-analysis state used to convert an analysis result into a Doc. A new instance
+ * is used for each analysis such that an analyzer can run several analyses
+ * concurrently. */
+struct ConversionContext
+{
+  QString previousNeType = "O";
+
+  const FsaStringsPool* sp = nullptr;
+  MediaId medId = 0;
+
+  const LanguageData* languageData = nullptr;
+  const PropertyCodeManager* propertyCodeManager = nullptr;
+  const Common::PropertyCode::PropertyAccessor* propertyAccessor = nullptr;
+  LinguisticGraph* posGraph = nullptr;
+  LinguisticGraph* anaGraph = nullptr;
+  std::shared_ptr<AnnotationData> annotationData = nullptr;
+  std::shared_ptr<SyntacticData> syntacticData = nullptr;
+  /** The governor of a PosGraph vertex and the LIMA name of the relation. The
+   * relation is empty if the vertex has no governor */
+  struct DependencyInformation
+  {
+    LinguisticGraphVertex target = 0;
+    std::string relation;
+  };
+
+  /** Make room in the vertex-indexed tables for the vertices of a graph of size
+   * vertices */
+  void reserveVertices(size_t size)
+  {
+    if (size > vertexToToken.size())
+    {
+      vertexToToken.resize(size, -1);
+      vertexDependencyInformations.resize(size);
+      vertexEntities.resize(size);
+    }
+  }
+
+  /** Return the index of the token of the PosGraph vertex v or -1 if unknown */
+  int token(LinguisticGraphVertex v) const
+  {
+    return v < vertexToToken.size() ? vertexToToken[v] : -1;
+  }
+
+  void setToken(LinguisticGraphVertex v, int tokenId)
+  {
+    reserveVertices(v + 1);
+    vertexToToken[v] = tokenId;
+  }
+
+  /** Return the dependency of the PosGraph vertex v or nullptr if it has none */
+  const DependencyInformation* dependency(LinguisticGraphVertex v) const
+  {
+    if (v >= vertexDependencyInformations.size()
+        || vertexDependencyInformations[v].relation.empty())
+    {
+      return nullptr;
+    }
+    return &vertexDependencyInformations[v];
+  }
+
+  /** Set the dependency of the PosGraph vertex v if it does not have one yet */
+  void setDependency(LinguisticGraphVertex v,
+                     LinguisticGraphVertex target,
+                     const std::string& relation)
+  {
+    reserveVertices(v + 1);
+    auto& information = vertexDependencyInformations[v];
+    if (information.relation.empty())
+    {
+      information.target = target;
+      information.relation = relation;
+    }
+  }
+
+  /** The named entity information of a PosGraph vertex, computed once by
+   * LimaAnalyzerPrivate::entity */
+  struct EntityInformation
+  {
+    bool known = false;
+    /** The entity type name or "_" if the vertex is not part of an entity */
+    QString neType = "_";
+    /** True if the vertex has matches in the annot graph */
+    bool hasAnnotMatches = false;
+    /** The entity annotated on the vertex in the annot graph, whose members are
+     * PosGraph vertices */
+    const SpecificEntityAnnotation* posGraphEntity = nullptr;
+    /** The entity annotated on the AnalysisGraph vertex of the vertex, whose
+     * members are AnalysisGraph vertices */
+    const SpecificEntityAnnotation* analysisGraphEntity = nullptr;
+  };
+
+  // PosGraph vertices are dense integers: these tables are indexed by vertex
+  std::vector<EntityInformation> vertexEntities;
+  std::vector<DependencyInformation> vertexDependencyInformations;
+  std::vector<int> vertexToToken;
+  QMap<QString, QString> conllLimaDepMapping;
+  std::shared_ptr<FeaturesCache> featuresCache;
+  std::shared_ptr<const MicroTags> microTags;
+  std::shared_ptr<PoolStrings> poolStrings;
+  /** The store of the strings of the tokens. Lazy documents intern strings when
+   * their tokens are materialized from a const context */
+  mutable StringStore strings;
+  /** The ids in strings of the relation names, tokenization status and named
+   * entity types already seen during the conversion */
+  mutable QHash<QString, int> ids;
+
+  /** Return the id of s in strings */
+  int id(const QString& s) const
+  {
+    auto it = ids.constFind(s);
+    if (it != ids.constEnd())
+    {
+      return it.value();
+    }
+    auto id = strings.add(s.toStdString());
+    ids.insert(s, id);
+    return id;
+  }
+
+  /** If true, token fields are computed on demand from tokenVertices */
+  bool lazy = false;
+  /** For lazy documents, the graph and vertex of each token */
+  std::vector< std::pair<LinguisticGraph*, LinguisticGraphVertex> > tokenVertices;
+};
+
+/** The analysis handlers given to the linguistic processing client. Handlers hold
+ * their output stream, so each analysis gets its own set. */
+struct AnalysisHandlers
+{
+  AnalysisHandlers();
+  AnalysisHandlers(const AnalysisHandlers& a) = delete;
+  AnalysisHandlers& operator=(const AnalysisHandlers& a) = delete;
+
+  BowTextWriter bowTextWriter;
+  BowTextHandler bowTextHandler;
+  SimpleStreamHandler simpleStreamHandler;
+  SimpleStreamHandler fullXmlSimpleStreamHandler;
+  LTRTextHandler ltrTextHandler;
+  std::map<std::string, AbstractAnalysisHandler*> handlers;
+};
+
+AnalysisHandlers::AnalysisHandlers()
+{
+  handlers.insert(std::make_pair("bowTextWriter", &bowTextWriter));
+  handlers.insert(std::make_pair("bowTextHandler", &bowTextHandler));
+  handlers.insert(std::make_pair("simpleStreamHandler", &simpleStreamHandler));
+  handlers.insert(std::make_pair("fullXmlSimpleStreamHandler", &fullXmlSimpleStreamHandler));
+  handlers.insert(std::make_pair("ltrTextHandler", &ltrTextHandler));
+}
+
 class LimaAnalyzerPrivate
 {
   friend class LimaAnalyzer;
@@ -167,31 +526,49 @@ public:
   const std::string analyzeText(const std::string& text,
                                 const std::string& lang,
                                 const std::string& pipeline,
-                                const std::string& meta);
+                                const std::map<std::string, std::string>& meta);
 
   Doc operator()(const std::string& text,
                  const std::string& lang="eng",
                  const std::string& pipeline="main",
-                 const std::string& meta="");
+                 const std::map<std::string, std::string>& meta={});
+
+  /** Analyze text with the result of analysisParameters. If keepAnalysis is
+   * false, the document does not retain the analysis content */
+  Doc analyze(const std::string& text,
+              const std::map<std::string, std::string>& metaData,
+              const std::string& pipeline,
+              bool keepAnalysis);
+
+  /** Build the metadata of an analysis from the analyzer metadata, overriden by
+   * meta, and the language and pipeline to use */
+  std::tuple<std::map<std::string, std::string>, std::string, std::string> analysisParameters(
+    const std::string& lang,
+    const std::string& pipeline,
+    const std::map<std::string, std::string>& meta) const;
 
   bool addPipelineUnit(const std::string& pipeline,
                        const std::string& media,
                        const std::string& jsonGroupString);
 
-  void collectDependencyInformations(std::shared_ptr<Lima::AnalysisContent> analysis);
-  void collectVertexDependencyInformations(LinguisticGraphVertex v,
-                                           std::shared_ptr<Lima::AnalysisContent> analysis);
+  void collectDependencyInformations(ConversionContext& ctx,
+                                     std::shared_ptr<Lima::AnalysisContent> analysis);
+  void collectVertexDependencyInformations(ConversionContext& ctx,
+                                           LinguisticGraphVertex v);
 
-  Doc docFrom_analysis(std::shared_ptr<Lima::AnalysisContent> analysis);
+  Doc docFrom_analysis(std::shared_ptr<Lima::AnalysisContent> analysis,
+                       bool keepAnalysis);
 
-  int dumpPosGraphVertex(Doc& doc,
+  int dumpPosGraphVertex(ConversionContext& ctx,
+                         Doc& doc,
                          LinguisticGraphVertex v,
                          int& tokenId,
                          LinguisticGraphVertex vEndDone,
                          const QString& parentNeType,
                          bool first);
 
-  int dumpAnalysisGraphVertex(Doc& doc,
+  int dumpAnalysisGraphVertex(ConversionContext& ctx,
+                              Doc& doc,
                               LinguisticGraphVertex v,
                               LinguisticGraphVertex posGraphVertex,
                               int& tokenId,
@@ -200,62 +577,90 @@ public:
                               bool first,
                               const Automaton::EntityFeatures& features);
 
-  void dumpNamedEntity(Doc& doc,
+  void dumpNamedEntity(ConversionContext& ctx,
+                       Doc& doc,
                        LinguisticGraphVertex v,
                        int& tokenId,
                        LinguisticGraphVertex vEndDone,
                        const QString& neType);
 
+  /** Gets the named entity information of the PosGraph vertex @ref posGraphVertex,
+   * querying the annotation graphs on the first call for this vertex only */
+  ConversionContext::EntityInformation entity(ConversionContext& ctx,
+                                              LinguisticGraphVertex posGraphVertex);
+
   /** Gets the named entity type for the PosGraph vertex @ref posGraphVertex
    * if it is a specific entity. Return "_" otherwise
    */
-  QString getNeType(LinguisticGraphVertex posGraphVertex);
+  QString getNeType(ConversionContext& ctx, LinguisticGraphVertex posGraphVertex);
 
-  std::pair<QString, int> getConllRelName(LinguisticGraphVertex v);
+  static std::pair<QString, int> getConllRelName(const ConversionContext& ctx,
+                                                 LinguisticGraphVertex v);
 
-  const SpecificEntityAnnotation* getSpecificEntityAnnotation(LinguisticGraphVertex v) const;
+  const SpecificEntityAnnotation* getSpecificEntityAnnotation(
+    const ConversionContext& ctx, LinguisticGraphVertex v) const;
 
   bool hasSpaceAfter(LinguisticGraphVertex v, LinguisticGraph* graph);
 
-  QString getMicro(LinguisticAnalysisStructure::MorphoSyntacticData& morphoData);
-
-  QString getFeats(const LinguisticAnalysisStructure::MorphoSyntacticData& morphoData);
-
-  /** Reset all members used to store analysis states. To be called before handling a new analysis. */
+  static std::string getMicro(const ConversionContext& ctx,
+                              const LinguisticAnalysisStructure::MorphoSyntacticData& morphoData);
+
+  static QString getFeats(const ConversionContext& ctx,
+                          const LinguisticAnalysisStructure::MorphoSyntacticData& morphoData);
+
+  /** Return the id in ctx.strings of the result of getFeats, using the features
+   * cache of the language */
+  static int featuresId(const ConversionContext& ctx,
+                        const LinguisticAnalysisStructure::MorphoSyntacticData& morphoData);
+
+  /** Return the features cache of strings, the store of language lang, creating
+   * it if needed or if the store was reset */
+  std::shared_ptr<FeaturesCache> featuresCache(const std::string& lang,
+                                               const StringStore& strings);
+
+  /** Return the id in ctx.strings of the micro-category tag of morphoData */
+  static int tagId(const ConversionContext& ctx,
+                   const LinguisticAnalysisStructure::MorphoSyntacticData& morphoData);
+
+  /** Return the pool strings cache of strings, the store of language lang,
+   * creating it if needed or if the store was reset */
+  std::shared_ptr<PoolStrings> poolStrings(const std::string& lang, MediaId medId,
+                                           const StringStore& strings);
+
+  /** Return the micro-categories table of the language medId in strings, its
+   * store, rebuilding it if the store was reset, or nullptr if the language was
+   * not initialized by the constructor */
+  std::shared_ptr<const MicroTags> microTagsOf(MediaId medId,
+                                               const StringStore& strings);
+
+  /** Compute the fields of token that depend on the vertex v of graph: all but its
+   * index and named entity tags */
+  static void fillToken(const ConversionContext& ctx,
+                        Token& token,
+                        LinguisticGraph* graph,
+                        LinguisticGraphVertex v);
+
+  /** Add token to doc, computing its fields now or, for lazy documents, recording
+   * its vertex to compute them when it is read */
+  void pushToken(ConversionContext& ctx,
+                 Doc& doc,
+                 Token& token,
+                 LinguisticGraph* graph,
+                 LinguisticGraphVertex v);
+
+  /** Reset the error state. */
   void reset();
 
+  /** Set the error state. Can be called concurrently by several analyses. */
+  void setError(const std::string& message);
+
   std::map<std::string, std::string> parseMetaData(const QString& meta,
                                                    QChar comma = ',',
                                                    QChar colon = ':',
                                                    const std::map<std::string, std::string>& append = {});
 
-  QString previousNeType;
-
-  const FsaStringsPool* sp = nullptr;
-  MediaId medId;
-
-  const LanguageData* languageData = nullptr;
-  const Common::PropertyCode::PropertyAccessor* propertyAccessor = nullptr;
-  LinguisticGraph* posGraph = nullptr;
-  LinguisticGraph* anaGraph = nullptr;
-  std::shared_ptr<AnnotationData> annotationData = nullptr;
-  std::shared_ptr<SyntacticData> syntacticData = nullptr;
-  std::map< LinguisticGraphVertex,
-          std::pair<LinguisticGraphVertex,
-                    std::string> > vertexDependencyInformations;
-  QMap<QString, QString> conllLimaDepMapping;
-
-
-  std::map<LinguisticGraphVertex, int> vertexToToken;
-
-  const PropertyCodeManager* propertyCodeManager = nullptr;
   // Fixed members that do not change at each analysis
-  std::map<std::string, AbstractAnalysisHandler*> handlers;
-  std::unique_ptr<BowTextWriter> bowTextWriter = nullptr;
-  std::unique_ptr<BowTextHandler> bowTextHandler = nullptr;
-  std::unique_ptr<SimpleStreamHandler> simpleStreamHandler = nullptr;
-  std::unique_ptr<SimpleStreamHandler> fullXmlSimpleStreamHandler = nullptr;
-  std::unique_ptr<LTRTextHandler> ltrTextHandler = nullptr;
+  QMap<QString, QString> conllLimaDepMapping;
   std::set<std::string> dumpers = {"text"};
   std::shared_ptr< AbstractLinguisticProcessingClient > m_client;
   std::map<std::string,std::string> metaData;
@@ -267,11 +672,53 @@ public:
   QString user_resources_path;
   QString meta;
 
+  /** If true, analyses produce lazy documents (see LimaAnalyzer::setLazyTokens) */
+  std::atomic<bool> lazyTokens{false};
+  /** If false, documents of single analyses do not retain their analysis (see
+   * LimaAnalyzer::setKeepAnalysis) */
+  std::atomic<bool> keepAnalysis{true};
+
+  std::mutex featuresCachesMutex;
+  std::map<std::string, std::shared_ptr<FeaturesCache> > featuresCaches;
+
+  /** The pool strings caches of the languages, by language name as their strings
+   * stores */
+  std::mutex poolStringsMutex;
+  std::map<std::string, std::shared_ptr<PoolStrings> > poolStringsCaches;
+
+  /** The micro-categories tables of the languages, built by the constructor and
+   * rebuilt when their strings store is reset (see StringStore::reset) */
+  std::mutex microTagsMutex;
+  std::map<MediaId, std::shared_ptr<const MicroTags> > microTags;
+
+  std::mutex errorMutex;
   bool error = false;
   std::string errorMessage = "";
 
 };
 
+/** Materializer of the tokens of lazy documents. It retains the analysis and the
+ * conversion context of the document. */
+class LazyTokenMaterializer : public TokenMaterializer
+{
+public:
+  LazyTokenMaterializer(std::shared_ptr<const ConversionContext> ctx,
+                        std::shared_ptr<Lima::AnalysisContent> analysis) :
+      m_ctx(ctx), m_analysis(analysis)
+  {
+  }
+
+  void materialize(Token& token) const override
+  {
+    const auto& [graph, v] = m_ctx->tokenVertices[token.i];
+    LimaAnalyzerPrivate::fillToken(*m_ctx, token, graph, v);
+  }
+
+private:
+  std::shared_ptr<const ConversionContext> m_ctx;
+  std::shared_ptr<Lima::AnalysisContent> m_analysis;
+};
+
 
 LimaAnalyzerPrivate::LimaAnalyzerPrivate(const QStringList& iqlangs,
                                          const QStringList& iqpipelines,
@@ -405,17 +852,15 @@ LimaAnalyzerPrivate::LimaAnalyzerPrivate(const QStringList& iqlangs,
   m_client = std::dynamic_pointer_cast<AbstractLinguisticProcessingClient>(
     LinguisticProcessingClientFactory::single().createClient(clientId));
 
-  // Set the handlers
-  bowTextWriter = std::make_unique<BowTextWriter>();
-  handlers.insert(std::make_pair("bowTextWriter", bowTextWriter.get()));
-  bowTextHandler = std::make_unique<BowTextHandler>();
-  handlers.insert(std::make_pair("bowTextHandler", bowTextHandler.get()));
-  simpleStreamHandler = std::make_unique<SimpleStreamHandler>();
-  handlers.insert(std::make_pair("simpleStreamHandler", simpleStreamHandler.get()));
-  fullXmlSimpleStreamHandler = std::make_unique<SimpleStreamHandler>();
-  handlers.insert(std::make_pair("fullXmlSimpleStreamHandler", fullXmlSimpleStreamHandler.get()));
-  ltrTextHandler= std::make_unique<LTRTextHandler>();
-  handlers.insert(std::make_pair("ltrTextHandler", ltrTextHandler.get()));
+  for (const auto& lang: langs)
+  {
+    auto medId = MedData::single().media(lang);
+    const auto& languageData = static_cast<const LanguageData&>(
+      MedData::single().mediaData(medId));
+    microTags[medId] = std::make_shared<const MicroTags>(
+      languageData.getPropertyCodeManager(), StringStore(lang));
+  }
+
   // std::cerr << "LimaAnalyzerPrivate constructor done" << std::endl;
 
 }
@@ -505,10 +950,41 @@ LimaAnalyzer& LimaAnalyzer::operator=(const LimaAnalyzer& a)
   return *this;
 }
 
+void LimaAnalyzer::setLazyTokens(bool lazy)
+{
+  if (m_d != nullptr)
+  {
+    m_d->lazyTokens = lazy;
+  }
+}
+
+bool LimaAnalyzer::lazyTokens() const
+{
+  return m_d != nullptr && m_d->lazyTokens;
+}
+
+void LimaAnalyzer::setKeepAnalysis(bool keep)
+{
+  if (m_d != nullptr)
+  {
+    m_d->keepAnalysis = keep;
+  }
+}
+
+bool LimaAnalyzer::keepAnalysis() const
+{
+  return m_d != nullptr && m_d->keepAnalysis;
+}
+
 /** return true if an error occured */
 bool LimaAnalyzer::error()
 {
-  return m_d == nullptr || m_d->error;
+  if (m_d == nullptr)
+  {
+    return true;
+  }
+  std::lock_guard<std::mutex> lock(m_d->errorMutex);
+  return m_d->error;
 }
 /** return the error message if an error occured and reset the error state */
 std::string LimaAnalyzer::errorMessage()
@@ -517,7 +993,11 @@ std::string LimaAnalyzer::errorMessage()
   {
     return "Error during constructor";
   }
-  std::string result = m_d->errorMessage;
+  std::string result;
+  {
+    std::lock_guard<std::mutex> lock(m_d->errorMutex);
+    result = m_d->errorMessage;
+  }
   m_d->reset();
   return result;
 }
@@ -525,40 +1005,39 @@ std::string LimaAnalyzer::errorMessage()
 
 void LimaAnalyzerPrivate::reset()
 {
-  previousNeType = "O";
-  sp = nullptr;
-  medId = 0;
-  languageData = nullptr;
-  syntacticData = nullptr;
-  propertyAccessor = nullptr;
-  posGraph = nullptr;
-  anaGraph = nullptr;
-  annotationData = nullptr;
-  propertyCodeManager = nullptr;
-  vertexDependencyInformations.clear();
-  conllLimaDepMapping.clear();
-  vertexToToken.clear();
+  std::lock_guard<std::mutex> lock(errorMutex);
   error = false;
   errorMessage = "";
 }
 
+void LimaAnalyzerPrivate::setError(const std::string& message)
+{
+  std::lock_guard<std::mutex> lock(errorMutex);
+  error = true;
+  errorMessage = message;
+}
+
 Doc LimaAnalyzer::operator()(const std::string& text,
                                      const std::string& lang,
                                      const std::string& pipeline,
-                                     const std::string& meta)
+                                     const std::map<std::string, std::string>& meta)
 {
   if (m_d == nullptr)
   {
     auto doc = Doc(true, "No analyzer available");
     return doc;
   }
-  else if (m_d->error)
   {
-    m_d->error = true;
-    m_d->errorMessage = "Invalid Lima analyzer. Previous error message was: " + m_d->errorMessage;
-    auto doc = Doc(true, m_d->errorMessage);
-    return doc;
+    std::lock_guard<std::mutex> lock(m_d->errorMutex);
+    if (m_d->error)
+    {
+      auto doc = Doc(true, "Invalid Lima analyzer. Previous error message was: "
+                           + m_d->errorMessage);
+      return doc;
+    }
   }
+  // Errors are reported on the document only: concurrent analyses on this
+  // analyzer are not affected by the failure of this one
   try
   {
     return (*m_d)(text, lang, pipeline, meta);
@@ -566,35 +1045,80 @@ Doc LimaAnalyzer::operator()(const std::string& text,
   catch (const Lima::LimaException& e)
   {
     std::cerr << "Lima internal error: " << e.what() << std::endl;
-    m_d->error = true;
-    m_d->errorMessage = e.what();
-    auto doc = Doc(m_d->error, m_d->errorMessage);
+    auto doc = Doc(true, e.what());
     return doc;
   }
   catch (const std::runtime_error& e)
   {
     std::cerr << "Lima internal error: " << e.what() << std::endl;
-    m_d->error = true;
-    m_d->errorMessage = e.what();
-    auto doc = Doc(m_d->error, m_d->errorMessage);
+    auto doc = Doc(true, e.what());
     return doc;
   }
 }
 
+std::vector<Doc> LimaAnalyzer::analyzeBatch(
+    const std::vector<std::string>& texts,
+    const std::string& lang,
+    const std::string& pipeline,
+    const std::map<std::string, std::string>& meta)
+{
+  std::vector<Doc> docs;
+  docs.reserve(texts.size());
+  if (m_d == nullptr)
+  {
+    docs.resize(texts.size(), Doc(true, "No analyzer available"));
+    return docs;
+  }
+  {
+    std::lock_guard<std::mutex> lock(m_d->errorMutex);
+    if (m_d->error)
+    {
+      docs.resize(texts.size(),
+                  Doc(true, "Invalid Lima analyzer. Previous error message was: "
+                            + m_d->errorMessage));
+      return docs;
+    }
+  }
+  auto [localMetaData, localLang, localPipeline] = m_d->analysisParameters(lang, pipeline, meta);
+  for (const auto& text: texts)
+  {
+    // Errors are reported on the document only: the analyzer stays usable for
+    // the following texts
+    try
+    {
+      docs.emplace_back(m_d->analyze(text, localMetaData, localPipeline, false));
+    }
+    catch (const Lima::LimaException& e)
+    {
+      std::cerr << "Lima internal error: " << e.what() << std::endl;
+      docs.emplace_back(true, e.what());
+    }
+    catch (const std::runtime_error& e)
+    {
+      std::cerr << "Lima internal error: " << e.what() << std::endl;
+      docs.emplace_back(true, e.what());
+    }
+  }
+  return docs;
+}
+
 std::string LimaAnalyzer::analyzeText(const std::string& text,
                                     const std::string& lang,
                                     const std::string& pipeline,
-                                    const std::string& meta) const
+                                    const std::map<std::string, std::string>& meta) const
 {
   // std::cerr << "LimaAnalyzer::analyzeText" << std::endl;
   if (m_d == nullptr)
   {
     return "";
   }
-  else if (m_d->error)
   {
-    m_d->errorMessage = "Invalid Lima analyzer. Previous error message was: " + m_d->errorMessage;
-    return "";
+    std::lock_guard<std::mutex> lock(m_d->errorMutex);
+    if (m_d->error)
+    {
+      m_d->errorMessage = "Invalid Lima analyzer. Previous error message was: " + m_d->errorMessage;
+      return "";
+    }
   }
   try
   {
@@ -603,33 +1127,28 @@ std::string LimaAnalyzer::analyzeText(const std::string& text,
   catch (const Lima::LimaException& e)
   {
     std::cerr << "Lima internal error: " << e.what() << std::endl;
-    m_d->error = true;
-    m_d->errorMessage = e.what();
+    m_d->setError(e.what());
     return "";
   }
   catch (const std::runtime_error& e)
   {
     std::cerr << "Lima internal error: " << e.what() << std::endl;
-    m_d->error = true;
-    m_d->errorMessage = e.what();
+    m_d->setError(e.what());
     return "";
   }
 }
 
-Doc LimaAnalyzerPrivate::operator()(
-    const std::string& text,
+std::tuple<std::map<std::string, std::string>, std::string, std::string>
+LimaAnalyzerPrivate::analysisParameters(
     const std::string& lang,
     const std::string& pipeline,
-    const std::string& meta)
+    const std::map<std::string, std::string>& meta) const
 {
   auto localMetaData = metaData;
   localMetaData["FileName"]="param";
-  auto qmeta = QString::fromStdString(meta).split(",", Qt::SkipEmptyParts);
-  for (const auto& m: qmeta)
+  for (const auto& [key, value]: meta)
   {
-    auto kv = m.split(":", Qt::SkipEmptyParts);
-    if (kv.size() == 2)
-      localMetaData[kv[0].toStdString()] = kv[1].toStdString();
+    localMetaData[key] = value;
   }
 
   auto localLang = lang;
@@ -643,7 +1162,25 @@ Doc LimaAnalyzerPrivate::operator()(
     localPipeline = qpipelines[0].toStdString();
   }
   localMetaData["Lang"] = localLang;
+  return { localMetaData, localLang, localPipeline };
+}
+
+Doc LimaAnalyzerPrivate::operator()(
+    const std::string& text,
+    const std::string& lang,
+    const std::string& pipeline,
+    const std::map<std::string, std::string>& meta)
+{
+  auto [localMetaData, localLang, localPipeline] = analysisParameters(lang, pipeline, meta);
+  return analyze(text, localMetaData, localPipeline, keepAnalysis);
+}
 
+Doc LimaAnalyzerPrivate::analyze(
+    const std::string& text,
+    const std::map<std::string, std::string>& metaData,
+    const std::string& pipeline,
+    bool keepAnalysis)
+{
   QString contentText = QString::fromUtf8(text.c_str());
   if (contentText.isEmpty())
   {
@@ -654,8 +1191,10 @@ Doc LimaAnalyzerPrivate::operator()(
   {
     // analyze it
 //       std::cerr << "Analyzing " << contentText.toStdString() << std::endl;
-    auto analysis = m_client->analyze(contentText, localMetaData, localPipeline, handlers);
-    return docFrom_analysis(analysis);
+    AnalysisHandlers analysisHandlers;
+    auto analysis = m_client->analyze(contentText, metaData, pipeline,
+                                      analysisHandlers.handlers);
+    return docFrom_analysis(analysis, keepAnalysis);
   }
 }
 
@@ -729,31 +1268,13 @@ Doc LimaAnalyzerPrivate::operator()(
 const std::string LimaAnalyzerPrivate::analyzeText(const std::string& text,
                                     const std::string& lang,
                                     const std::string& pipeline,
-                                    const std::string& meta)
+                                    const std::map<std::string, std::string>& meta)
 {
-  auto txtofs  = openHandlerOutputString(simpleStreamHandler.get(), dumpers, "text");
+  AnalysisHandlers analysisHandlers;
+  auto txtofs  = openHandlerOutputString(&analysisHandlers.simpleStreamHandler,
+                                         dumpers, "text");
 
-  auto localMetaData = parseMetaData(QString::fromStdString(meta), ',', ':', metaData);
-  localMetaData["FileName"]="param";
-  auto qmeta = QString::fromStdString(meta).split(",", Qt::SkipEmptyParts);
-  for (const auto& m: qmeta)
-  {
-    auto kv = m.split(":", Qt::SkipEmptyParts);
-    if (kv.size() == 2)
-      localMetaData[kv[0].toStdString()] = kv[1].toStdString();
-  }
-
-  auto localLang = lang;
-  if (localLang.size() == 0)
-  {
-    localLang = qlangs[0].toStdString();
-  }
-  auto localPipeline = pipeline;
-  if (localPipeline.size() == 0)
-  {
-    localPipeline = qpipelines[0].toStdString();
-  }
-  localMetaData["Lang"] = localLang;
+  auto [localMetaData, localLang, localPipeline] = analysisParameters(lang, pipeline, meta);
 
   QString contentText = QString::fromUtf8(text.c_str());
   if (contentText.isEmpty())
@@ -764,11 +1285,12 @@ const std::string LimaAnalyzerPrivate::analyzeText(const std::string& text,
   {
     // analyze it
     // std::cerr << "Analyzing " << contentText.toStdString() << std::endl;
-    m_client->analyze(contentText, localMetaData, localPipeline, handlers);
+    m_client->analyze(contentText, localMetaData, localPipeline,
+                      analysisHandlers.handlers);
   }
   auto result = txtofs->str();
   // std::cerr << "LimaAnalyzerPrivate::analyzeText result: " << result << std::endl;
-  simpleStreamHandler->setOut(nullptr);
+  analysisHandlers.simpleStreamHandler.setOut(nullptr);
   return result;
 }
 
@@ -790,8 +1312,7 @@ bool LimaAnalyzerPrivate::addPipelineUnit(const std::string& pipeline,
       jsonGroupString), &jsonError);
     if (jsonDoc.isNull())
     {
-      error = true;
-      errorMessage = std::string("Failed to load json " + jsonGroupString + ":\n" + jsonError.errorString().toStdString());
+      setError(std::string("Failed to load json " + jsonGroupString + ":\n" + jsonError.errorString().toStdString()));
       return false;
     }
     auto jsonGroup = jsonDoc.object();
@@ -816,15 +1337,13 @@ bool LimaAnalyzerPrivate::addPipelineUnit(const std::string& pipeline,
   catch (const Lima::LimaException& e)
   {
     std::cerr << "!!!!!!!!!!! Lima internal error: " << e.what() << std::endl;
-    error = true;
-    errorMessage = std::string("Lima internal error:") + e.what();
+    setError(std::string("Lima internal error:") + e.what());
     return false;
   }
   catch (const std::runtime_error& e)
   {
     std::cerr << "Lima internal error: " << e.what() << std::endl;
-    error = true;
-    errorMessage = std::string("Lima internal error:") + e.what();
+    setError(std::string("Lima internal error:") + e.what());
     return false;
   }
 }
@@ -847,13 +1366,14 @@ std::shared_ptr< std::ostringstream > openHandlerOutputString(
   return ofs;
 }
 
-QString LimaAnalyzerPrivate::getFeats(const LinguisticAnalysisStructure::MorphoSyntacticData& morphoData)
+QString LimaAnalyzerPrivate::getFeats(const ConversionContext& ctx,
+                                      const LinguisticAnalysisStructure::MorphoSyntacticData& morphoData)
 {
 #ifdef DEBUG_LP
   DUMPERLOGINIT;
   LDEBUG << "getFeats";
 #endif
-  auto managers = propertyCodeManager->getPropertyManagers();
+  const auto& managers = ctx.propertyCodeManager->getPropertyManagers();
 
   QStringList featuresList;
   for (auto i = managers.cbegin(); i != managers.cend(); i++)
@@ -861,7 +1381,7 @@ QString LimaAnalyzerPrivate::getFeats(const LinguisticAnalysisStructure::MorphoS
     auto key = QString::fromUtf8(i->first.c_str());
     if (key != "MACRO" && key != "MICRO")
     {
-      const auto& pa = propertyCodeManager->getPropertyAccessor(key.toStdString());
+      const auto& pa = ctx.propertyCodeManager->getPropertyAccessor(key.toStdString());
       LinguisticCode lc = morphoData.firstValue(pa);
       auto value = QString::fromUtf8(i->second.getPropertySymbolicValue(lc).c_str());
       if (value != "NONE")
@@ -896,7 +1416,88 @@ QString LimaAnalyzerPrivate::getFeats(const LinguisticAnalysisStructure::MorphoS
   return features;
 }
 
-void LimaAnalyzerPrivate::collectDependencyInformations(std::shared_ptr<Lima::AnalysisContent> analysis)
+int LimaAnalyzerPrivate::featuresId(
+  const ConversionContext& ctx,
+  const LinguisticAnalysisStructure::MorphoSyntacticData& morphoData)
+{
+  // getFeats only reads the properties of the first element
+  if (morphoData.empty() || ctx.featuresCache == nullptr
+      || ctx.featuresCache->strings() != ctx.strings)
+  {
+    return ctx.strings.add(getFeats(ctx, morphoData).toStdString());
+  }
+  const auto& code = morphoData.front().properties;
+  int features;
+  if (!ctx.featuresCache->find(code, features))
+  {
+    features = ctx.strings.add(getFeats(ctx, morphoData).toStdString());
+    ctx.featuresCache->insert(code, features);
+  }
+  return features;
+}
+
+int LimaAnalyzerPrivate::tagId(
+  const ConversionContext& ctx,
+  const LinguisticAnalysisStructure::MorphoSyntacticData& morphoData)
+{
+  if (ctx.microTags != nullptr && ctx.microTags->strings == ctx.strings)
+  {
+    auto id = ctx.microTags->id(morphoData.firstValue(*ctx.propertyAccessor));
+    if (id >= 0)
+    {
+      return id;
+    }
+  }
+  return ctx.strings.add(getMicro(ctx, morphoData));
+}
+
+std::shared_ptr<PoolStrings> LimaAnalyzerPrivate::poolStrings(const std::string& lang,
+                                                              MediaId medId,
+                                                              const StringStore& strings)
+{
+  std::lock_guard<std::mutex> lock(poolStringsMutex);
+  auto& cache = poolStringsCaches[lang];
+  if (cache == nullptr || cache->strings() != strings)
+  {
+    cache = std::make_shared<PoolStrings>(MedData::single().stringsPool(medId),
+                                          strings);
+  }
+  return cache;
+}
+
+std::shared_ptr<FeaturesCache> LimaAnalyzerPrivate::featuresCache(const std::string& lang,
+                                                                  const StringStore& strings)
+{
+  std::lock_guard<std::mutex> lock(featuresCachesMutex);
+  auto& cache = featuresCaches[lang];
+  if (cache == nullptr || cache->strings() != strings)
+  {
+    cache = std::make_shared<FeaturesCache>(strings);
+  }
+  return cache;
+}
+
+std::shared_ptr<const MicroTags> LimaAnalyzerPrivate::microTagsOf(MediaId medId,
+                                                                  const StringStore& strings)
+{
+  std::lock_guard<std::mutex> lock(microTagsMutex);
+  auto it = microTags.find(medId);
+  if (it == microTags.end())
+  {
+    return nullptr;
+  }
+  if (it->second->strings != strings)
+  {
+    const auto& languageData = static_cast<const LanguageData&>(
+      MedData::single().mediaData(medId));
+    it->second = std::make_shared<const MicroTags>(
+      languageData.getPropertyCodeManager(), strings);
+  }
+  return it->second;
+}
+
+void LimaAnalyzerPrivate::collectDependencyInformations(ConversionContext& ctx,
+                                                        std::shared_ptr<Lima::AnalysisContent> analysis)
 {
 #ifdef DEBUG_LP
   DUMPERLOGINIT;
@@ -913,29 +1514,32 @@ void LimaAnalyzerPrivate::collectDependencyInformations(std::shared_ptr<Lima::An
   auto firstVertex = posGraphData->firstVertex();
   auto lastVertex = posGraphData->lastVertex();
   auto v = firstVertex;
-  auto [it, it_end] = boost::out_edges(v, *posGraph);
+  auto [it, it_end] = boost::out_edges(v, *ctx.posGraph);
   if (it != it_end)
   {
-      v = boost::target(*it, *posGraph);
+      v = boost::target(*it, *ctx.posGraph);
   }
   else
   {
       v = lastVertex;
   }
 
-  syntacticData = std::dynamic_pointer_cast<SyntacticData>(analysis->getData("SyntacticData"));
-  if (syntacticData == nullptr)
+  ctx.reserveVertices(boost::num_vertices(*ctx.posGraph));
+
+  ctx.syntacticData = std::dynamic_pointer_cast<SyntacticData>(analysis->getData("SyntacticData"));
+  if (ctx.syntacticData == nullptr)
   {
-    syntacticData = std::make_shared<SyntacticData>(posGraphData.get(), nullptr);
-    syntacticData->setupDependencyGraph();
-    analysis->setData("SyntacticData", syntacticData.get());
+    ctx.syntacticData = std::make_shared<SyntacticData>(posGraphData.get(), nullptr);
+    ctx.syntacticData->setupDependencyGraph();
+    analysis->setData("SyntacticData", ctx.syntacticData.get());
   }
   int tokenId = 0;
 
   while (v != lastVertex)
   {
-    QString neType = getNeType(v);
-    QString neIOB = "O";
+    // This first pass fills the entity table read again by dumpPosGraphVertex
+    auto entityInformation = entity(ctx, v);
+    const auto& neType = entityInformation.neType;
     // Collect NE vertices and output them instead of a single line for
     // current v. NE vertices can not only be PosGraph
     // vertices (and thus can just call dumpPosGraphVertex
@@ -944,76 +1548,50 @@ void LimaAnalyzerPrivate::collectDependencyInformations(std::shared_ptr<Lima::An
     // Furthermore, named entities can be recursive...
     if (neType != "_")
     {
-      auto matches = annotationData->matches("PosGraph", v, "annot");
-      if (!matches.empty())
+      if (entityInformation.hasAnnotMatches)
       {
-        for (const auto& vx: matches)
+        if (entityInformation.posGraphEntity != nullptr)
         {
-          if (annotationData->hasAnnotation(vx, QString::fromUtf8("SpecificEntity")))
+          ctx.previousNeType = "O";
+          for (const auto& vse : entityInformation.posGraphEntity->vertices())
           {
-            auto se = annotationData->annotation(vx, QString::fromUtf8("SpecificEntity"))
-              .pointerValue<SpecificEntityAnnotation>();
-            previousNeType = "O";
-            bool first = true;
-            for (const auto& vse : se->vertices())
-            {
-              collectVertexDependencyInformations(vse, analysis);
-              vertexToToken[vse] = tokenId;
-              first = false;
-            }
-            break;
+            collectVertexDependencyInformations(ctx, vse);
+            ctx.setToken(vse, tokenId);
           }
         }
       }
-      else
+      else if (entityInformation.analysisGraphEntity != nullptr)
       {
-        auto anaVertices = annotationData->matches("PosGraph", v, "AnalysisGraph");
-        auto anaVertex = *anaVertices.begin();
-        if (annotationData->hasAnnotation(anaVertex, QString::fromUtf8("SpecificEntity")))
+        // All retrieved lines/tokens have the same netype. Depending on the
+        // output style (CoNLL 2003, CoNLL-U, …), the generated line is different
+        // and the ne-Type includes or not BIO information using in this case the
+        // previousNeType member of the context.
+        ctx.previousNeType = "O";
+        ctx.setToken(v, tokenId);
+        tokenId++;
+        for (const auto& vse : entityInformation.analysisGraphEntity->vertices())
         {
-          auto se = annotationData->annotation(anaVertex, QString::fromUtf8("SpecificEntity"))
-            .pointerValue<SpecificEntityAnnotation>();
-          // All retrieved lines/tokens have the same netype. Depending on the
-          // output style (CoNLL 2003, CoNLL-U, …), the generated line is different
-          // and the ne-Type includes or not BIO information using in this case the
-          // previousNeType member.
-          previousNeType = "O";
-          bool first = true;
-          vertexToToken[v] = tokenId;
-          tokenId++;
-          for (const auto& vse : se->vertices())
-          {
-            auto posVertices = annotationData->matches("AnalysisGraph", vse, "PosGraph");
-            auto posVertex = *posVertices.begin();
-            // @TODO Should follow instructions here to output all MWE:
-            // https://universaldependencies.org/format.html#words-tokens-and-empty-nodes
-
-            // TODO Get correct UD dep relation for relations inside the named entity
-            // and for the token that must be linked to the outside. For this one, the
-            // relation is the one which links to posGraphVertex to the rest of the pos
-            // graph.
-            auto [conllRelName, targetConllId] = getConllRelName(v);
-
-            vertexToToken[posVertex] = tokenId;
-            // std::cerr << "docFrom_analysis pushing token" << std::endl;
-            first = false;
-          }
-          previousNeType = neType;
+          auto posVertices = ctx.annotationData->matches("AnalysisGraph", vse, "PosGraph");
+          auto posVertex = *posVertices.begin();
+          // @TODO Should follow instructions here to output all MWE:
+          // https://universaldependencies.org/format.html#words-tokens-and-empty-nodes
+          ctx.setToken(posVertex, tokenId);
         }
+        ctx.previousNeType = neType;
       }
     }
     else
     {
-      vertexToToken[v] = tokenId;
+      ctx.setToken(v, tokenId);
       tokenId++;
     }
 
-    collectVertexDependencyInformations(v, analysis);
+    collectVertexDependencyInformations(ctx, v);
 
-    auto [it, it_end] = boost::out_edges(v, *posGraph);
+    auto [it, it_end] = boost::out_edges(v, *ctx.posGraph);
     if (it != it_end)
     {
-        v = boost::target(*it, *posGraph);
+        v = boost::target(*it, *ctx.posGraph);
     }
     else
     {
@@ -1023,47 +1601,61 @@ void LimaAnalyzerPrivate::collectDependencyInformations(std::shared_ptr<Lima::An
   }
 }
 
-void LimaAnalyzerPrivate::collectVertexDependencyInformations(LinguisticGraphVertex v,
-                                                              std::shared_ptr<Lima::AnalysisContent> analysis)
+void LimaAnalyzerPrivate::collectVertexDependencyInformations(ConversionContext& ctx,
+                                                              LinguisticGraphVertex v)
 {
-    auto dcurrent = syntacticData->depVertexForTokenVertex(v);
-    auto depGraph = syntacticData->dependencyGraph();
+    auto dcurrent = ctx.syntacticData->depVertexForTokenVertex(v);
+    auto depGraph = ctx.syntacticData->dependencyGraph();
     for (auto [dit, dit_end] = boost::out_edges(dcurrent, *depGraph); dit != dit_end; dit++)
     {
         auto typeMap = get(edge_deprel_type, *depGraph);
         auto type = typeMap[*dit];
-        auto syntRelName = languageData->getSyntacticRelationName(type);
-        auto dest = syntacticData->tokenVertexForDepVertex(
+        auto syntRelName = ctx.languageData->getSyntacticRelationName(type);
+        auto dest = ctx.syntacticData->tokenVertexForDepVertex(
           boost::target(*dit, *depGraph));
         if (syntRelName != "")
         {
-          vertexDependencyInformations.insert(std::make_pair(v, std::make_pair(dest, syntRelName)));
+          ctx.setDependency(v, dest, syntRelName);
         }
     }
 }
 
-Doc LimaAnalyzerPrivate::docFrom_analysis(std::shared_ptr< Lima::AnalysisContent > analysis)
+Doc LimaAnalyzerPrivate::docFrom_analysis(std::shared_ptr< Lima::AnalysisContent > analysis,
+                                          bool keepAnalysis)
 {
   // std::cerr << "docFrom_analysis" << std::endl;
-  reset();
+  auto ctx = std::make_shared<ConversionContext>();
+  ctx->conllLimaDepMapping = conllLimaDepMapping;
+  ctx->lazy = lazyTokens;
   auto metadataholder = std::dynamic_pointer_cast<LinguisticMetaData>(analysis->getData("LinguisticMetaData"));
   const auto& lang = metadataholder->getMetaData("Lang");
-  medId = MedData::single().media(lang);
-  languageData = static_cast<const LanguageData*>(&MedData::single().mediaData(medId));
-  propertyCodeManager = &languageData->getPropertyCodeManager();
-  propertyAccessor = &propertyCodeManager->getPropertyAccessor("MICRO");
-
-
+  ctx->medId = MedData::single().media(lang);
+  ctx->languageData = static_cast<const LanguageData*>(&MedData::single().mediaData(ctx->medId));
+  ctx->propertyCodeManager = &ctx->languageData->getPropertyCodeManager();
   // std::cerr << "docFrom_analysis get stringsPool" << std::endl;
+  ctx->strings = StringStore(lang);
+  ctx->microTags = microTagsOf(ctx->medId, ctx->strings);
+  if (ctx->microTags != nullptr)
+  {
+    ctx->propertyAccessor = ctx->microTags->accessor;
+  }
+  else
+  {
+    ctx->propertyAccessor = &ctx->propertyCodeManager->getPropertyAccessor("MICRO");
+  }
+  ctx->featuresCache = featuresCache(lang, ctx->strings);
+
   Doc doc;
   doc.m_d->language = lang;
+  doc.m_d->strings = ctx->strings;
   doc.m_d->analysis = analysis;
 
-  sp = &MedData::single().stringsPool(MedData::single().media(lang));
+  ctx->sp = &MedData::single().stringsPool(MedData::single().media(lang));
+  ctx->poolStrings = poolStrings(lang, ctx->medId, ctx->strings);
 
 
-  annotationData = std::dynamic_pointer_cast<AnnotationData>(analysis->getData("AnnotationData"));
-  if (annotationData == nullptr)
+  ctx->annotationData = std::dynamic_pointer_cast<AnnotationData>(analysis->getData("AnnotationData"));
+  if (ctx->annotationData == nullptr)
   {
     std::cerr << "Error: AnnotationData has not been produced: check pipeline";
     doc.m_d->error = true;
@@ -1089,9 +1681,9 @@ Doc LimaAnalyzerPrivate::docFrom_analysis(std::shared_ptr< Lima::AnalysisContent
     return doc;
   }
 
-  anaGraph = anaGraphData->getGraph();
-  posGraph = posGraphData->getGraph();
-  if (anaGraph == nullptr || posGraph == nullptr || annotationData == nullptr)
+  ctx->anaGraph = anaGraphData->getGraph();
+  ctx->posGraph = posGraphData->getGraph();
+  if (ctx->anaGraph == nullptr || ctx->posGraph == nullptr || ctx->annotationData == nullptr)
   {
     DUMPERLOGINIT;
     LERROR << "LimaAnalyzerPrivate::dumpPosGraphVertex missing data";
@@ -1099,15 +1691,15 @@ Doc LimaAnalyzerPrivate::docFrom_analysis(std::shared_ptr< Lima::AnalysisContent
     doc.m_d->errorMessage = "Error: missing data";
     return doc;
   }
-  collectDependencyInformations(analysis);
+  collectDependencyInformations(*ctx, analysis);
 
   auto firstVertex = posGraphData->firstVertex();
   auto lastVertex = posGraphData->lastVertex();
   auto v = firstVertex;
-  auto [it, it_end] = boost::out_edges(v, *posGraph);
+  auto [it, it_end] = boost::out_edges(v, *ctx->posGraph);
   if (it != it_end)
   {
-      v = boost::target(*it, *posGraph);
+      v = boost::target(*it, *ctx->posGraph);
   }
   else
   {
@@ -1116,20 +1708,20 @@ Doc LimaAnalyzerPrivate::docFrom_analysis(std::shared_ptr< Lima::AnalysisContent
   int sentenceNb = 0;
   LinguisticGraphVertex vEndDone = 0; // TODO remove. useless here. comes from LIMA ConllDumper
   auto tokenId = 0;
-  auto tokens = get(vertex_token, *posGraph);
-  auto morphoDatas = get(vertex_data, *posGraph);
+  auto tokens = get(vertex_token, *ctx->posGraph);
+  auto morphoDatas = get(vertex_data, *ctx->posGraph);
 
   // std::cerr << "docFrom_analysis before while" << std::endl;
   while (v != lastVertex)
   {
-    // std::cerr << "docFrom_analysis on vertex " << v << posGraph << std::endl;
+    // std::cerr << "docFrom_analysis on vertex " << v << ctx->posGraph << std::endl;
 
-    dumpPosGraphVertex(doc, v, tokenId, vEndDone, "", false);
+    dumpPosGraphVertex(*ctx, doc, v, tokenId, vEndDone, "", false);
 
-    auto [it, it_end] = boost::out_edges(v, *posGraph);
+    auto [it, it_end] = boost::out_edges(v, *ctx->posGraph);
     if (it != it_end)
     {
-        v = boost::target(*it, *posGraph);
+        v = boost::target(*it, *ctx->posGraph);
     }
     else
     {
@@ -1149,15 +1741,30 @@ Doc LimaAnalyzerPrivate::docFrom_analysis(std::shared_ptr< Lima::AnalysisContent
     {
       auto sentenceBegin = bound.getFirstVertex();
       auto sentenceEnd = bound.getLastVertex();
-      doc.m_d->sentences.push_back(Span(vertexToToken[sentenceBegin], vertexToToken[sentenceEnd]));
+      doc.m_d->sentences.push_back(Span(std::max(0, ctx->token(sentenceBegin)),
+                                        std::max(0, ctx->token(sentenceEnd))));
     }
   }
+  if (ctx->lazy)
+  {
+    doc.m_d->materializer = std::make_shared<LazyTokenMaterializer>(ctx, analysis);
+    doc.m_d->materialized.assign(doc.m_d->tokens.size(), false);
+  }
+  doc.tokenSentences();
+  doc.entities();
+  if (!ctx->lazy && !keepAnalysis)
+  {
+    // Only the original text is needed once the tokens are built
+    doc.m_d->text = doc.text();
+    doc.m_d->analysis = nullptr;
+  }
   // std::cerr << "docFrom_analysis before return" << std::endl;
   return doc;
 }
 
 
-int LimaAnalyzerPrivate::dumpPosGraphVertex(Doc& doc,
+int LimaAnalyzerPrivate::dumpPosGraphVertex(ConversionContext& ctx,
+                                            Doc& doc,
                                             LinguisticGraphVertex v,
                                             int& tokenId,
                                             LinguisticGraphVertex vEndDone,
@@ -1169,58 +1776,26 @@ int LimaAnalyzerPrivate::dumpPosGraphVertex(Doc& doc,
   DUMPERLOGINIT;
   LDEBUG << "LimaAnalyzerPrivate::dumpPosGraphVertex IN" << v;
 #endif
-  // vertexToToken.insert(std::make_pair(v, tokenId));
+  // ctx.vertexToToken.insert(std::make_pair(v, tokenId));
   bool notDone(true);
   if( v == vEndDone )
     notDone = false;
 
-  auto ft = get(vertex_token, *posGraph, v);
-  auto morphoData = get(vertex_data, *posGraph, v);
+  auto ft = get(vertex_token, *ctx.posGraph, v);
+  auto morphoData = get(vertex_data, *ctx.posGraph, v);
   if( morphoData != 0 && ft != 0
     && ((!morphoData->empty()) || ft->length() > 0) && notDone )
   {
 #ifdef DEBUG_LP
     LDEBUG << "LimaAnalyzerPrivate::dumpPosGraphVertex PosGraph nb different LinguisticCode"
           << morphoData->size();
-#endif
-    // std::cerr << "LimaAnalyzerPrivate::dumpPosGraphVertex PosGraph nb different LinguisticCode"
-    //       << morphoData->size() << std::endl;
-
-    auto micro = getMicro(*morphoData);
-#ifdef DEBUG_LP
-    LDEBUG << "LimaAnalyzerPrivate::dumpPosGraphVertex graphTag:" << micro;
-#endif
-    // std::cerr << "LimaAnalyzerPrivate::dumpPosGraphVertex graphTag:" << micro.toStdString() << std::endl;
-
-    auto feats = getFeats(*morphoData);
-#ifdef DEBUG_LP
-    LDEBUG << "LimaAnalyzerPrivate::dumpPosGraphVertex feats:" << feats;
-#endif
-    // std::cerr << "LimaAnalyzerPrivate::dumpPosGraphVertex feats:" << feats.toStdString() << std::endl;
-
-    auto inflectedToken = ft->stringForm().toStdString();
-    // std::cerr << "LimaAnalyzerPrivate::dumpPosGraphVertex inflectedToken:" << inflectedToken << std::endl;
-    if (inflectedToken.find_first_of("\r\n\t") != std::string::npos)
-      boost::find_format_all(inflectedToken,
-                              boost::token_finder(!boost::is_print()),
-                              character_escaper());
-
-    QString lemmatizedToken;
-    if (morphoData != nullptr && !morphoData->empty())
-    {
-      lemmatizedToken = (*sp)[(*morphoData)[0].lemma];
-    }
-
-
-#ifdef DEBUG_LP
     LDEBUG << "LimaAnalyzerPrivate::dumpPosGraphVertex conll id : " << tokenId
             << " Lima id : " << v;
 #endif
 
-    // std::cerr << "LimaAnalyzerPrivate::dumpPosGraphVertex lemmatizedToken:" << lemmatizedToken << std::endl;
     // @TODO Should follow instructions here to output all MWE:
     // https://universaldependencies.org/format.html#words-tokens-and-empty-nodes
-    QString neType = getNeType(v);
+    QString neType = getNeType(ctx, v);
     QString neIOB = "O";
     // std::cerr << "LimaAnalyzerPrivate::dumpPosGraphVertex neType:" << neType << std::endl;
     // Collect NE vertices and output them instead of a single line for
@@ -1231,7 +1806,7 @@ int LimaAnalyzerPrivate::dumpPosGraphVertex(Doc& doc,
     // Furthermore, named entities can be recursive...
     if (neType != "_")
     {
-      dumpNamedEntity(doc, v, tokenId, vEndDone, neType);
+      dumpNamedEntity(ctx, doc, v, tokenId, vEndDone, neType);
     }
     else
     {
@@ -1249,30 +1824,72 @@ int LimaAnalyzerPrivate::dumpPosGraphVertex(Doc& doc,
         neIOB = first?"B":"I";
       }
 
-      auto [conllRelName, targetConllId] = getConllRelName(v);
-      // if(!hasSpaceAfter(v, posGraph)) // TODO use hasSpaceAfter in Token
-      auto features = getFeats(*morphoData);
-
-      // std::cerr << "docFrom_analysis token/lemma are " << inflectedToken << "/" << lemmatizedToken << std::endl;
-
-      auto pos = ft->position();
-      auto len = ft->length();
-      auto tStatus = ft->status().defaultKey();
-
-      // std::cerr << "Token t: " << targetConllId << ", " << conllRelName.toStdString() << std::endl;
-      Token t(len, inflectedToken, lemmatizedToken.toStdString(),
-              tokenId++, pos, micro.toStdString(), targetConllId, conllRelName.toStdString(),
-              features.toStdString(), neIOB.toStdString(), neType.toStdString(), tStatus.toStdString());
-      // vertexToToken[v] = tokenId;
+      // if(!hasSpaceAfter(v, ctx.posGraph)) // TODO use hasSpaceAfter in Token
+      Token t;
+      t.i = tokenId++;
+      t.neIOB = ctx.id(neIOB);
+      t.neType = ctx.id(neType);
       // std::cerr << "docFrom_analysis pushing token" << std::endl;
-      doc.m_d->tokens.push_back(t);
-      previousNeType = neType;
+      pushToken(ctx, doc, t, ctx.posGraph, v);
+      ctx.previousNeType = neType;
     }
   }
   return SUCCESS_ID;
 }
 
-void LimaAnalyzerPrivate::dumpNamedEntity(Doc& doc,
+void LimaAnalyzerPrivate::fillToken(const ConversionContext& ctx,
+                                    Token& token,
+                                    LinguisticGraph* graph,
+                                    LinguisticGraphVertex v)
+{
+  auto ft = get(vertex_token, *graph, v);
+  auto morphoData = get(vertex_data, *graph, v);
+
+  // Pooled strings are converted once per language (see PoolStrings)
+  bool pooled = ctx.poolStrings != nullptr && ctx.poolStrings->strings() == ctx.strings;
+  auto [conllRelName, targetConllId] = getConllRelName(ctx, v);
+  // std::cerr << "Token t: " << targetConllId << ", " << conllRelName.toStdString() << std::endl;
+
+  token.len = ft->length();
+  token.text = pooled ? ctx.poolStrings->text(ft->form())
+                      : escapedTokenText(ft->stringForm());
+  if (morphoData->empty())
+  {
+    token.lemma = StringStore::emptyId;
+  }
+  else
+  {
+    auto lemma = (*morphoData)[0].lemma;
+    token.lemma = pooled ? ctx.poolStrings->id(lemma)
+                         : ctx.strings.add((*ctx.sp)[lemma].toStdString());
+  }
+  token.pos = ft->position();
+  token.tag = tagId(ctx, *morphoData);
+  token.head = targetConllId;
+  token.dep = ctx.id(conllRelName);
+  token.features = featuresId(ctx, *morphoData);
+  token.tStatus = ctx.id(ft->status().defaultKey());
+}
+
+void LimaAnalyzerPrivate::pushToken(ConversionContext& ctx,
+                                    Doc& doc,
+                                    Token& token,
+                                    LinguisticGraph* graph,
+                                    LinguisticGraphVertex v)
+{
+  if (ctx.lazy)
+  {
+    ctx.tokenVertices.emplace_back(graph, v);
+  }
+  else
+  {
+    fillToken(ctx, token, graph, v);
+  }
+  doc.m_d->tokens.push_back(token);
+}
+
+void LimaAnalyzerPrivate::dumpNamedEntity(ConversionContext& ctx,
+                                         Doc& doc,
                                          LinguisticGraphVertex v,
                                          int& tokenId,
                                          LinguisticGraphVertex vEndDone,
@@ -1289,73 +1906,54 @@ void LimaAnalyzerPrivate::dumpNamedEntity(Doc& doc,
   // Otherwise, will retrieve the pos graph tokens and recursively do the same.
   // For final tokens that are on pos graph, the category will be unique.
 
-  if (annotationData != nullptr)
+  if (ctx.annotationData != nullptr)
   {
+    // The entity table has been filled by collectDependencyInformations
+    auto entityInformation = entity(ctx, v);
     // Check if the PosGraph vertex holds a specific entity
-    auto matches = annotationData->matches("PosGraph", v, "annot");
-#ifdef DEBUG_LP
-    LDEBUG << "LimaAnalyzerPrivate::dumpNamedEntity matches PosGraph" << v;
-            // << "annot:" << matchesS(matches);
-#endif
-    for (const auto& vx: matches)
+    if (entityInformation.posGraphEntity != nullptr)
     {
-      if (annotationData->hasAnnotation(vx, QString::fromUtf8("SpecificEntity")))
+      ctx.previousNeType = "O";
+      bool first = true;
+      for (const auto& vse : entityInformation.posGraphEntity->vertices())
       {
-        auto se = annotationData->annotation(vx, QString::fromUtf8("SpecificEntity"))
-          .pointerValue<SpecificEntityAnnotation>();
-        previousNeType = "O";
-        bool first = true;
-        for (const auto& vse : se->vertices())
-        {
-          dumpPosGraphVertex(doc, vse, tokenId, vEndDone, neType, first);
-          first = false;
-        }
-#ifdef DEBUG_LP
-        LDEBUG << "LimaAnalyzerPrivate::dumpNamedEntity return after SpecificEntity annotation on PosGraph";
-#endif
-        return;
+        dumpPosGraphVertex(ctx, doc, vse, tokenId, vEndDone, neType, first);
+        first = false;
       }
-    }
-    auto anaVertices = annotationData->matches("PosGraph", v, "AnalysisGraph");
-#ifdef DEBUG_LP
-    LDEBUG << "LimaAnalyzerPrivate::dumpNamedEntity anaVertices for" << v;
-    // << ":" << matchesS(anaVertices);
-#endif
-
-    assert(anaVertices.size() == 1);
-    auto anaVertex = *anaVertices.begin();
 #ifdef DEBUG_LP
-    LDEBUG << "LimaAnalyzerPrivate::dumpNamedEntity anaVertex is" << anaVertex;
+      LDEBUG << "LimaAnalyzerPrivate::dumpNamedEntity return after SpecificEntity annotation on PosGraph";
 #endif
-    if (annotationData->hasAnnotation(anaVertex, QString::fromUtf8("SpecificEntity")))
+      return;
+    }
+    auto se = entityInformation.analysisGraphEntity;
+    if (se != nullptr)
     {
-      auto se = annotationData->annotation(anaVertex, QString::fromUtf8("SpecificEntity"))
-        .pointerValue<SpecificEntityAnnotation>();
 #ifdef DEBUG_LP
       LDEBUG << "LimaAnalyzerPrivate::dumpNamedEntity anaVertex se ("
-              << (*sp)[se->getString()]
+              << (*ctx.sp)[se->getString()]
               << ") annotation vertices are" << se->vertices()
-              << "and normalized form:" << (*sp)[se->getNormalizedForm()]
+              << "and normalized form:" << (*ctx.sp)[se->getNormalizedForm()]
                << "and features:" << se->getFeatures();
 #endif
       // All retrieved lines/tokens have the same netype. Depending on the
       // output style (CoNLL 2003, CoNLL-U, …), the generated line is different
       // and the ne-Type includes or not BIO information using in this case the
-      // previousNeType member.
-      previousNeType = "O";
+      // previousNeType member of the context.
+      ctx.previousNeType = "O";
       bool first = true;
       for (const auto& vse : se->vertices())
       {
-        dumpAnalysisGraphVertex(doc, vse, v, tokenId, vEndDone, neType, first, se->getFeatures());
+        dumpAnalysisGraphVertex(ctx, doc, vse, v, tokenId, vEndDone, neType, first, se->getFeatures());
         first = false;
       }
-      previousNeType = neType;
+      ctx.previousNeType = neType;
     }
   }
 }
 
 // TODO Split idiomatic alternative tokens and compound tokens
 int LimaAnalyzerPrivate::dumpAnalysisGraphVertex(
+  ConversionContext& ctx,
   Doc& doc,
   LinguisticGraphVertex v,
   LinguisticGraphVertex posGraphVertex,
@@ -1371,7 +1969,7 @@ int LimaAnalyzerPrivate::dumpAnalysisGraphVertex(
   DUMPERLOGINIT;
   LDEBUG << "LimaAnalyzerPrivate::dumpAnalysisGraphVertex" << v << posGraphVertex << neType;
 #endif
-  if (anaGraph == nullptr || posGraph == nullptr || annotationData == nullptr)
+  if (ctx.anaGraph == nullptr || ctx.posGraph == nullptr || ctx.annotationData == nullptr)
   {
     DUMPERLOGINIT;
     LERROR << "LimaAnalyzerPrivate::dumpAnalysisGraphVertex missing data";
@@ -1381,8 +1979,8 @@ int LimaAnalyzerPrivate::dumpAnalysisGraphVertex(
   if( v == vEndDone )
     notDone = false;
 
-  auto ft = get(vertex_token, *anaGraph, v);
-  auto morphoData = get(vertex_data, *anaGraph, v);
+  auto ft = get(vertex_token, *ctx.anaGraph, v);
+  auto morphoData = get(vertex_data, *ctx.anaGraph, v);
 #ifdef DEBUG_LP
   LDEBUG << "LimaAnalyzerPrivate::dumpAnalysisGraphVertex PosGraph token" << v;
 #endif
@@ -1392,28 +1990,6 @@ int LimaAnalyzerPrivate::dumpAnalysisGraphVertex(
     LDEBUG << "LimaAnalyzerPrivate::dumpAnalysisGraphVertex PosGraph nb different LinguisticCode"
           << morphoData->size();
 #endif
-
-    auto micro = getMicro(*morphoData);
-#ifdef DEBUG_LP
-    LDEBUG << "LimaAnalyzerPrivate::dumpAnalysisGraphVertex micro:" << micro;
-#endif
-
-    auto feats = getFeats(*morphoData);
-#ifdef DEBUG_LP
-    LDEBUG << "LimaAnalyzerPrivate::dumpAnalysisGraphVertex feats:" << feats;
-#endif
-
-    auto inflectedToken = ft->stringForm().toStdString();
-    if (inflectedToken.find_first_of("\r\n\t") != std::string::npos)
-      boost::find_format_all(inflectedToken,
-                             boost::token_finder(!boost::is_print()),
-                             character_escaper());
-
-    QString lemmatizedToken;
-    if (morphoData != 0 && !morphoData->empty())
-    {
-      lemmatizedToken = (*sp)[(*morphoData)[0].lemma];
-    }
     // @TODO Should follow instructions here to output all MWE:
     // https://universaldependencies.org/format.html#words-tokens-and-empty-nodes
 
@@ -1422,92 +1998,107 @@ int LimaAnalyzerPrivate::dumpAnalysisGraphVertex(
     // relation is the one which links to posGraphVertex to the rest of the pos
     // graph.
     QString neIOB = first?"B-":"I-";
-    auto pos = ft->position();
-    auto len = ft->length();
-    auto tStatus = ft->status().defaultKey();
-    auto features = getFeats(*morphoData);
-    auto [conllRelName, targetConllId] = getConllRelName(v);
-    // std::cerr << "Token t: " << targetConllId << ", " << conllRelName.toStdString() << std::endl;
-    Token t(len, inflectedToken, lemmatizedToken.toStdString(), tokenId++, pos,
-            micro.toStdString(), targetConllId, conllRelName.toStdString(), features.toStdString(),
-            neIOB.toStdString(), neType.toStdString(), tStatus.toStdString());
-
-    // vertexToToken[v] = tokenId;
+    Token t;
+    t.i = tokenId++;
+    t.neIOB = ctx.id(neIOB);
+    t.neType = ctx.id(neType);
     // std::cerr << "docFrom_analysis pushing token" << std::endl;
-    doc.m_d->tokens.push_back(t);
+    pushToken(ctx, doc, t, ctx.anaGraph, v);
   }
   return SUCCESS_ID;
 }
 
-QString LimaAnalyzerPrivate::getNeType(LinguisticGraphVertex posGraphVertex)
+ConversionContext::EntityInformation LimaAnalyzerPrivate::entity(
+  ConversionContext& ctx,
+  LinguisticGraphVertex posGraphVertex)
 {
-  // std::cerr << "LimaAnalyzerPrivate::getNeType "<< posGraphVertex << std::endl;
-  auto neType = QString::fromUtf8("_") ;
-  if (annotationData != nullptr)
+  ctx.reserveVertices(posGraphVertex + 1);
+  if (ctx.vertexEntities[posGraphVertex].known)
+  {
+    return ctx.vertexEntities[posGraphVertex];
+  }
+  // std::cerr << "LimaAnalyzerPrivate::entity "<< posGraphVertex << std::endl;
+  ConversionContext::EntityInformation information;
+  information.known = true;
+  if (ctx.annotationData != nullptr)
   {
     // Check if the PosGraph vertex holds a specific entity
-    // std::cerr << "LimaAnalyzerPrivate::getNeType call matches with " << "PosGraph"
-    //     << " and " << posGraphVertex << std::endl;
-    auto matches = annotationData->matches("PosGraph", posGraphVertex, "annot");
-    // std::cerr << "LimaAnalyzerPrivate::getNeType got" << matches.size() << " matches" << std::endl;
+    auto matches = ctx.annotationData->matches("PosGraph", posGraphVertex, "annot");
+    information.hasAnnotMatches = !matches.empty();
     for (const auto& vx: matches)
     {
-      // std::cerr << "LimaAnalyzerPrivate::getNeType on match " << vx << std::endl;
-      if (annotationData->hasAnnotation(vx, QString::fromUtf8("SpecificEntity")))
+      if (ctx.annotationData->hasAnnotation(vx, QString::fromUtf8("SpecificEntity")))
       {
-        auto se = annotationData->annotation(vx, QString::fromUtf8("SpecificEntity")).
+        auto se = ctx.annotationData->annotation(vx, QString::fromUtf8("SpecificEntity")).
           pointerValue<SpecificEntityAnnotation>();
-        neType = MedData::single().getEntityName(se->getType());
+        information.neType = MedData::single().getEntityName(se->getType());
+        information.posGraphEntity = se;
         break;
       }
     }
-    if (neType == "_")
+    // note: anaVertices size should be 0 or 1
+    auto anaVertices = ctx.annotationData->matches("PosGraph", posGraphVertex, "AnalysisGraph");
+    if (information.neType == "_")
     {
       // The PosGraph vertex did not hold a specific entity,
       // check if the AnalysisGraph vertex does
-      // std::cerr << "LimaAnalyzerPrivate::getNeType checking AnalysisGraph" << std::endl;
-      auto anaVertices = annotationData->matches("PosGraph", posGraphVertex, "AnalysisGraph");
-      // note: anaVertices size should be 0 or 1
       for (const auto& anaVertex: anaVertices)
       {
-        // std::cerr << "LimaAnalyzerPrivate::getNeType on AnalysisGraph vertex " << anaVertex << std::endl;
-        auto matches = annotationData->matches("AnalysisGraph", anaVertex, "annot");
-        for (const auto& vx: matches)
+        auto anaMatches = ctx.annotationData->matches("AnalysisGraph", anaVertex, "annot");
+        for (const auto& vx: anaMatches)
         {
-          // std::cerr << "LimaAnalyzerPrivate::getNeType on ana match " << vx << std::endl;
-          if (annotationData->hasAnnotation(vx, QString::fromUtf8("SpecificEntity")))
+          if (ctx.annotationData->hasAnnotation(vx, QString::fromUtf8("SpecificEntity")))
           {
-            auto se = annotationData->annotation(vx, QString::fromUtf8("SpecificEntity"))
+            auto se = ctx.annotationData->annotation(vx, QString::fromUtf8("SpecificEntity"))
                 .pointerValue<SpecificEntityAnnotation>();
-            neType = MedData::single().getEntityName(se->getType());
+            information.neType = MedData::single().getEntityName(se->getType());
             break;
           }
         }
-        if (neType != "_") break;
+        if (information.neType != "_") break;
+      }
+    }
+    if (information.neType != "_" && !anaVertices.empty())
+    {
+      auto anaVertex = *anaVertices.begin();
+      if (ctx.annotationData->hasAnnotation(anaVertex, QString::fromUtf8("SpecificEntity")))
+      {
+        information.analysisGraphEntity = ctx.annotationData->annotation(
+          anaVertex, QString::fromUtf8("SpecificEntity")).pointerValue<SpecificEntityAnnotation>();
       }
     }
   }
-  // std::cerr << "LimaAnalyzerPrivate::getNeType for " << posGraphVertex << ". result = " << neType << std::endl;
-  return neType;
+  // std::cerr << "LimaAnalyzerPrivate::entity for " << posGraphVertex << ". neType = " << information.neType << std::endl;
+  ctx.vertexEntities[posGraphVertex] = information;
+  return information;
 }
 
-std::pair<QString, int> LimaAnalyzerPrivate::getConllRelName(LinguisticGraphVertex v)
+QString LimaAnalyzerPrivate::getNeType(ConversionContext& ctx,
+                                       LinguisticGraphVertex posGraphVertex)
+{
+  return entity(ctx, posGraphVertex).neType;
+}
+
+std::pair<QString, int> LimaAnalyzerPrivate::getConllRelName(const ConversionContext& ctx,
+                                                             LinguisticGraphVertex v)
 {
 #ifdef DEBUG_LP
   DUMPERLOGINIT;
-  LDEBUG << "LimaAnalyzerPrivate::getConllRelName" << v << vertexDependencyInformations.count(v);
+  LDEBUG << "LimaAnalyzerPrivate::getConllRelName" << v << (ctx.dependency(v) != nullptr);
 #endif
   QString conllRelName = "_";
   int targetConllId = 0;
-  if (vertexDependencyInformations.count(v) != 0)
+  auto dependency = ctx.dependency(v);
+  if (dependency != nullptr)
   {
-    auto target = vertexDependencyInformations.find(v)->second.first;
+    auto target = dependency->target;
 #ifdef DEBUG_LP
     LDEBUG << "LimaAnalyzerPrivate::getConllRelName target saved for" << v << "is" << target;
 #endif
-    if (vertexToToken.find(target) != vertexToToken.end())
+    auto targetToken = ctx.token(target);
+    if (targetToken >= 0)
     {
-      targetConllId =  vertexToToken.find(target)->second;
+      targetConllId = targetToken;
     }
     else
     {
@@ -1517,13 +2108,13 @@ std::pair<QString, int> LimaAnalyzerPrivate::getConllRelName(LinguisticGraphVert
 #ifdef DEBUG_LP
     LDEBUG << "LimaAnalyzerPrivate::getConllRelName conll target saved for " << v << " is " << targetConllId;
 #endif
-    auto relName = QString::fromStdString(vertexDependencyInformations.find(v)->second.second);
+    auto relName = QString::fromStdString(dependency->relation);
 #ifdef DEBUG_LP
     LDEBUG << "LimaAnalyzerPrivate::getConllRelName the lima dependency tag for " << v << " is " << relName;
 #endif
-    if (conllLimaDepMapping.contains(relName))
+    if (ctx.conllLimaDepMapping.contains(relName))
     {
-      conllRelName = conllLimaDepMapping[relName];
+      conllRelName = ctx.conllLimaDepMapping.value(relName);
     }
     else
     {
@@ -1550,16 +2141,16 @@ std::pair<QString, int> LimaAnalyzerPrivate::getConllRelName(LinguisticGraphVert
 }
 
 const SpecificEntityAnnotation* LimaAnalyzerPrivate::getSpecificEntityAnnotation(
-  LinguisticGraphVertex v) const
+  const ConversionContext& ctx, LinguisticGraphVertex v) const
 {
   // check only entity found in current graph (not previous graph such as AnalysisGraph)
 
-  for (const auto& vx: annotationData->matches("PosGraph", v, "annot"))
+  for (const auto& vx: ctx.annotationData->matches("PosGraph", v, "annot"))
   {
-    if (annotationData->hasAnnotation(vx, QString::fromUtf8("SpecificEntity")))
+    if (ctx.annotationData->hasAnnotation(vx, QString::fromUtf8("SpecificEntity")))
     {
-      //BoWToken* se = createSpecificEntity(v,*it, annotationData, anagraph, posgraph, offsetBegin);
-      auto se = annotationData->annotation(
+      //BoWToken* se = createSpecificEntity(v,*it, ctx.annotationData, anagraph, posgraph, offsetBegin);
+      auto se = ctx.annotationData->annotation(
         vx,
         QString::fromUtf8("SpecificEntity")).pointerValue<SpecificEntityAnnotation>();
       if (se != nullptr)
@@ -1591,13 +2182,17 @@ bool LimaAnalyzerPrivate::hasSpaceAfter(LinguisticGraphVertex v, LinguisticGraph
   return SpaceAfter;
 }
 
-QString LimaAnalyzerPrivate::getMicro(LinguisticAnalysisStructure::MorphoSyntacticData& morphoData)
+std::string LimaAnalyzerPrivate::getMicro(
+  const ConversionContext& ctx,
+  const LinguisticAnalysisStructure::MorphoSyntacticData& morphoData)
 {
-  return QString::fromUtf8(static_cast<const LangData&>(
-      MedData::single().mediaData(medId)).getPropertyCodeManager()
-        .getPropertyManager("MICRO")
-        .getPropertySymbolicValue(morphoData.firstValue(
-          *propertyAccessor)).c_str());
+  auto code = morphoData.firstValue(*ctx.propertyAccessor);
+  if (ctx.microTags != nullptr)
+  {
+    return ctx.microTags->tag(code);
+  }
+  return ctx.propertyCodeManager->getPropertyManager("MICRO")
+    .getPropertySymbolicValue(code);
 }
 
 std::map<std::string, std::string> LimaAnalyzerPrivate::parseMetaData(
@@ -59,6 +59,7 @@
 #include "macros.h"
 #include "Doc.h"
 
+#include <map>
 #include <memory>
 #include <string>
 #include <vector>
@@ -80,20 +81,47 @@ public:
   LimaAnalyzer(const LimaAnalyzer& a) ;
   LimaAnalyzer& operator=(const LimaAnalyzer& a) ;
 
+  /** Analysis methods. meta values are added to or override the metadata given
+   * to the constructor for this analysis only. */
   std::string analyzeText(const std::string& text,
                           const std::string& lang="",
                           const std::string& pipeline="",
-                          const std::string& meta="") const;
+                          const std::map<std::string, std::string>& meta=std::map<std::string, std::string>()) const;
+  /** An analysis error only marks the returned Doc (see Doc::error) and does not
+   * invalidate the analyzer, which can be shared by concurrent analyses */
   Doc operator()(
     const std::string& text,
                  const std::string& lang="",
                  const std::string& pipeline="",
-                 const std::string& meta="");
+                 const std::map<std::string, std::string>& meta=std::map<std::string, std::string>());
+
+  /** Analyze all the texts with the same parameters, in order. An analysis
+   * error only marks the Doc of the failing text (see Doc::error) and does not
+   * invalidate the analyzer. The documents do not retain their analysis content
+   * unless they are lazy (see setKeepAnalysis). */
+  std::vector<Doc> analyzeBatch(
+    const std::vector<std::string>& texts,
+    const std::string& lang="",
+    const std::string& pipeline="",
+    const std::map<std::string, std::string>& meta=std::map<std::string, std::string>());
 
   bool addPipelineUnit(const std::string& pipeline,
                        const std::string& media,
                        const std::string& jsonGroupString);
 
+  /** If lazy is true, the fields of the tokens of the documents produced by the
+   * next analyses are computed only when each token is first read (see Doc::at).
+   * The documents then retain the analysis data until they are destroyed. */
+  void setLazyTokens(bool lazy);
+  bool lazyTokens() const;
+
+  /** If keep is false, the documents produced by the next single analyses (see
+   * operator()) copy their original text and release the analysis content as
+   * soon as they are built, instead of retaining it until they are destroyed.
+   * Lazy documents always retain it. Defaults to true. */
+  void setKeepAnalysis(bool keep);
+  bool keepAnalysis() const;
+
   /** return true if an error occured */
   bool error();
   /** return the error message if an error occured and reset the error state */
@@ -72,6 +72,10 @@ setup(
         'tqdm',
         'unix_ar',
         ],
+    extras_require={
+        'arrays': ['numpy'],
+        'arrow': ['numpy', 'pyarrow'],
+    },
     include_package_data=True,
 
     # A dictionary mapping package names to lists of glob patterns. For a complete description and examples, see the setuptools documentation section on Including Data Files. You do not need to use this option if you are using include_package_data, unless you need to add e.g. files that are generated by your setup script and build process. (And are therefore not in source control or are files that you don’t want to include in your source distribution.)
@@ -3,10 +3,18 @@
 #
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import aymara.lima
+import codecs
+import concurrent.futures
+import gc
+import io
 import json
+import pickle
 import pytest
 import sys
+import tempfile
+import weakref
 from pathlib import Path
 
 
@@ -186,6 +194,467 @@ def test_functor():
     assert doc is not None and type(doc) == aymara.lima.Doc
 
 
+def test_lazy_tokens():
+    print(f"test_lazy_tokens", file=sys.stderr)
+    lazy = aymara.lima.Lima("ud-eng", pipes="deepud", meta=UD_ENG_META,
+                            lazy_tokens=True)
+    lazy_doc = lazy(text)
+    assert len(lazy_doc) == len(doc)
+    assert lazy_doc[3].lemma == doc[3].lemma
+    assert repr(lazy_doc) == repr(doc)
+    assert repr(pickle.loads(pickle.dumps(lazy_doc))) == repr(doc)
+    # Workers are built with the same options, their documents come back as tokens
+    assert lazy._worker_options == {"lazy_tokens": True, "keep_analysis": True}
+    worker_docs = list(lazy.pipe([text], n_process=2))
+    assert repr(worker_docs[0]) == repr(doc)
+    assert not worker_docs[0].retains_analysis
+
+
+def test_pipe():
+    print(f"test_pipe", file=sys.stderr)
+    texts = [text, "John Doe lives in New York.", text]
+    docs = list(lima.pipe(texts, batch_size=2))
+    assert len(docs) == 3
+    assert [str(d) for d in docs] == texts
+    assert len(docs[0]) == 7
+
+
+def test_pipe_with_lang():
+    print(f"test_pipe_with_lang", file=sys.stderr)
+    nlp = aymara.lima.Lima("eng,fre", pipes="main")
+    calls = []
+    analyze_batch = nlp._analyze_batch
+
+    def recording_analyze_batch(texts, lang, pipeline, meta):
+        calls.append((lang, pipeline, list(texts)))
+        return analyze_batch(texts, lang, pipeline, meta)
+
+    nlp._analyze_batch = recording_analyze_batch
+    english = "John Doe lives in New York."
+    french = "Et maintenant, du français."
+    records = [((text, "eng"), 1), ((french, "fre"), 2), ((english, None), 3),
+               ((french, "fre"), 4)]
+    results = list(nlp.pipe(records, as_tuples=True, with_lang=True))
+    assert [context for _, context in results] == [1, 2, 3, 4]
+    assert [str(d) for d, _ in results] == [t for (t, _), _ in records]
+    assert results[0][0].lang == results[2][0].lang != results[1][0].lang
+    # The texts of each language of the batch are analyzed in a single call
+    assert calls == [("eng", "main", [text, english]),
+                     ("fre", "main", [french, french])]
+    stats = nlp.pipe_stats
+    assert sorted(stats) == ["eng", "fre"]
+    assert stats["eng"]["texts"] == 2
+    assert stats["eng"]["chars"] == len(text) + len(english)
+    assert stats["fre"]["texts"] == 2
+    assert stats["fre"]["chars"] == 2 * len(french)
+    with pytest.raises(TypeError):
+        list(nlp.pipe([(text, 1)], with_lang=True))
+
+
+def test_pipe_errors():
+    print(f"test_pipe_errors", file=sys.stderr)
+    # "wol" is not initialized: only the analysis of this text fails
+    records = [((text, None), 0), (("Bad language.", "wol"), 1),
+               (("This is a text.", None), 2)]
+    results = list(lima.pipe(records, as_tuples=True, with_lang=True,
+                             errors="skip"))
+    assert [context for _, context in results] == [0, 2]
+    assert [str(d) for d, _ in results] == [text, "This is a text."]
+    contexts = []
+    with pytest.raises(aymara.lima.LimaInternalError) as excinfo:
+        for _, context in lima.pipe(records, as_tuples=True, with_lang=True):
+            contexts.append(context)
+    assert contexts == [0]
+    assert "text 1 (context 1)" in str(excinfo.value)
+    assert not excinfo.value.analyzer_invalid
+    with pytest.raises(ValueError):
+        list(lima.pipe([text], errors="ignore"))
+
+
+def test_chunk_size():
+    print(f"test_chunk_size", file=sys.stderr)
+    long_text = "\n\n".join([text, "John Doe lives in New York.", text])
+    whole = lima(long_text)
+    chunked = lima(long_text, chunk_size=30)
+    assert str(chunked) == long_text
+    assert len(chunked) == len(whole)
+    assert len(list(chunked.sents)) == len(list(whole.sents))
+    assert [t.idx for t in chunked] == [t.idx for t in whole]
+    assert [t.head for t in chunked] == [t.head for t in whole]
+    assert all(long_text[t.idx:t.idx+len(t)] == t.text for t in chunked)
+    assert repr(lima(text, chunk_size=1000)) == repr(doc)
+    with pytest.raises(ValueError):
+        lima(text, chunk_size=0)
+    # Chunks end at paragraph breaks, not at sentence punctuation
+    paragraphs = "Mr. Best joined the U.S. Army.\n\nHe left. She stayed."
+    assert [chunk for _, chunk in aymara.lima._split_chunks(paragraphs, 40)] == [
+        "Mr. Best joined the U.S. Army.\n\n", "He left. She stayed."]
+
+
+def test_analyzeBatch():
+    print(f"test_analyzeBatch", file=sys.stderr)
+    texts = [text, "John Doe lives in New York."]
+    lima_docs = lima.analyzer.analyzeBatch(texts, lang="ud-eng", pipeline="deepud",
+                                           meta=UD_ENG_META)
+    assert len(lima_docs) == 2
+    assert not any(d.error() for d in lima_docs)
+    assert repr(aymara.lima.Doc(lima_docs[0])) == repr(doc)
+    assert not lima.analyzer.error()
+
+
+def test_pipe_as_tuples():
+    print(f"test_pipe_as_tuples", file=sys.stderr)
+    records = [(text, 1), ("John Doe lives in New York.", 2)]
+    results = list(lima.pipe(records, as_tuples=True))
+    assert [context for _, context in results] == [1, 2]
+    assert [str(d) for d, _ in results] == [t for t, _ in records]
+
+
+def test_pipe_wrong_args():
+    print(f"test_pipe_wrong_args", file=sys.stderr)
+    with pytest.raises(TypeError):
+        list(lima.pipe([text, dict()]))
+    with pytest.raises(TypeError):
+        list(lima.pipe([text], meta="wrong metadata"))
+    with pytest.raises(ValueError):
+        list(lima.pipe([text], batch_size=0))
+    with pytest.raises(ValueError):
+        list(lima.pipe([text], n_process=0))
+
+
+def test_pipe_n_process():
+    print(f"test_pipe_n_process", file=sys.stderr)
+    texts = [text, "John Doe lives in New York.", text, "This is a text."]
+    records = list(zip(texts, range(len(texts))))
+    results = list(lima.pipe(records, batch_size=1, as_tuples=True, n_process=2))
+    assert [context for _, context in results] == list(range(len(texts)))
+    assert [str(d) for d, _ in results] == texts
+    assert repr(results[0][0]) == repr(doc)
+
+
+def test_threads():
+    print(f"test_threads", file=sys.stderr)
+    texts = [text, "John Doe lives in New York.", "This is a text."] * 4
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        docs = list(executor.map(lima, texts))
+    assert [str(d) for d in docs] == texts
+    assert repr(docs[0]) == repr(doc)
+
+
+def test_threads_with_errors():
+    print(f"test_threads_with_errors", file=sys.stderr)
+    # A failing analysis does not make the concurrent ones on the same analyzer fail
+    pipelines = ["deepud", "other"] * 6
+
+    def analyze(pipeline):
+        try:
+            return str(lima(text, pipeline=pipeline))
+        except aymara.lima.LimaInternalError:
+            return None
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(analyze, pipelines))
+    assert results == [text if p == "deepud" else None for p in pipelines]
+    assert not lima.analyzer.error()
+    assert str(lima(text)) == text
+
+
+def test_profile():
+    print(f"test_profile", file=sys.stderr)
+    profile = lima.profile(meta=UD_ENG_META)
+    assert profile.lang == "ud-eng"
+    assert profile.pipeline == "deepud"
+    assert repr(profile(text)) == repr(doc)
+    with pytest.raises(TypeError):
+        profile(dict())
+    with pytest.raises(TypeError):
+        lima.profile(meta="wrong metadata")
+
+
+def test_acall():
+    print(f"test_acall", file=sys.stderr)
+    adoc = asyncio.run(lima.acall(text))
+    assert repr(adoc) == repr(doc)
+    with pytest.raises(TypeError):
+        asyncio.run(lima.acall(dict()))
+
+
+def test_apipe():
+    print(f"test_apipe", file=sys.stderr)
+    texts = [text, "John Doe lives in New York.", "This is a text."] * 3
+
+    async def records():
+        for i, t in enumerate(texts):
+            await asyncio.sleep(0)
+            yield t, i
+
+    async def collect():
+        return [r async for r in lima.apipe(records(), as_tuples=True,
+                                            max_pending=2)]
+
+    results = asyncio.run(collect())
+    assert [context for _, context in results] == list(range(len(texts)))
+    assert [str(d) for d, _ in results] == texts
+
+
+def test_pool():
+    print(f"test_pool", file=sys.stderr)
+    pool = aymara.lima.LimaPool(size=2, langs="ud-eng", pipes="deepud",
+                                meta=UD_ENG_META)
+    assert len(pool) == 2
+    texts = [text, "John Doe lives in New York.", "This is a text."] * 2
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        docs = list(executor.map(pool.analyze, texts))
+    assert [str(d) for d in docs] == texts
+    assert pool.stats["checkouts"] == len(texts)
+    assert pool.stats["available"] == 2
+    with pool.checkout() as nlp1, pool.checkout() as nlp2:
+        assert nlp1 is not nlp2
+        with pytest.raises(TimeoutError) as excinfo:
+            with pool.checkout(timeout=0.01):
+                pass
+        assert excinfo.value.__suppress_context__
+    # An unknown pipeline is an error of the document: the analyzer is kept
+    with pytest.raises(aymara.lima.LimaInternalError) as excinfo:
+        pool.analyze(text, pipeline="other")
+    assert not excinfo.value.analyzer_invalid
+    assert pool.stats["replaced"] == 0
+    assert pool.stats["available"] == 2
+    assert str(pool.analyze(text)) == text
+    # An analyzer left in the error state is replaced once the pool is drained
+    with pool.checkout() as nlp:
+        broken = nlp
+        # Calling the binding directly leaves the sticky error state set
+        nlp.analyzer.analyzeText(text, lang="ud-eng", pipeline="other", meta={})
+        assert nlp.analyzer.error()
+    assert pool.stats["replaced"] == 1
+    assert pool.stats["available"] == 2
+    with pool.checkout() as nlp1, pool.checkout() as nlp2:
+        assert broken is not nlp1 and broken is not nlp2
+        assert str(nlp1(text)) == text
+    # A thread holding another analyzer cannot drain the pool: the error is reset
+    with pool.checkout() as nlp1:
+        with pytest.warns(RuntimeWarning), pool.checkout() as nlp2:
+            nlp2.analyzer.analyzeText(text, lang="ud-eng", pipeline="other",
+                                      meta={})
+        with pool.checkout(timeout=0) as nlp3:
+            assert nlp3 is nlp2
+            assert not nlp3.analyzer.error()
+    assert pool.stats["replaced"] == 1
+    assert pool.stats["reset"] == 1
+    assert pool.stats["available"] == 2
+
+
+def test_cache(tmp_path, monkeypatch):
+    print(f"test_cache", file=sys.stderr)
+    cached = aymara.lima.Lima("ud-eng", pipes="deepud", meta=UD_ENG_META,
+                              cache_size=1, cache_dir=str(tmp_path))
+    other = "John Doe lives in New York."
+    assert repr(cached(text)) == repr(doc)
+    assert repr(cached(text)) == repr(doc)
+    assert cached.cache_stats["hits"] == 1
+    assert cached.cache_stats["misses"] == 1
+    cached(other)
+    assert cached.cache_stats["evictions"] == 1
+    assert cached.cache_stats["entries"] == 1
+    assert repr(cached(text)) == repr(doc)
+    assert cached.cache_stats["disk_hits"] == 1
+    docs = list(cached.pipe([text, other, "This is a text."]))
+    assert [str(d) for d in docs] == [text, other, "This is a text."]
+    # Worker processes do not have the cache: the parent process looks it up
+    hits = cached.cache_stats["hits"] + cached.cache_stats["disk_hits"]
+    docs = list(cached.pipe([text, other], batch_size=1, n_process=2))
+    assert [str(d) for d in docs] == [text, other]
+    assert cached.cache_stats["hits"] + cached.cache_stats["disk_hits"] == hits + 2
+    cached.clear_cache()
+    assert cached.cache_stats["entries"] == 0
+    assert lima.cache_stats == {}
+    # Results are stored as JSON, not as pickles which could run code when read
+    stored = list(tmp_path.glob("*/*"))
+    assert stored and all(path.suffix == ".json" for path in stored)
+    # Analyzers built with different parameters have different keys
+    args = ("ud-eng", "deepud", "", "", UD_ENG_META)
+    keys = {aymara.lima._DocCache(analyzer_args=a).key(text, "ud-eng", "deepud", {})
+            for a in (args, args[:4] + ({},), ("ud-fra",) + args[1:],
+                      args[:2] + ("/config",) + args[3:])}
+    assert len(keys) == 4
+    # Keys change with the aymara version and the installed resources
+    resources = tmp_path / "resources"
+    resources.mkdir()
+    (resources / "a.txt").write_text("a")
+    args = args[:3] + (str(resources),) + args[4:]
+    key = aymara.lima._DocCache(analyzer_args=args).key(text, "ud-eng", "deepud", {})
+    (resources / "b.txt").write_text("b")
+    assert aymara.lima._DocCache(analyzer_args=args).key(
+        text, "ud-eng", "deepud", {}) != key
+    key = aymara.lima._DocCache(analyzer_args=args).key(text, "ud-eng", "deepud", {})
+    monkeypatch.setattr(aymara.lima, "__version__", "0.0.0")
+    assert aymara.lima._DocCache(analyzer_args=args).key(
+        text, "ud-eng", "deepud", {}) != key
+
+
+def test_cache_lazy(tmp_path):
+    print(f"test_cache_lazy", file=sys.stderr)
+    lazy = aymara.lima.Lima("ud-eng", pipes="deepud", meta=UD_ENG_META,
+                            lazy_tokens=True, cache_size=2, cache_dir=str(tmp_path))
+    # Lazy documents are not stored, which would compute all their tokens
+    assert repr(lazy(text)) == repr(doc)
+    assert repr(lazy(text)) == repr(doc)
+    assert lazy.cache_stats["misses"] == 2
+    assert lazy.cache_stats["entries"] == 0
+    assert not list(tmp_path.glob("*/*"))
+    # but documents stored by an analyzer without lazy tokens are read
+    cached = aymara.lima.Lima("ud-eng", pipes="deepud", meta=UD_ENG_META,
+                              cache_dir=str(tmp_path))
+    cached(text)
+    assert repr(lazy(text)) == repr(doc)
+    assert lazy.cache_stats["disk_hits"] == 1
+
+
+def test_doc_pickle():
+    print(f"test_doc_pickle", file=sys.stderr)
+    other = pickle.loads(pickle.dumps(doc))
+    assert str(other) == str(doc)
+    assert other.lang == doc.lang
+    assert repr(other) == repr(doc)
+
+
+def test_string_store():
+    print(f"test_string_store", file=sys.stderr)
+    strings = doc.strings
+    assert strings.lang == doc.lang
+    assert strings[doc[0].token.lemma] == doc[0].lemma
+    assert strings[strings.add("root")] == "root"
+    # Documents of the same language share their store
+    assert lima("He pleaded.").strings is strings
+    assert doc[0].pos is lima("Give up.")[0].pos
+
+
+def test_string_store_reset():
+    print(f"test_string_store_reset", file=sys.stderr)
+    strings = doc.strings
+    strings.add("A string of the previous store")
+    assert lima.string_stats == {"ud-eng": len(strings)}
+    aymara.lima.StringStore.reset("ud-eng")
+    # Only the reserved strings are left in the new store
+    assert lima.string_stats == {"ud-eng": 4}
+    other = lima(text)
+    assert other.strings is not strings
+    assert other.strings is lima("He pleaded.").strings
+    assert repr(other) == repr(doc)
+    # Existing documents keep the previous store
+    assert doc.strings is strings
+    assert strings[doc[0].token.lemma] == doc[0].lemma
+    assert [repr(d) for d in lima.pipe([text])] == [repr(doc)]
+
+
+def test_keep_analysis():
+    print(f"test_keep_analysis", file=sys.stderr)
+    assert doc.retains_analysis
+    light = aymara.lima.Lima("ud-eng", pipes="deepud", meta=UD_ENG_META,
+                             keep_analysis=False)
+    light_doc = light(text)
+    assert not light_doc.retains_analysis
+    assert str(light_doc) == text
+    assert repr(light_doc) == repr(doc)
+    assert light_doc.retained_bytes < doc.retained_bytes
+    assert not any(d.retains_analysis for d in lima.pipe([text, text]))
+
+
+def test_to_array():
+    print(f"test_to_array", file=sys.stderr)
+    numpy = pytest.importorskip("numpy")
+    array = doc.to_array(["LEMMA", "POS", "HEAD", "DEP", "IDX", "LEN", "ENT_IOB",
+                          "ENT_TYPE"])
+    assert array.shape == (len(doc), 8)
+    assert array.dtype == numpy.int32
+    for token, row in zip(doc, array):
+        assert doc.strings[row[0]] == token.lemma
+        assert doc.strings[row[1]] == token.pos
+        assert row[2] == token.head
+        assert doc.strings[row[3]] == token.dep
+        assert row[4] == token.idx
+        assert row[5] == len(token)
+        assert doc.strings[row[6]] == token.ent_iob
+        assert doc.strings[row[7]] == token.ent_type
+    assert list(doc.to_array("idx")) == list(array[:, 4])
+    assert list(doc.heads) == list(array[:, 2])
+    assert list(doc.offsets) == [token.idx for token in doc]
+    assert not doc.offsets.flags.writeable
+    with pytest.raises(ValueError):
+        doc.to_array(["LEMMA", "NOT_AN_ATTRIBUTE"])
+
+
+def test_to_arrow():
+    print(f"test_to_arrow", file=sys.stderr)
+    pytest.importorskip("pyarrow")
+    table = doc.to_arrow()
+    assert table.num_rows == len(doc)
+    assert table.column("head").to_pylist() == [token.head for token in doc]
+    assert table.column("idx").to_pylist() == [token.idx for token in doc]
+    assert table.column("lemma").to_pylist() == [token.lemma for token in doc]
+    assert table.column("ent_type").to_pylist() == [token.ent_type for token in doc]
+    docs = [doc, lima("He pleaded.")]
+    batch = aymara.lima.docs_to_arrow(docs)
+    assert batch.num_rows == len(docs[0]) + len(docs[1])
+    assert batch.column("doc").to_pylist() == [0] * len(docs[0]) + [1] * len(docs[1])
+    assert batch.column("dep").to_pylist() == [t.dep for d in docs for t in d]
+
+
+def test_token_cache():
+    print(f"test_token_cache", file=sys.stderr)
+    assert doc[1] is doc[1]
+    assert doc[-1] is doc[len(doc) - 1]
+    assert list(doc)[2] is doc[2]
+    assert doc[1:3][0] is doc[1]
+    with pytest.raises(AttributeError):
+        doc[0].not_an_attribute = 1
+    with pytest.raises(IndexError):
+        doc[len(doc)]
+    assert doc[0].doc is doc
+    # Cached tokens do not keep their document alive: it is freed as soon as it is
+    # not referenced anymore, without waiting for the garbage collector
+    gc.disable()
+    try:
+        tmp_doc = lima(text)
+        token = tmp_doc[3]
+        list(tmp_doc)
+        ref = weakref.ref(tmp_doc)
+        del tmp_doc
+        assert ref() is None
+    finally:
+        gc.enable()
+    # A token outliving its document still has its data and a document
+    assert token.lemma == doc[3].lemma
+    assert str(token.doc) == text
+    assert token.sent.text == "Give it back!"
+
+
+def test_token_features():
+    print(f"test_token_features", file=sys.stderr)
+    features = doc[0].features
+    assert features is doc[0].features
+    assert all(isinstance(k, str) and isinstance(v, str) for k, v in features.items())
+    with pytest.raises(TypeError):
+        features["NOT_A_FEATURE"] = "1"
+    empty = doc.strings.features(doc.strings.add("_"))
+    assert len(empty) == 0
+    parsed = doc.strings.features(doc.strings.add("GENDER=FEM|NUMBER=SING"))
+    assert dict(parsed) == {"GENDER": "FEM", "NUMBER": "SING"}
+
+
+def test_token_sent():
+    print(f"test_token_sent", file=sys.stderr)
+    sents = list(doc.sents)
+    assert [len(sent) for sent in sents] == [4, 3]
+    assert doc[1].sent.text == "Give it back!"
+    assert doc[5].sent.text == "He pleaded."
+    assert [token.is_sent_start for token in doc] == [True, False, False, False,
+                                                     True, False, False]
+    assert [token.is_sent_end for token in doc] == [False, False, False, True,
+                                                   False, False, True]
+
+
 def test_doc_size():
     print(f"test_doc_size", file=sys.stderr)
     assert len(doc) == 7
@@ -202,6 +671,39 @@ def test_doc_repr():
     assert len(repr(doc).split("\n")) == 8
 
 
+def test_doc_conllu():
+    print(f"test_doc_conllu", file=sys.stderr)
+    conllu = doc.to_conllu()
+    assert conllu == repr(doc)
+    sentences = [sentence.split("\n") for sentence in conllu.split("\n\n")]
+    assert [len(sentence) for sentence in sentences] == [4, 3]
+    # Ids and heads are numbered in each sentence, roots having head 0
+    for sentence in sentences:
+        cols = [line.split("\t") for line in sentence]
+        assert [c[0] for c in cols] == [str(i) for i in range(1, len(cols) + 1)]
+        assert [c[6] for c in cols if c[7] == "root"] == ["0"]
+    assert sentences[1][1].split("\t")[:3] == ["2", "pleaded", "plead"]
+    assert repr(list(doc.sents)[1]) == "\n".join(sentences[1])
+    # Files end with the empty line of the last sentence
+    text = io.StringIO()
+    doc.to_conllu(text)
+    doc.to_conllu(text)
+    assert text.getvalue() == 2 * (conllu + "\n\n")
+    binary = io.BytesIO()
+    doc.to_conllu(binary)
+    assert binary.getvalue() == (conllu + "\n\n").encode("utf-8")
+    # File-like objects which are not io text or binary files
+    encoded = io.BytesIO()
+    doc.to_conllu(codecs.getwriter("utf-8")(encoded))
+    assert encoded.getvalue() == (conllu + "\n\n").encode("utf-8")
+    for mode, expected in (("w+", conllu + "\n\n"),
+                           ("w+b", (conllu + "\n\n").encode("utf-8"))):
+        with tempfile.SpooledTemporaryFile(mode=mode) as spooled:
+            doc.to_conllu(spooled)
+            spooled.seek(0)
+            assert spooled.read() == expected
+
+
 def test_doc_iter():
     print(f"test_doc_iter", file=sys.stderr)
     assert len(list(doc)) == 7
@@ -266,6 +768,25 @@ def test_doc_ents():
     assert len(ents) == 4
 
 
+def test_doc_ents_tokens():
+    print(f"test_doc_ents_tokens", file=sys.stderr)
+    ndoc = lima("John Doe lives in New York. And Jane Smith will meet him on Friday.")
+    ents = list(ndoc.ents)
+    # Entities cover the tokens tagged with their type, including the last one
+    for ent in ents:
+        assert len(ent) > 0
+        assert ent[0].ent_iob.startswith("B")
+        assert all(token.ent_iob.startswith("I") for token in ent[1:])
+        assert all(token.ent_type == ent.label for token in ent)
+    tagged = [token.i - 1 for token in ndoc if token.ent_iob != "O"]
+    assert tagged == [i for ent in ents for i in range(ent.start, ent.end)]
+    assert ents[0].text == "John Doe"
+    # The table is rebuilt for pickled documents
+    copy = pickle.loads(pickle.dumps(ndoc))
+    assert [(e.start, e.end, e.label) for e in copy.ents] == [
+        (e.start, e.end, e.label) for e in ents]
+
+
 def test_span_size():
     print(f"test_span_size", file=sys.stderr)
     # lima = aymara.lima.Lima("ud-eng", pipes="deepud")